@@ -1,18 +1,29 @@
 from __future__ import annotations
 
+import argparse
 import logging
 import os
 from logging.handlers import RotatingFileHandler
 
-import uvicorn
-
-from faceforge_core.app import create_app
+from faceforge_core import __version__
 from faceforge_core.config import load_core_config, resolve_configured_paths
 from faceforge_core.home import ensure_faceforge_layout, resolve_faceforge_home
 from faceforge_core.ports import read_ports_file
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m faceforge_core",
+        description="Run the FaceForge Core API server.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.parse_args(argv)
+
+    # Deferred so --help/--version do not pay for the FastAPI/uvicorn import graph.
+    import uvicorn
+
+    from faceforge_core.app import create_app
+
     home = resolve_faceforge_home()
     paths = ensure_faceforge_layout(home)
 
@@ -43,7 +54,7 @@ def main() -> None:
         # Keep the scaffold's existing default unless config explicitly changes it.
         port = config.network.core_port
 
-    uvicorn.run(create_app(), host=host, port=port)
+    uvicorn.run(create_app(paths=paths, config=config), host=host, port=port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+"""Pure ASGI access logging ("METHOD /path - status").
+
+Reads the method and path from the scope and the status from the
+http.response.start message, so no Request/Response wrappers are built. Uses
+%-style arguments so the line is only formatted when INFO is enabled.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class AccessLogMiddleware:
+    def __init__(self, app: ASGIApp, *, logger: logging.Logger) -> None:
+        self.app = app
+        self.logger = logger
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.logger.info("%s %s - %d", scope["method"], scope["path"], status)
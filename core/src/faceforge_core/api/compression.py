@@ -0,0 +1,24 @@
+"""Response compression for API bodies, never for asset bytes.
+
+Starlette's GZipMiddleware only skips image/video/audio and a few archive types,
+so an octet-stream, PDF or text asset download would be deflated in Python,
+lose the sendfile/zerocopysend path and keep a strong ETag and Accept-Ranges
+that no longer describe the body. Download paths therefore bypass it entirely.
+"""
+
+from __future__ import annotations
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+def _is_asset_download(path: str) -> bool:
+    return path.startswith("/v1/assets/") and path.endswith("/download")
+
+
+class ApiGZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and _is_asset_download(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,84 @@
+"""Shared FastAPI dependencies for app.state lookups.
+
+The lifespan builds one frozen AppContext and stores it on app.state.ctx, so the
+happy path is a plain attribute access; the HTTPException branches only fire if a
+route is hit on an app that was never started. Dependencies are `async def` so
+FastAPI calls them inline instead of dispatching each one to the threadpool.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+
+from faceforge_core.config import CoreConfig
+from faceforge_core.home import FaceForgePaths
+from faceforge_core.ingest.exiftool import ExifToolWorker
+from faceforge_core.ingest.metadata_batch import MetadataBatchWriter
+from faceforge_core.jobs.dispatcher import JobRunner
+from faceforge_core.storage.manager import StorageManager
+
+
+@dataclass(frozen=True, slots=True)
+class AppContext:
+    """Process-wide handles built once at startup (never replaced while running)."""
+
+    db_path: Path
+    paths: FaceForgePaths
+    config: CoreConfig
+    storage_mgr: StorageManager
+    exiftool_path: Path | None = None
+    exiftool_worker: ExifToolWorker | None = None
+    metadata_writer: MetadataBatchWriter | None = None
+    job_runner: JobRunner | None = None
+    # Serialized bodies for GET endpoints whose response never changes while running.
+    precomputed_responses: Mapping[str, bytes] = field(default_factory=dict)
+    # config.auth.install_token, encoded once for the token middleware's comparison.
+    install_token_bytes: bytes = b""
+
+
+async def get_app_ctx(request: Request) -> AppContext:
+    try:
+        return request.app.state.ctx
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="Server not initialized") from e
+
+
+async def get_db_path(request: Request) -> Path:
+    try:
+        return request.app.state.ctx.db_path
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="DB not initialized") from e
+
+
+async def get_paths(request: Request) -> FaceForgePaths:
+    try:
+        return request.app.state.ctx.paths
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="Server not initialized") from e
+
+
+async def get_config(request: Request) -> CoreConfig:
+    try:
+        return request.app.state.ctx.config
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="Server not initialized") from e
+
+
+async def get_storage_manager(request: Request) -> StorageManager:
+    try:
+        return request.app.state.ctx.storage_mgr
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="Storage not initialized") from e
+
+
+# Hot routes that need several handles take Ctx (one dependency) instead of stacking these.
+Ctx = Annotated[AppContext, Depends(get_app_ctx)]
+DbPath = Annotated[Path, Depends(get_db_path)]
+Paths = Annotated[FaceForgePaths, Depends(get_paths)]
+Config = Annotated[CoreConfig, Depends(get_config)]
+Storage = Annotated[StorageManager, Depends(get_storage_manager)]
@@ -0,0 +1,45 @@
+"""Weak ETags for conditional GETs on polled read endpoints.
+
+Tags are derived from the columns that change whenever the response would
+(e.g. an entity's updated_at), so a matching If-None-Match can be answered with
+an empty 304 instead of re-serializing the payload.
+"""
+
+from __future__ import annotations
+
+import xxhash
+from fastapi import Request, Response
+
+
+def weak_etag(*parts: object) -> str:
+    h = xxhash.xxh3_64()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return f'W/"{h.hexdigest()}"'
+
+
+def weak_etag_for_bytes(body: bytes) -> str:
+    return f'W/"{xxhash.xxh3_64_hexdigest(body)}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already covers `etag` (weak comparison)."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str, *, cache_control: str = "no-cache") -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_etag(response: Response, etag: str, *, cache_control: str = "no-cache") -> None:
+    # no-cache: clients may store the body but must revalidate on every use.
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import functools
+import json
+from collections.abc import Callable
 from typing import Any
 
+import orjson
 from pydantic import BaseModel
+from starlette.responses import Response
 
 
 class ApiError(BaseModel):
@@ -23,3 +28,63 @@ def ok[T](data: T) -> ApiResponse[T]:
 
 def fail(*, code: str, message: str, details: Any | None = None) -> ApiResponse[None]:
     return ApiResponse(ok=False, error=ApiError(code=code, message=message, details=details))
+
+
+def _dumps(payload: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    try:
+        return orjson.dumps(payload, default=default)
+    except orjson.JSONEncodeError:
+        # orjson only handles 64-bit integers; the stdlib serializes larger ones exactly.
+        return json.dumps(
+            payload, ensure_ascii=False, separators=(",", ":"), default=default
+        ).encode("utf-8")
+
+
+def ok_json(data: Any) -> Response:
+    """Serialize a success envelope straight to JSON bytes with orjson.
+
+    For hot read endpoints whose payload is already a plain dict; skips building
+    and validating ApiResponse models. Output matches `ok(...)` serialization.
+    """
+
+    return Response(
+        content=_dumps({"ok": True, "data": data, "error": None}),
+        media_type="application/json",
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def fail_body(code: str, message: str) -> bytes:
+    """Serialized `fail(code=..., message=...)` envelope without details.
+
+    Error handlers mostly emit a small fixed set of (code, message) pairs ("Entity
+    not found", "Missing token", ...), so the bytes are built once per pair.
+    """
+
+    return orjson.dumps(
+        {"ok": False, "data": None, "error": {"code": code, "message": message, "details": None}}
+    )
+
+
+def _json_default(obj: Any) -> Any:
+    # Validation details can carry raw bytes inputs or exception objects (e.g. ctx.error).
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", "replace")
+    return str(obj)
+
+
+def fail_json(status_code: int, *, code: str, message: str, details: Any | None = None) -> Response:
+    """orjson-serialized counterpart of `fail(...)` for routes returning a Response."""
+
+    if details is None:
+        content = fail_body(code, message)
+    else:
+        content = _dumps(
+            {
+                "ok": False,
+                "data": None,
+                "error": {"code": code, "message": message, "details": details},
+            },
+            default=_json_default,
+        )
+    return Response(content=content, status_code=status_code, media_type="application/json")
@@ -0,0 +1,35 @@
+"""Opaque keyset cursors for list endpoints.
+
+A cursor is the URL-safe base64 of a small JSON array (e.g. sort key + id of the
+last row served). Clients treat it as opaque and pass it back as `?cursor=`.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+
+import orjson
+from fastapi import HTTPException
+
+
+def encode_cursor(*parts: str) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(list(parts))).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *, size: int) -> list[str]:
+    """Decode a cursor into exactly `size` strings; malformed cursors are a 422."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        parts = orjson.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise HTTPException(status_code=422, detail="Invalid cursor") from e
+
+    if (
+        not isinstance(parts, list)
+        or len(parts) != size
+        or not all(isinstance(p, str) for p in parts)
+    ):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return parts
@@ -0,0 +1,56 @@
+"""Serve fixed GET responses from bytes serialized once at startup.
+
+The lifespan fills AppContext.precomputed_responses for endpoints whose payload
+cannot change while the process runs (/healthz, /v1/ping, /v1/system/info).
+This middleware answers those paths without routing, dependency resolution or
+serialization. GET / (the redirect to the UI) is answered the same way. It sits
+inside the token middleware, so authentication still applies. The FastAPI routes
+remain for OpenAPI and as the fallback before startup.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_REDIRECTS: Final[dict[str, bytes]] = {"/": b"/ui/entities"}
+
+
+class PrecomputedResponseMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "GET":
+            location = _REDIRECTS.get(scope["path"])
+            if location is not None:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 302,
+                        "headers": [(b"location", location), (b"content-length", b"0")],
+                    }
+                )
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            try:
+                body = scope["app"].state.ctx.precomputed_responses.get(scope["path"])
+            except (AttributeError, KeyError):
+                body = None
+            if body is not None:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode("latin-1")),
+                        ],
+                    }
+                )
+                await send({"type": "http.response.body", "body": body})
+                return
+
+        await self.app(scope, receive, send)
@@ -3,10 +3,11 @@ from __future__ import annotations
 import sqlite3
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query, Request
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict, Field
 
-from faceforge_core.api.models import ApiResponse, ok
+from faceforge_core.api.deps import DbPath
+from faceforge_core.api.models import ApiResponse, ok, ok_json
 from faceforge_core.db.field_defs import (
     FieldDefRow,
     create_field_def,
@@ -20,6 +21,8 @@ router = APIRouter(tags=["admin"])
 
 
 class FieldDef(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     field_def_id: str
     scope: str
     field_key: str
@@ -32,7 +35,9 @@ class FieldDef(BaseModel):
 
 
 def _to_field_def(row: FieldDefRow) -> FieldDef:
-    return FieldDef(
+    # Rows come from our own DB, so skip per-row validation; the response model
+    # still validates the payload on the way out.
+    return FieldDef.model_construct(
         field_def_id=row.field_def_id,
         scope=row.scope,
         field_key=row.field_key,
@@ -45,37 +50,48 @@ def _to_field_def(row: FieldDefRow) -> FieldDef:
     )
 
 
+def _field_def_to_dict(row: FieldDefRow) -> dict[str, Any]:
+    return {
+        "field_def_id": row.field_def_id,
+        "scope": row.scope,
+        "field_key": row.field_key,
+        "field_type": row.field_type,
+        "required": row.required,
+        "options": row.options,
+        "regex": row.regex,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
 class FieldDefListResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     items: list[FieldDef]
 
 
 @router.get("/admin/field-defs", response_model=ApiResponse[FieldDefListResponse])
-async def field_defs_list(
-    request: Request,
+def field_defs_list(
+    db_path: DbPath,
     scope: str | None = Query(default=None, description="Optional scope filter"),
 ) -> ApiResponse[FieldDefListResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
     rows = list_field_defs(db_path, scope=scope, include_deleted=False)
     return ok(FieldDefListResponse(items=[_to_field_def(r) for r in rows]))
 
 
 @router.get("/admin/field-defs/{field_def_id}", response_model=ApiResponse[FieldDef])
-async def field_defs_get(request: Request, field_def_id: str) -> ApiResponse[FieldDef]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+def field_defs_get(db_path: DbPath, field_def_id: str) -> Response:
     row = get_field_def(db_path, field_def_id=field_def_id, include_deleted=False)
     if row is None:
         raise HTTPException(status_code=404, detail="Field definition not found")
 
-    return ok(_to_field_def(row))
+    # Hot read path: response_model documents the shape; serialize the row directly.
+    return ok_json(_field_def_to_dict(row))
 
 
 class FieldDefCreateRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     scope: str = Field(default="descriptor", min_length=1)
     field_key: str = Field(min_length=1)
     field_type: str = Field(min_length=1)
@@ -85,14 +101,10 @@ class FieldDefCreateRequest(BaseModel):
 
 
 @router.post("/admin/field-defs", response_model=ApiResponse[FieldDef])
-async def field_defs_create(
-    request: Request,
+def field_defs_create(
+    db_path: DbPath,
     payload: FieldDefCreateRequest,
 ) -> ApiResponse[FieldDef]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
     try:
         row = create_field_def(
             db_path,
@@ -113,6 +125,8 @@ async def field_defs_create(
 
 
 class FieldDefPatchRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     scope: str | None = Field(default=None, min_length=1)
     field_key: str | None = Field(default=None, min_length=1)
     field_type: str | None = Field(default=None, min_length=1)
@@ -122,15 +136,11 @@ class FieldDefPatchRequest(BaseModel):
 
 
 @router.patch("/admin/field-defs/{field_def_id}", response_model=ApiResponse[FieldDef])
-async def field_defs_patch(
-    request: Request,
+def field_defs_patch(
+    db_path: DbPath,
     field_def_id: str,
     payload: FieldDefPatchRequest,
 ) -> ApiResponse[FieldDef]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
     try:
         row = patch_field_def(
             db_path,
@@ -155,15 +165,13 @@ async def field_defs_patch(
 
 
 class DeleteResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     deleted: bool
 
 
 @router.delete("/admin/field-defs/{field_def_id}", response_model=ApiResponse[DeleteResponse])
-async def field_defs_delete(request: Request, field_def_id: str) -> ApiResponse[DeleteResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+def field_defs_delete(db_path: DbPath, field_def_id: str) -> ApiResponse[DeleteResponse]:
     deleted = soft_delete_field_def(db_path, field_def_id=field_def_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Field definition not found")
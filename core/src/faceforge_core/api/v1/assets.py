@@ -1,31 +1,47 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
-import json
 import logging
 import mimetypes
 import os
+import re
 import sqlite3
 import uuid
-from pathlib import Path
-from typing import Any
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePath
+from typing import Any, BinaryIO
 
 from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Request, Response, UploadFile
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
-from faceforge_core.api.models import ApiResponse, ok
+from faceforge_core.api.deps import Ctx, DbPath
+from faceforge_core.api.models import ApiResponse, ok, ok_json
 from faceforge_core.db.assets import (
     AssetRow,
     append_asset_metadata_entry,
     create_asset,
     get_asset,
     get_asset_by_content_hash,
+    list_assets_by_content_prefix,
 )
-from faceforge_core.db.ids import asset_id_from_content_hash, new_job_id
-from faceforge_core.ingest.exiftool import run_exiftool, should_skip_exiftool
-from faceforge_core.jobs.dispatcher import JobContext, start_job_thread
-from faceforge_core.storage.manager import StorageManager
+from faceforge_core.db.ids import (
+    CONTENT_HASH_PREFIX_BYTES,
+    asset_id_from_content_hash,
+    content_prefix_key,
+    new_job_id,
+)
+from faceforge_core.db.json_columns import loads_json
+from faceforge_core.ingest.exiftool import (
+    ExifToolWorker,
+    run_exiftool,
+    should_skip_exiftool,
+)
+from faceforge_core.ingest.metadata_batch import MetadataBatchWriter
+from faceforge_core.jobs.dispatcher import JobContext
 from faceforge_core.storage.s3 import S3ObjectLocation
 
 logger = logging.getLogger(__name__)
@@ -33,6 +49,39 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["assets"])
 
 
+def _chunk_size_from_env(name: str, default: int) -> int:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+# Read size for spooling uploads to disk; larger chunks keep hashlib (OpenSSL) busy
+# with fewer Python-level iterations. Tunable via FACEFORGE_HASH_CHUNK (bytes).
+UPLOAD_CHUNK_SIZE = _chunk_size_from_env("FACEFORGE_HASH_CHUNK", 32 * 1024 * 1024)
+
+# Helper threads for hashing upload chunks concurrently with the disk write.
+_HASH_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="ff-upload-hash")
+
+# Optional client-declared SHA-256 of the upload; lets re-uploads skip spooling bytes.
+CONTENT_SHA256_HEADER = "X-Content-Sha256"
+
+# Sidecars are buffered in memory for parsing, so cap them.
+MAX_SIDECAR_BYTES = 16 * 1024 * 1024
+SIDECAR_READ_CHUNK_SIZE = 1024 * 1024
+
+# Single "bytes=start-end" range (either side may be empty); whitespace-tolerant.
+_RANGE_RE = re.compile(r"\s*bytes=\s*(\d*)\s*-\s*(\d*)\s*\Z", re.IGNORECASE | re.ASCII)
+
+# Chunk size for streamed downloads (ranged fs reads and S3 bodies); fewer Python
+# iterations and syscalls per MiB. Tunable via FACEFORGE_DOWNLOAD_CHUNK (bytes).
+DOWNLOAD_CHUNK_SIZE = _chunk_size_from_env("FACEFORGE_DOWNLOAD_CHUNK", 4 * 1024 * 1024)
+
+
 UPLOAD_FILE = File(...)
 UPLOAD_META_FILE = File(
     default=None,
@@ -41,6 +90,8 @@ UPLOAD_META_FILE = File(
 
 
 class Asset(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     asset_id: str
     kind: str
     filename: str | None
@@ -55,7 +106,9 @@ class Asset(BaseModel):
 
 
 def _to_asset(row: AssetRow) -> Asset:
-    return Asset(
+    # Rows come from our own DB, so skip per-row validation; the response model
+    # still validates the payload on the way out.
+    return Asset.model_construct(
         asset_id=row.asset_id,
         kind=row.kind,
         filename=row.filename,
@@ -70,61 +123,71 @@ def _to_asset(row: AssetRow) -> Asset:
     )
 
 
-def _parse_range_header(range_header: str, *, size: int) -> tuple[int, int] | None:
-    raw = (range_header or "").strip()
-    if not raw:
-        return None
-
-    if not raw.lower().startswith("bytes="):
-        return None
+def _asset_to_dict(row: AssetRow) -> dict[str, Any]:
+    # Same shape as Asset, for endpoints that serialize without the model.
+    return {
+        "asset_id": row.asset_id,
+        "kind": row.kind,
+        "filename": row.filename,
+        "content_hash": row.content_hash,
+        "byte_size": row.byte_size,
+        "mime_type": row.mime_type,
+        "storage_provider": row.storage_provider,
+        "storage_key": row.storage_key,
+        "meta": row.meta,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
 
-    spec = raw[6:].strip()
 
+def _parse_range_header(range_header: str, *, size: int) -> tuple[int, int] | None:
     # Only support a single range for now.
-    if "," in spec:
+    if "," in range_header:
         return None
 
-    if "-" not in spec:
+    m = _RANGE_RE.match(range_header)
+    if m is None:
         return None
 
-    start_s, end_s = spec.split("-", 1)
-    start_s = start_s.strip()
-    end_s = end_s.strip()
+    start_s, end_s = m.groups()
 
-    if start_s == "":
-        # suffix: last N bytes
-        try:
-            suffix = int(end_s)
-        except ValueError:
+    if not start_s:
+        if not end_s:
             return None
+        # suffix: last N bytes
+        suffix = int(end_s)
         if suffix <= 0:
             return None
         if suffix >= size:
             return (0, size - 1)
         return (size - suffix, size - 1)
 
-    try:
-        start = int(start_s)
-    except ValueError:
+    start = int(start_s)
+    if start >= size:
         return None
 
-    if start < 0 or start >= size:
+    if not end_s:
+        return (start, size - 1)
+
+    end = int(end_s)
+    if end < start:
         return None
 
-    if end_s == "":
-        return (start, size - 1)
+    return (start, min(end, size - 1))
+
 
+def _content_hash_from_etag(raw: str | None) -> str | None:
+    """Extract a SHA-256 content hash from a single (possibly weak) ETag value."""
+
+    value = (raw or "").strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
     try:
-        end = int(end_s)
+        return asset_id_from_content_hash(value)
     except ValueError:
         return None
 
-    if end < start:
-        return None
-
-    end = min(end, size - 1)
-    return (start, end)
-
 
 def _unlink_best_effort(path: Path) -> None:
     try:
@@ -133,26 +196,192 @@ def _unlink_best_effort(path: Path) -> None:
         pass
 
 
+def _hash_and_write(
+    src: BinaryIO, out: BinaryIO, h: Any, *, chunk_size: int, size_hint: int | None = None
+) -> int:
+    """Copy src to out while hashing; returns the number of bytes copied.
+
+    Runs in a worker thread so hashing and disk writes stay off the event loop.
+    With `h=None` the bytes are only copied (the digest is already known).
+    `size_hint` (the upload's declared size) caps the read buffers, so small
+    uploads do not allocate two full `chunk_size` buffers.
+    """
+
+    byte_size = 0
+    readinto = getattr(src, "readinto", None)
+    if readinto is None:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            out.write(chunk)
+            if h is not None:
+                h.update(chunk)
+            byte_size += len(chunk)
+        return byte_size
+
+    # Two reused buffers (no per-chunk bytes allocation). While chunk N is hashed on
+    # a helper thread, this thread writes it and reads chunk N+1 into the other
+    # buffer; hashlib and file I/O both release the GIL, so the work overlaps.
+    buf_size = chunk_size if size_hint is None else min(chunk_size, max(size_hint, 1))
+    bufs = (memoryview(bytearray(buf_size)), memoryview(bytearray(buf_size)))
+    pending: Future[None] | None = None
+    i = 0
+    try:
+        while True:
+            mv = bufs[i]
+            n = readinto(mv)
+            if pending is not None:
+                # Hash updates must stay in order; also frees the other buffer.
+                pending.result()
+                pending = None
+            if not n:
+                break
+            view = mv[:n]
+            if h is not None:
+                pending = _HASH_EXECUTOR.submit(h.update, view)
+            out.write(view)
+            byte_size += n
+            i ^= 1
+    finally:
+        if pending is not None:
+            pending.result()
+    return byte_size
+
+
+def _probe_content_prefix(
+    src: BinaryIO, db_path: Path, *, byte_size: int, chunk_size: int
+) -> tuple[str, AssetRow | None, str | None]:
+    """Key the first MiB of src and look for an existing asset with the same content.
+
+    Returns (prefix key, existing asset or None, full SHA-256 hex or None). When
+    exactly one live asset shares the prefix key and size, all of src is SHA-256
+    hashed (without being written) to confirm the match; that digest is returned
+    either way so a mismatch does not hash the upload twice. src is rewound before
+    returning.
+    """
+
+    try:
+        prefix = src.read(CONTENT_HASH_PREFIX_BYTES)
+        prefix_hash = content_prefix_key(prefix)
+        candidates = list_assets_by_content_prefix(
+            db_path, content_hash_prefix=prefix_hash, byte_size=byte_size
+        )
+        if len(candidates) != 1:
+            return prefix_hash, None, None
+
+        h = hashlib.sha256(prefix)
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+        digest = h.hexdigest()
+        match = candidates[0] if digest == candidates[0].content_hash else None
+        return prefix_hash, match, digest
+    finally:
+        src.seek(0)
+
+
+def _iter_file_range(
+    path: Path, *, start: int, end: int, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+) -> Iterator[bytes]:
+    # Unbuffered reads go straight from the kernel into each yielded bytes object.
+    with path.open("rb", buffering=0) as f:
+        remaining = end - start + 1
+        if hasattr(os, "posix_fadvise"):
+            # Let the kernel read ahead aggressively for this sequential scan.
+            try:
+                os.posix_fadvise(f.fileno(), start, remaining, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class FileRangeResponse(StreamingResponse):
+    """Response for a byte range of a local file.
+
+    When the ASGI server offers the `http.response.zerocopysend` extension, the range
+    is handed to it as (file, offset, count) so the kernel copies it (sendfile);
+    otherwise it is streamed in DOWNLOAD_CHUNK_SIZE reads.
+    """
+
+    def __init__(self, path: Path, *, start: int, end: int, **kwargs: Any) -> None:
+        super().__init__(_iter_file_range(path, start=start, end=end), **kwargs)
+        self.path = path
+        self.start = start
+        self.count = end - start + 1
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if "http.response.zerocopysend" not in scope.get("extensions", {}):
+            await super().__call__(scope, receive, send)
+            return
+
+        with self.path.open("rb", buffering=0) as f:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {
+                    "type": "http.response.zerocopysend",
+                    "file": f,
+                    "offset": self.start,
+                    "count": self.count,
+                    "more_body": False,
+                }
+            )
+
+        if self.background is not None:
+            await self.background()
+
+
+@functools.lru_cache(maxsize=4096)
+def _mime_for_suffixes(suffixes: str) -> str | None:
+    guess, _enc = mimetypes.guess_type(f"file{suffixes}")
+    return guess
+
+
 def _guess_mime_type(filename: str | None, fallback: str | None) -> str:
     if fallback:
         return fallback
     if filename:
-        guess, _enc = mimetypes.guess_type(filename)
+        # guess_type only looks at the type suffix plus at most one encoding suffix
+        # (e.g. ".tar.gz"), so memoize on those.
+        guess = _mime_for_suffixes("".join(PurePath(filename).suffixes[-2:]).lower())
         if guess:
             return guess
     return "application/octet-stream"
 
 
 def _load_sidecar_json(upload: UploadFile) -> Any:
-    raw = upload.file.read()
+    raw = bytearray()
+    while True:
+        chunk = upload.file.read(SIDECAR_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        raw += chunk
+        if len(raw) > MAX_SIDECAR_BYTES:
+            raise HTTPException(status_code=413, detail="_meta.json is too large")
+
     try:
         text = raw.decode("utf-8")
     except UnicodeDecodeError as e:
         raise HTTPException(status_code=422, detail="_meta.json must be UTF-8") from e
 
+    # Accepts what json.loads does (big integers kept exact, NaN/Infinity literals).
     try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError as e:
+        parsed = loads_json(text)
+    except ValueError as e:
         raise HTTPException(status_code=422, detail="_meta.json must be valid JSON") from e
 
     if parsed in (None, ""):
@@ -161,50 +390,18 @@ def _load_sidecar_json(upload: UploadFile) -> Any:
     return parsed
 
 
-def _resolve_exiftool_executable(request: Request) -> Path | None:
-    config = getattr(request.app.state, "faceforge_config", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    enabled = bool(getattr(getattr(config, "tools", None), "exiftool_enabled", True))
-    if not enabled:
-        return None
-
-    tools_dir = getattr(paths, "tools_dir", None)
-    if tools_dir is None:
-        return None
-
-    tools_dir = Path(tools_dir)
-
-    raw = getattr(getattr(config, "tools", None), "exiftool_path", None)
-    if raw and str(raw).strip():
-        p = Path(str(raw)).expanduser()
-        # Relative paths are resolved relative to the managed tools dir.
-        p = p if p.is_absolute() else (tools_dir / p)
-        p = p.resolve()
-        return p if p.exists() else None
-
-    # Bundled locations only (no PATH fallback).
-    is_windows = os.name == "nt"
-    candidates: list[Path] = []
-    if is_windows:
-        candidates.extend(
-            [
-                tools_dir / "exiftool.exe",
-                tools_dir / "exiftool" / "exiftool.exe",
-            ]
-        )
-    else:
-        candidates.extend(
-            [
-                tools_dir / "exiftool",
-                tools_dir / "exiftool" / "exiftool",
-            ]
-        )
-
-    for c in candidates:
-        if c.exists():
-            return c
-
-    return None
+def _extract_exiftool_entry(
+    *, exiftool_path: Path, asset_path: Path, worker: ExifToolWorker | None
+) -> dict[str, Any]:
+    if worker is not None:
+        try:
+            return worker.run(asset_path=asset_path)
+        except Exception as e:
+            logger.info(
+                "ExifTool worker failed; falling back to one-shot run",
+                extra={"error": str(e)},
+            )
+    return run_exiftool(exiftool_path=exiftool_path, asset_path=asset_path)
 
 
 def _exiftool_background_task(
@@ -214,9 +411,17 @@ def _exiftool_background_task(
     asset_id: str,
     asset_path: Path,
     cleanup_path: Path | None = None,
+    worker: ExifToolWorker | None = None,
+    metadata_writer: MetadataBatchWriter | None = None,
 ) -> None:
     try:
-        entry = run_exiftool(exiftool_path=exiftool_path, asset_path=asset_path)
+        entry = _extract_exiftool_entry(
+            exiftool_path=exiftool_path, asset_path=asset_path, worker=worker
+        )
+        if metadata_writer is not None:
+            # Written by the batch writer alongside other pending entries.
+            metadata_writer.submit(asset_id, entry)
+            return
         updated = append_asset_metadata_entry(db_path, asset_id=asset_id, entry=entry)
         if updated is None:
             logger.warning(
@@ -241,35 +446,75 @@ def _cleanup_temp_file(path: Path) -> None:
 async def assets_upload(
     request: Request,
     background_tasks: BackgroundTasks,
+    app_ctx: Ctx,
     kind: str = "file",
     file: UploadFile = UPLOAD_FILE,
     meta: UploadFile | None = UPLOAD_META_FILE,
 ) -> ApiResponse[Asset]:
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    storage_mgr: StorageManager | None = getattr(request.app.state, "storage_manager", None)
-    if db_path is None or paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-    if storage_mgr is None:
-        raise HTTPException(status_code=500, detail="Storage not initialized")
+    db_path = app_ctx.db_path
+    storage_mgr = app_ctx.storage_mgr
 
     if not file.filename:
         raise HTTPException(status_code=422, detail="Missing filename")
 
-    temp_path = (paths.tmp_dir / f"upload-{uuid.uuid4().hex}.tmp").resolve()
+    declared_hash = (request.headers.get(CONTENT_SHA256_HEADER) or "").strip()
+    if declared_hash:
+        try:
+            declared_hash = asset_id_from_content_hash(declared_hash)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=422, detail=f"{CONTENT_SHA256_HEADER} must be a SHA-256 hex digest"
+            ) from e
+        existing = get_asset_by_content_hash(
+            db_path, content_hash=declared_hash, include_deleted=False
+        )
+        if existing is not None:
+            return ok(_to_asset(existing))
+
+    # Conditional upload: If-None-Match carrying the content-hash ETag served on
+    # downloads fails fast (412) when that content is already stored.
+    etag_hash = _content_hash_from_etag(request.headers.get("if-none-match"))
+    if etag_hash is not None:
+        if get_asset_by_content_hash(db_path, content_hash=etag_hash, include_deleted=False):
+            raise HTTPException(status_code=412, detail="Asset already exists")
+
+    # Parse the sidecar first so a bad/oversized one fails before we spool the upload.
+    sidecar: Any | None = None
+    if meta is not None:
+        sidecar = _load_sidecar_json(meta)
+
+    # Likely duplicate (same first-MiB key and size)? Confirm by hashing the rest and
+    # skip spooling entirely. The multipart body is already buffered and seekable.
+    prefix_hash: str | None = None
+    known_hash: str | None = None
+    if file.size and file.file.seekable():
+        prefix_hash, existing, known_hash = await asyncio.to_thread(
+            _probe_content_prefix,
+            file.file,
+            db_path,
+            byte_size=file.size,
+            chunk_size=UPLOAD_CHUNK_SIZE,
+        )
+        if existing is not None:
+            await file.close()
+            return ok(_to_asset(existing))
 
-    h = hashlib.sha256()
-    byte_size = 0
+    # tmp_dir is already absolute (derived from the resolved home), so skip realpath.
+    temp_path = app_ctx.paths.tmp_dir / f"upload-{uuid.uuid4().hex}.tmp"
+
+    # A probe that hashed the whole upload already knows its digest; just copy it.
+    h = hashlib.sha256() if known_hash is None else None
 
     try:
         with temp_path.open("wb") as out:
-            while True:
-                chunk = await file.read(8 * 1024 * 1024)
-                if not chunk:
-                    break
-                out.write(chunk)
-                h.update(chunk)
-                byte_size += len(chunk)
+            byte_size = await asyncio.to_thread(
+                _hash_and_write,
+                file.file,
+                out,
+                h,
+                chunk_size=UPLOAD_CHUNK_SIZE,
+                size_hint=file.size,
+            )
     finally:
         try:
             await file.close()
@@ -283,7 +528,7 @@ async def assets_upload(
             pass
         raise HTTPException(status_code=422, detail="Uploaded file was empty")
 
-    content_hash = h.hexdigest()
+    content_hash = known_hash if h is None else h.hexdigest()
     asset_id = asset_id_from_content_hash(content_hash)
 
     # If already present, do not store bytes again.
@@ -293,7 +538,8 @@ async def assets_upload(
         return ok(_to_asset(existing))
 
     # Store bytes using routing rules (S3 if available, else filesystem).
-    upload_result = storage_mgr.store_upload(
+    upload_result = await asyncio.to_thread(
+        storage_mgr.store_upload,
         temp_path=temp_path,
         asset_id=asset_id,
         kind=kind,
@@ -306,7 +552,6 @@ async def assets_upload(
 
     meta_obj: dict[str, Any] = {"metadata": []}
     if meta is not None:
-        sidecar = _load_sidecar_json(meta)
         meta_obj["metadata"].append(
             {
                 "Source": "UserSidecar",
@@ -330,6 +575,7 @@ async def assets_upload(
             storage_provider=upload_result.storage_provider,
             storage_key=upload_result.storage_key,
             meta=meta_obj,
+            content_hash_prefix=prefix_hash,
         )
     except sqlite3.IntegrityError as e:
         existing = get_asset_by_content_hash(
@@ -346,7 +592,8 @@ async def assets_upload(
             _unlink_best_effort(upload_result.cleanup_temp_path)
 
     # Best-effort exiftool extraction.
-    exiftool_path = _resolve_exiftool_executable(request)
+    # Resolved once at startup; the binary does not move while the server runs.
+    exiftool_path = app_ctx.exiftool_path
     if exiftool_path is not None and not should_skip_exiftool(file.filename):
         # If bytes landed in S3, run ExifTool against the local temp file and
         # delete it when the background task completes.
@@ -359,6 +606,8 @@ async def assets_upload(
                 asset_id=row.asset_id,
                 asset_path=local_for_exif,
                 cleanup_path=upload_result.cleanup_temp_path,
+                worker=app_ctx.exiftool_worker,
+                metadata_writer=app_ctx.metadata_writer,
             )
         else:
             logger.info(
@@ -373,12 +622,16 @@ async def assets_upload(
 
 
 class BulkImportRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     path: str = Field(min_length=1, description="Directory to scan for files")
     recursive: bool = True
     kind: str = "file"
 
 
 class BulkImportResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     job_id: str
     job_type: str
     status: str
@@ -386,29 +639,31 @@ class BulkImportResponse(BaseModel):
 
 
 @router.post("/assets/bulk-import", response_model=ApiResponse[BulkImportResponse])
-async def assets_bulk_import(
-    request: Request, payload: BulkImportRequest
-) -> ApiResponse[BulkImportResponse]:
+def assets_bulk_import(app_ctx: Ctx, payload: BulkImportRequest) -> ApiResponse[BulkImportResponse]:
     """Start a bulk import of a local directory as a durable job."""
 
-    db_path = getattr(request.app.state, "db_path", None)
-    storage_mgr: StorageManager | None = getattr(request.app.state, "storage_manager", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-    if storage_mgr is None:
-        raise HTTPException(status_code=500, detail="Storage not initialized")
+    db_path = app_ctx.db_path
+    runner = app_ctx.job_runner
+    if runner is None:
+        raise HTTPException(status_code=500, detail="Job runner not initialized")
 
-    from faceforge_core.db.jobs import append_job_log, create_job
+    from faceforge_core.db.jobs import create_job
 
     job_id = new_job_id()
     job_type = "assets.bulk-import"
     job_input = {"path": payload.path, "recursive": payload.recursive, "kind": payload.kind}
 
-    row = create_job(db_path, job_id=job_id, job_type=job_type, status="queued", input=job_input)
-    append_job_log(db_path, job_id=job_id, level="info", message="Job queued")
+    row = create_job(
+        db_path,
+        job_id=job_id,
+        job_type=job_type,
+        status="queued",
+        input=job_input,
+        log_message="Job queued",
+    )
 
-    ctx = JobContext(db_path=db_path, storage_mgr=storage_mgr)
-    start_job_thread(ctx=ctx, job_id=job_id)
+    ctx = JobContext(db_path=db_path, storage_mgr=app_ctx.storage_mgr)
+    runner.submit(ctx=ctx, job_id=job_id)
 
     return ok(
         BulkImportResponse(
@@ -420,46 +675,62 @@ async def assets_bulk_import(
     )
 
 
-@router.get("/assets/{asset_id}", response_model=ApiResponse[Asset])
-async def assets_get(request: Request, asset_id: str) -> ApiResponse[Asset]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
+@router.get("/assets/by-hash/{content_hash}", response_model=ApiResponse[Asset])
+def assets_get_by_hash(db_path: DbPath, content_hash: str) -> ApiResponse[Asset]:
+    """Look up an asset by SHA-256 content hash (upload preflight)."""
 
-    row = get_asset(db_path, asset_id=asset_id, include_deleted=False)
+    try:
+        content_hash = asset_id_from_content_hash(content_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail="Invalid content hash") from e
+
+    row = get_asset_by_content_hash(db_path, content_hash=content_hash, include_deleted=False)
     if row is None:
         raise HTTPException(status_code=404, detail="Asset not found")
 
     return ok(_to_asset(row))
 
 
-@router.get("/assets/{asset_id}/download")
-async def assets_download(request: Request, asset_id: str):
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    config = getattr(request.app.state, "faceforge_config", None)
-    storage_mgr: StorageManager | None = getattr(request.app.state, "storage_manager", None)
-    if db_path is None or paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-    if storage_mgr is None:
-        raise HTTPException(status_code=500, detail="Storage not initialized")
+@router.get("/assets/{asset_id}", response_model=ApiResponse[Asset])
+def assets_get(db_path: DbPath, asset_id: str) -> Response:
+    row = get_asset(db_path, asset_id=asset_id, include_deleted=False)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    # Hot read path: response_model documents the shape; serialize the row directly.
+    return ok_json(_asset_to_dict(row))
 
+
+@router.get("/assets/{asset_id}/download")
+def assets_download(request: Request, app_ctx: Ctx, asset_id: str):
+    db_path = app_ctx.db_path
+    storage_mgr = app_ctx.storage_mgr
     row = get_asset(db_path, asset_id=asset_id, include_deleted=False)
     if row is None:
         raise HTTPException(status_code=404, detail="Asset not found")
 
     if row.storage_provider == "s3":
-        s3_cfg = getattr(getattr(config, "storage", None), "s3", None) if config else None
-        if not (s3_cfg is not None and bool(getattr(s3_cfg, "enabled", False))):
+        if not app_ctx.config.storage.s3.enabled:
             raise HTTPException(status_code=503, detail="S3 storage disabled")
         if storage_mgr.get_s3_provider() is None:
             raise HTTPException(status_code=503, detail="S3 storage not configured")
 
+    # For fs assets, resolve and stat once; the result is reused for the response.
+    fs_path: Path | None = None
+    fs_stat: os.stat_result | None = None
     try:
-        size = storage_mgr.get_size_bytes(
-            storage_provider=row.storage_provider,
-            storage_key=row.storage_key,
-        )
+        if row.storage_provider == "fs":
+            fs_path = storage_mgr.fs.resolve_path(row.storage_key)
+            fs_stat = os.stat(fs_path)
+            size = fs_stat.st_size
+        elif row.storage_provider == "s3" and row.byte_size > 0:
+            # Content-addressed bytes never change size; skip the HEAD round-trip.
+            size = row.byte_size
+        else:
+            size = storage_mgr.get_size_bytes(
+                storage_provider=row.storage_provider,
+                storage_key=row.storage_key,
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail="Asset bytes not found") from e
     except Exception as e:
@@ -467,7 +738,7 @@ async def assets_download(request: Request, asset_id: str):
     mime = _guess_mime_type(row.filename, row.mime_type)
 
     range_header = request.headers.get("range")
-    range_tuple = _parse_range_header(range_header or "", size=size) if range_header else None
+    range_tuple = _parse_range_header(range_header, size=size) if range_header else None
 
     headers: dict[str, str] = {
         "Accept-Ranges": "bytes",
@@ -475,6 +746,8 @@ async def assets_download(request: Request, asset_id: str):
 
     filename = row.filename or row.asset_id
     headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    # Content-addressed, so the hash is a strong validator.
+    headers["ETag"] = f'"{row.content_hash}"'
 
     if range_header and range_tuple is None:
         # Invalid/unsupported range.
@@ -482,16 +755,6 @@ async def assets_download(request: Request, asset_id: str):
         return Response(status_code=416, headers=headers)
 
     def _iter_full() -> Any:
-        if row.storage_provider == "fs":
-            p = storage_mgr.fs.resolve_path(row.storage_key)
-            with p.open("rb") as f:
-                while True:
-                    chunk = f.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    yield chunk
-            return
-
         if row.storage_provider == "s3":
             s3 = storage_mgr.get_s3_provider()
             if s3 is None:
@@ -500,10 +763,22 @@ async def assets_download(request: Request, asset_id: str):
                 row.storage_key,
                 default_bucket=s3.default_bucket,
             )
-            yield from s3.iter_range(location=loc, start=0, end=size - 1)
+            yield from s3.iter_range(
+                location=loc, start=0, end=size - 1, chunk_size=DOWNLOAD_CHUNK_SIZE
+            )
             return
 
     if range_tuple is None:
+        if fs_path is not None:
+            # Full-file downloads go through FileResponse so the server can use sendfile.
+            return FileResponse(
+                fs_path,
+                media_type=mime,
+                filename=filename,
+                headers={"Accept-Ranges": "bytes", "ETag": headers["ETag"]},
+                stat_result=fs_stat,
+            )
+
         headers["Content-Length"] = str(size)
         return StreamingResponse(
             _iter_full(),
@@ -516,20 +791,17 @@ async def assets_download(request: Request, asset_id: str):
     headers["Content-Range"] = f"bytes {start}-{end}/{size}"
     headers["Content-Length"] = str(content_length)
 
-    def _iter_partial() -> Any:
-        if row.storage_provider == "fs":
-            p = storage_mgr.fs.resolve_path(row.storage_key)
-            with p.open("rb") as f:
-                f.seek(start)
-                remaining = end - start + 1
-                while remaining > 0:
-                    chunk = f.read(min(1024 * 1024, remaining))
-                    if not chunk:
-                        break
-                    remaining -= len(chunk)
-                    yield chunk
-            return
+    if fs_path is not None:
+        return FileRangeResponse(
+            fs_path,
+            start=start,
+            end=end,
+            status_code=206,
+            media_type=mime,
+            headers=headers,
+        )
 
+    def _iter_partial() -> Any:
         if row.storage_provider == "s3":
             s3 = storage_mgr.get_s3_provider()
             if s3 is None:
@@ -538,7 +810,9 @@ async def assets_download(request: Request, asset_id: str):
                 row.storage_key,
                 default_bucket=s3.default_bucket,
             )
-            yield from s3.iter_range(location=loc, start=start, end=end)
+            yield from s3.iter_range(
+                location=loc, start=start, end=end, chunk_size=DOWNLOAD_CHUNK_SIZE
+            )
             return
 
     return StreamingResponse(
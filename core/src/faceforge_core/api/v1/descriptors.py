@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import functools
 import re
 import sqlite3
+from collections.abc import Callable
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel, Field
 
-from faceforge_core.api.models import ApiResponse, fail, ok
+from faceforge_core.api.deps import DbPath
+from faceforge_core.api.models import ApiResponse, fail_json, ok, ok_json
 from faceforge_core.db.descriptors import (
     DescriptorRow,
     create_descriptor,
@@ -34,7 +36,9 @@ class Descriptor(BaseModel):
 
 
 def _to_descriptor(row: DescriptorRow) -> Descriptor:
-    return Descriptor(
+    # Rows come from our own DB, so skip per-row validation; the response model
+    # still validates the payload on the way out.
+    return Descriptor.model_construct(
         descriptor_id=row.descriptor_id,
         entity_id=row.entity_id,
         scope=row.scope,
@@ -45,6 +49,19 @@ def _to_descriptor(row: DescriptorRow) -> Descriptor:
     )
 
 
+def _descriptor_to_dict(row: DescriptorRow) -> dict[str, Any]:
+    # Same shape as Descriptor, for endpoints that serialize without the model.
+    return {
+        "descriptor_id": row.descriptor_id,
+        "entity_id": row.entity_id,
+        "scope": row.scope,
+        "field_key": row.field_key,
+        "value": row.value,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
 def _options_list(options: Any) -> list[str] | None:
     if isinstance(options, dict):
         v = options.get("options")
@@ -53,59 +70,118 @@ def _options_list(options: Any) -> list[str] | None:
     return None
 
 
-def _validate_value(field_def: FieldDefRow, value: Any) -> list[str]:
-    errors: list[str] = []
+Validator = Callable[[Any], list[str]]
 
-    if value is None:
-        if field_def.required:
-            errors.append("value is required")
-        return errors
 
-    t = (field_def.field_type or "").strip().lower()
+def _check_any(value: Any) -> list[str]:
+    return []
 
-    if t == "string":
+
+def _check_int(value: Any) -> list[str]:
+    if isinstance(value, bool) or not isinstance(value, int):
+        return ["value must be an integer"]
+    return []
+
+
+def _check_number(value: Any) -> list[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return ["value must be a number"]
+    return []
+
+
+def _check_bool(value: Any) -> list[str]:
+    if not isinstance(value, bool):
+        return ["value must be a boolean"]
+    return []
+
+
+def _check_unknown(value: Any) -> list[str]:
+    return ["unknown field_type"]
+
+
+def _string_validator(*, required: bool, regex: str | None) -> Validator:
+    pattern: re.Pattern[str] | None = None
+    regex_invalid = False
+    if regex:
+        try:
+            pattern = re.compile(regex)
+        except re.error:
+            # Misconfigured regex should not silently accept bad values.
+            regex_invalid = True
+
+    def check(value: Any) -> list[str]:
         if not isinstance(value, str):
-            errors.append("value must be a string")
-        elif field_def.required and value == "":
-            errors.append("value must not be empty")
-        elif field_def.regex:
-            try:
-                if re.fullmatch(field_def.regex, value) is None:
-                    errors.append("value does not match regex")
-            except re.error:
-                # Misconfigured regex should not silently accept bad values.
-                errors.append("field definition regex is invalid")
+            return ["value must be a string"]
+        if required and value == "":
+            return ["value must not be empty"]
+        if regex_invalid:
+            return ["field definition regex is invalid"]
+        if pattern is not None and pattern.fullmatch(value) is None:
+            return ["value does not match regex"]
+        return []
 
-    elif t in {"int", "integer"}:
-        if isinstance(value, bool) or not isinstance(value, int):
-            errors.append("value must be an integer")
+    return check
 
-    elif t in {"float", "number"}:
-        if isinstance(value, bool) or not isinstance(value, (int, float)):
-            errors.append("value must be a number")
 
-    elif t in {"bool", "boolean"}:
-        if not isinstance(value, bool):
-            errors.append("value must be a boolean")
+def _options_validator(options: tuple[str, ...]) -> Validator:
+    allowed = frozenset(options)
 
-    elif t in {"enum", "option", "options"}:
+    def check(value: Any) -> list[str]:
         if not isinstance(value, str):
-            errors.append("value must be a string")
-        else:
-            opts = _options_list(field_def.options)
-            if not opts:
-                errors.append("field definition has no options")
-            elif value not in opts:
-                errors.append("value must be one of the allowed options")
+            return ["value must be a string"]
+        if not allowed:
+            return ["field definition has no options"]
+        if value not in allowed:
+            return ["value must be one of the allowed options"]
+        return []
+
+    return check
 
+
+@functools.lru_cache(maxsize=4096)
+def _validator_for(
+    field_type: str, required: bool, regex: str | None, options: tuple[str, ...]
+) -> Validator:
+    """Build a value checker specialized for one field definition.
+
+    Keyed on every field-def attribute that affects validation, so an edited
+    definition simply maps to a new entry.
+    """
+
+    t = (field_type or "").strip().lower()
+    if t == "string":
+        check = _string_validator(required=required, regex=regex)
+    elif t in {"int", "integer"}:
+        check = _check_int
+    elif t in {"float", "number"}:
+        check = _check_number
+    elif t in {"bool", "boolean"}:
+        check = _check_bool
+    elif t in {"enum", "option", "options"}:
+        check = _options_validator(options)
     elif t in {"json", "any"}:
         # Accept any JSON-serializable value.
-        pass
-
+        check = _check_any
     else:
-        errors.append("unknown field_type")
+        check = _check_unknown
 
-    return errors
+    def validate(value: Any) -> list[str]:
+        if value is None:
+            return ["value is required"] if required else []
+        return check(value)
+
+    return validate
+
+
+def _validate_value(field_def: FieldDefRow, value: Any) -> list[str]:
+    opts = _options_list(field_def.options)
+    validate = _validator_for(
+        field_def.field_type,
+        bool(field_def.required),
+        field_def.regex,
+        tuple(opts) if opts else (),
+    )
+    return validate(value)
 
 
 class DescriptorListResponse(BaseModel):
@@ -113,20 +189,17 @@ class DescriptorListResponse(BaseModel):
 
 
 @router.get("/entities/{entity_id}/descriptors", response_model=ApiResponse[DescriptorListResponse])
-async def entity_descriptors_list(
-    request: Request,
+def entity_descriptors_list(
+    db_path: DbPath,
     entity_id: str,
-) -> ApiResponse[DescriptorListResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+) -> Response:
     entity = get_entity(db_path, entity_id=entity_id, include_deleted=False)
     if entity is None:
         raise HTTPException(status_code=404, detail="Entity not found")
 
     rows = list_descriptors_for_entity(db_path, entity_id=entity_id, include_deleted=False)
-    return ok(DescriptorListResponse(items=[_to_descriptor(r) for r in rows]))
+    # Hot read path: response_model documents the shape; serialize the rows directly.
+    return ok_json({"items": [_descriptor_to_dict(r) for r in rows]})
 
 
 class DescriptorCreateRequest(BaseModel):
@@ -136,15 +209,11 @@ class DescriptorCreateRequest(BaseModel):
 
 
 @router.post("/entities/{entity_id}/descriptors", response_model=ApiResponse[Descriptor])
-async def entity_descriptors_create(
-    request: Request,
+def entity_descriptors_create(
+    db_path: DbPath,
     entity_id: str,
     payload: DescriptorCreateRequest,
-) -> ApiResponse[Descriptor] | JSONResponse:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+) -> ApiResponse[Descriptor] | Response:
     entity = get_entity(db_path, entity_id=entity_id, include_deleted=False)
     if entity is None:
         raise HTTPException(status_code=404, detail="Entity not found")
@@ -153,29 +222,25 @@ async def entity_descriptors_create(
         db_path, scope=payload.scope, field_key=payload.field_key, include_deleted=False
     )
     if field_def is None:
-        return JSONResponse(
-            status_code=422,
-            content=fail(
-                code="validation_error",
-                message="Unknown field definition",
-                details={"scope": payload.scope, "field_key": payload.field_key},
-            ).model_dump(mode="json"),
+        return fail_json(
+            422,
+            code="validation_error",
+            message="Unknown field definition",
+            details={"scope": payload.scope, "field_key": payload.field_key},
         )
 
     errors = _validate_value(field_def, payload.value)
     if errors:
-        return JSONResponse(
-            status_code=422,
-            content=fail(
-                code="validation_error",
-                message="Invalid descriptor value",
-                details={
-                    "scope": payload.scope,
-                    "field_key": payload.field_key,
-                    "field_type": field_def.field_type,
-                    "errors": errors,
-                },
-            ).model_dump(mode="json"),
+        return fail_json(
+            422,
+            code="validation_error",
+            message="Invalid descriptor value",
+            details={
+                "scope": payload.scope,
+                "field_key": payload.field_key,
+                "field_type": field_def.field_type,
+                "errors": errors,
+            },
         )
 
     try:
@@ -197,15 +262,11 @@ class DescriptorPatchRequest(BaseModel):
 
 
 @router.patch("/descriptors/{descriptor_id}", response_model=ApiResponse[Descriptor])
-async def descriptors_patch(
-    request: Request,
+def descriptors_patch(
+    db_path: DbPath,
     descriptor_id: str,
     payload: DescriptorPatchRequest,
-) -> ApiResponse[Descriptor] | JSONResponse:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+) -> ApiResponse[Descriptor] | Response:
     existing = get_descriptor(db_path, descriptor_id=descriptor_id, include_deleted=False)
     if existing is None:
         raise HTTPException(status_code=404, detail="Descriptor not found")
@@ -214,29 +275,25 @@ async def descriptors_patch(
         db_path, scope=existing.scope, field_key=existing.field_key, include_deleted=False
     )
     if field_def is None:
-        return JSONResponse(
-            status_code=422,
-            content=fail(
-                code="validation_error",
-                message="Unknown field definition",
-                details={"scope": existing.scope, "field_key": existing.field_key},
-            ).model_dump(mode="json"),
+        return fail_json(
+            422,
+            code="validation_error",
+            message="Unknown field definition",
+            details={"scope": existing.scope, "field_key": existing.field_key},
         )
 
     errors = _validate_value(field_def, payload.value)
     if errors:
-        return JSONResponse(
-            status_code=422,
-            content=fail(
-                code="validation_error",
-                message="Invalid descriptor value",
-                details={
-                    "scope": existing.scope,
-                    "field_key": existing.field_key,
-                    "field_type": field_def.field_type,
-                    "errors": errors,
-                },
-            ).model_dump(mode="json"),
+        return fail_json(
+            422,
+            code="validation_error",
+            message="Invalid descriptor value",
+            details={
+                "scope": existing.scope,
+                "field_key": existing.field_key,
+                "field_type": field_def.field_type,
+                "errors": errors,
+            },
         )
 
     row = patch_descriptor_value(db_path, descriptor_id=descriptor_id, value=payload.value)
@@ -251,14 +308,10 @@ class DeleteResponse(BaseModel):
 
 
 @router.delete("/descriptors/{descriptor_id}", response_model=ApiResponse[DeleteResponse])
-async def descriptors_delete(
-    request: Request,
+def descriptors_delete(
+    db_path: DbPath,
     descriptor_id: str,
 ) -> ApiResponse[DeleteResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
     deleted = soft_delete_descriptor(db_path, descriptor_id=descriptor_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Descriptor not found")
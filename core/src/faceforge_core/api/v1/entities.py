@@ -2,11 +2,18 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
-from faceforge_core.api.models import ApiResponse, ok
-from faceforge_core.db.assets import get_asset, link_asset_to_entity, unlink_asset_from_entity
+from faceforge_core.api.deps import DbPath
+from faceforge_core.api.etag import if_none_match, not_modified, set_etag, weak_etag
+from faceforge_core.api.models import ApiResponse, ok, ok_json
+from faceforge_core.api.pagination import decode_cursor, encode_cursor
+from faceforge_core.db.assets import (
+    entity_and_asset_exist,
+    link_asset_to_entity,
+    unlink_asset_from_entity,
+)
 from faceforge_core.db.entities import (
     EntityRow,
     create_entity,
@@ -29,16 +36,22 @@ class Entity(BaseModel):
     updated_at: str
 
 
+def _entity_to_dict(row: EntityRow) -> dict[str, Any]:
+    # Same shape as Entity, for endpoints that serialize without the model.
+    return {
+        "entity_id": row.entity_id,
+        "display_name": row.display_name,
+        "aliases": row.aliases,
+        "tags": row.tags,
+        "fields": row.fields,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
 def _to_entity(row: EntityRow) -> Entity:
-    return Entity(
-        entity_id=row.entity_id,
-        display_name=row.display_name,
-        aliases=row.aliases,
-        tags=row.tags,
-        fields=row.fields,
-        created_at=row.created_at,
-        updated_at=row.updated_at,
-    )
+    # Trusted DB row: skip per-field validation (same as _to_asset).
+    return Entity.model_construct(**_entity_to_dict(row))
 
 
 class EntityCreateRequest(BaseModel):
@@ -57,24 +70,34 @@ class EntityPatchRequest(BaseModel):
 
 class EntityListResponse(BaseModel):
     items: list[Entity]
-    total: int
+    # Only counted for offset requests with with_total=true; null otherwise.
+    total: int | None
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 @router.get("/entities", response_model=ApiResponse[EntityListResponse])
-async def entities_list(
-    request: Request,
+def entities_list(
+    db_path: DbPath,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="next_cursor from a previous page (replaces offset)"
+    ),
     sort_by: Literal["created_at", "updated_at", "display_name"] = "created_at",
     sort_order: Literal["asc", "desc"] = "desc",
     q: str | None = Query(default=None, description="Substring match against basic fields"),
     tag: str | None = Query(default=None, description="Filter by tag (exact tag string)"),
-) -> ApiResponse[EntityListResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
+    with_total: bool = Query(default=False, description="Also count matching rows (offset only)"),
+) -> Response:
+    after: tuple[str, str] | None = None
+    if cursor is not None:
+        c_sort_by, c_sort_order, c_value, c_id = decode_cursor(cursor, size=4)
+        if (c_sort_by, c_sort_order) != (sort_by, sort_order):
+            raise HTTPException(status_code=422, detail="cursor does not match sort_by/sort_order")
+        after = (c_value, c_id)
+        offset = 0
 
     result = list_entities(
         db_path,
@@ -84,27 +107,32 @@ async def entities_list(
         sort_order=sort_order,
         q=q,
         tag=tag,
+        after=after,
+        with_total=with_total,
     )
 
-    return ok(
-        EntityListResponse(
-            items=[_to_entity(r) for r in result.items],
-            total=result.total,
-            limit=limit,
-            offset=offset,
-        )
+    next_cursor: str | None = None
+    if result.has_more and result.items:
+        last = result.items[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.entity_id)
+
+    # Hot read path: response_model documents the shape; serialize the rows directly.
+    return ok_json(
+        {
+            "items": [_entity_to_dict(r) for r in result.items],
+            "total": result.total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor,
+        }
     )
 
 
 @router.post("/entities", response_model=ApiResponse[Entity])
-async def entities_create(
-    request: Request,
+def entities_create(
+    db_path: DbPath,
     payload: EntityCreateRequest,
 ) -> ApiResponse[Entity]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
     row = create_entity(
         db_path,
         display_name=payload.display_name,
@@ -116,28 +144,27 @@ async def entities_create(
 
 
 @router.get("/entities/{entity_id}", response_model=ApiResponse[Entity])
-async def entities_get(request: Request, entity_id: str) -> ApiResponse[Entity]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+def entities_get(
+    request: Request, response: Response, db_path: DbPath, entity_id: str
+) -> ApiResponse[Entity] | Response:
     row = get_entity(db_path, entity_id=entity_id, include_deleted=False)
     if row is None:
         raise HTTPException(status_code=404, detail="Entity not found")
 
+    # Every write path bumps updated_at.
+    etag = weak_etag(row.entity_id, row.updated_at)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return ok(_to_entity(row))
 
 
 @router.patch("/entities/{entity_id}", response_model=ApiResponse[Entity])
-async def entities_patch(
-    request: Request,
+def entities_patch(
+    db_path: DbPath,
     entity_id: str,
     payload: EntityPatchRequest,
 ) -> ApiResponse[Entity]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
     row = patch_entity(
         db_path,
         entity_id=entity_id,
@@ -157,11 +184,7 @@ class DeleteResponse(BaseModel):
 
 
 @router.delete("/entities/{entity_id}", response_model=ApiResponse[DeleteResponse])
-async def entities_delete(request: Request, entity_id: str) -> ApiResponse[DeleteResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
+def entities_delete(db_path: DbPath, entity_id: str) -> ApiResponse[DeleteResponse]:
     deleted = soft_delete_entity(db_path, entity_id=entity_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Entity not found")
@@ -181,22 +204,18 @@ class EntityAssetLinkResponse(BaseModel):
     "/entities/{entity_id}/assets/{asset_id}",
     response_model=ApiResponse[EntityAssetLinkResponse],
 )
-async def entity_assets_link(
-    request: Request,
+def entity_assets_link(
+    db_path: DbPath,
     entity_id: str,
     asset_id: str,
     payload: EntityAssetLinkRequest,
 ) -> ApiResponse[EntityAssetLinkResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
-    entity = get_entity(db_path, entity_id=entity_id, include_deleted=False)
-    if entity is None:
+    entity_exists, asset_exists = entity_and_asset_exist(
+        db_path, entity_id=entity_id, asset_id=asset_id
+    )
+    if not entity_exists:
         raise HTTPException(status_code=404, detail="Entity not found")
-
-    asset = get_asset(db_path, asset_id=asset_id, include_deleted=False)
-    if asset is None:
+    if not asset_exists:
         raise HTTPException(status_code=404, detail="Asset not found")
 
     link_asset_to_entity(db_path, entity_id=entity_id, asset_id=asset_id, role=payload.role)
@@ -207,21 +226,17 @@ async def entity_assets_link(
     "/entities/{entity_id}/assets/{asset_id}",
     response_model=ApiResponse[EntityAssetLinkResponse],
 )
-async def entity_assets_unlink(
-    request: Request,
+def entity_assets_unlink(
+    db_path: DbPath,
     entity_id: str,
     asset_id: str,
 ) -> ApiResponse[EntityAssetLinkResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
-    entity = get_entity(db_path, entity_id=entity_id, include_deleted=False)
-    if entity is None:
+    entity_exists, asset_exists = entity_and_asset_exist(
+        db_path, entity_id=entity_id, asset_id=asset_id
+    )
+    if not entity_exists:
         raise HTTPException(status_code=404, detail="Entity not found")
-
-    asset = get_asset(db_path, asset_id=asset_id, include_deleted=False)
-    if asset is None:
+    if not asset_exists:
         raise HTTPException(status_code=404, detail="Asset not found")
 
     removed = unlink_asset_from_entity(db_path, entity_id=entity_id, asset_id=asset_id)
@@ -2,22 +2,23 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
-from faceforge_core.api.models import ApiResponse, ok
+from faceforge_core.api.deps import Ctx, DbPath
+from faceforge_core.api.etag import if_none_match, not_modified, set_etag, weak_etag
+from faceforge_core.api.models import ApiResponse, ok, ok_json
+from faceforge_core.api.pagination import decode_cursor, encode_cursor
 from faceforge_core.db.ids import new_job_id
 from faceforge_core.db.jobs import (
     JobLogRow,
     JobRow,
-    append_job_log,
+    cancel_job,
     get_job,
-    list_job_logs,
     list_jobs,
-    request_job_cancel,
+    tail_job_logs,
 )
-from faceforge_core.jobs.dispatcher import JobContext, known_job_types, start_job_thread
-from faceforge_core.storage.manager import StorageManager
+from faceforge_core.jobs.dispatcher import JobContext, known_job_types
 
 router = APIRouter(tags=["jobs"])
 
@@ -38,22 +39,28 @@ class Job(BaseModel):
     error: Any | None = None
 
 
+def _job_to_dict(row: JobRow) -> dict[str, Any]:
+    # Same shape as Job, for endpoints that serialize without the model.
+    return {
+        "job_id": row.job_id,
+        "job_type": row.job_type,
+        "status": row.status,
+        "progress_percent": row.progress_percent,
+        "progress_step": row.progress_step,
+        "input": row.input,
+        "result": row.result,
+        "cancel_requested_at": row.cancel_requested_at,
+        "created_at": row.created_at,
+        "started_at": row.started_at,
+        "finished_at": row.finished_at,
+        "canceled_at": row.canceled_at,
+        "error": row.error,
+    }
+
+
 def _to_job(row: JobRow) -> Job:
-    return Job(
-        job_id=row.job_id,
-        job_type=row.job_type,
-        status=row.status,
-        progress_percent=row.progress_percent,
-        progress_step=row.progress_step,
-        input=row.input,
-        result=row.result,
-        cancel_requested_at=row.cancel_requested_at,
-        created_at=row.created_at,
-        started_at=row.started_at,
-        finished_at=row.finished_at,
-        canceled_at=row.canceled_at,
-        error=row.error,
-    )
+    # Trusted DB row: skip per-field validation (same as _to_asset).
+    return Job.model_construct(**_job_to_dict(row))
 
 
 class JobCreateRequest(BaseModel):
@@ -62,77 +69,117 @@ class JobCreateRequest(BaseModel):
 
 
 @router.post("/jobs", response_model=ApiResponse[Job])
-async def jobs_create(request: Request, payload: JobCreateRequest) -> ApiResponse[Job]:
-    db_path = getattr(request.app.state, "db_path", None)
-    storage_mgr: StorageManager | None = getattr(request.app.state, "storage_manager", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-    if storage_mgr is None:
-        raise HTTPException(status_code=500, detail="Storage not initialized")
-
+def jobs_create(app_ctx: Ctx, payload: JobCreateRequest) -> ApiResponse[Job]:
+    db_path = app_ctx.db_path
     job_type = payload.job_type.strip()
-    if job_type not in known_job_types():
+    known = known_job_types()
+    if job_type not in known:
         raise HTTPException(
             status_code=422,
-            detail=f"Unknown job_type. Supported: {sorted(known_job_types())}",
+            detail=f"Unknown job_type. Supported: {sorted(known)}",
         )
 
+    runner = app_ctx.job_runner
+    if runner is None:
+        raise HTTPException(status_code=500, detail="Job runner not initialized")
+
     job_id = new_job_id()
 
     # Late import to avoid circular imports at module load time.
     from faceforge_core.db.jobs import create_job
 
     row = create_job(
-        db_path, job_id=job_id, job_type=job_type, status="queued", input=payload.input
+        db_path,
+        job_id=job_id,
+        job_type=job_type,
+        status="queued",
+        input=payload.input,
+        log_message="Job queued",
     )
-    append_job_log(db_path, job_id=job_id, level="info", message="Job queued")
 
-    ctx = JobContext(db_path=db_path, storage_mgr=storage_mgr)
-    start_job_thread(ctx=ctx, job_id=job_id)
+    ctx = JobContext(db_path=db_path, storage_mgr=app_ctx.storage_mgr)
+    runner.submit(ctx=ctx, job_id=job_id)
 
     return ok(_to_job(row))
 
 
 class JobListResponse(BaseModel):
     items: list[Job]
-    total: int
+    # Only counted for offset requests with with_total=true; null otherwise.
+    total: int | None
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 @router.get("/jobs", response_model=ApiResponse[JobListResponse])
-async def jobs_list(
-    request: Request,
+def jobs_list(
+    db_path: DbPath,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="next_cursor from a previous page (replaces offset)"
+    ),
     status: str | None = Query(default=None, description="Filter by exact status"),
     job_type: str | None = Query(default=None, description="Filter by exact job_type"),
-) -> ApiResponse[JobListResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
-    result = list_jobs(db_path, limit=limit, offset=offset, status=status, job_type=job_type)
-    return ok(
-        JobListResponse(
-            items=[_to_job(r) for r in result.items],
-            total=result.total,
-            limit=limit,
-            offset=offset,
-        )
+    with_total: bool = Query(default=False, description="Also count matching rows (offset only)"),
+) -> Response:
+    after: tuple[str, str] | None = None
+    if cursor is not None:
+        c_created_at, c_id = decode_cursor(cursor, size=2)
+        after = (c_created_at, c_id)
+        offset = 0
+
+    result = list_jobs(
+        db_path,
+        limit=limit,
+        offset=offset,
+        status=status,
+        job_type=job_type,
+        after=after,
+        with_total=with_total,
     )
 
+    next_cursor: str | None = None
+    if result.has_more and result.items:
+        last = result.items[-1]
+        next_cursor = encode_cursor(last.created_at, last.job_id)
+
+    # Hot read path: response_model documents the shape; serialize the rows directly.
+    return ok_json(
+        {
+            "items": [_job_to_dict(r) for r in result.items],
+            "total": result.total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor,
+        }
+    )
 
-@router.get("/jobs/{job_id}", response_model=ApiResponse[Job])
-async def jobs_get(request: Request, job_id: str) -> ApiResponse[Job]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
 
+@router.get("/jobs/{job_id}", response_model=ApiResponse[Job])
+def jobs_get(
+    request: Request, response: Response, db_path: DbPath, job_id: str
+) -> ApiResponse[Job] | Response:
     row = get_job(db_path, job_id=job_id, include_deleted=False)
     if row is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    # Jobs have no updated_at; these are the columns that move while one is polled
+    # (result/error are written together with finished_at).
+    etag = weak_etag(
+        row.job_id,
+        row.status,
+        row.progress_percent,
+        row.progress_step,
+        row.cancel_requested_at,
+        row.started_at,
+        row.finished_at,
+        row.canceled_at,
+    )
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return ok(_to_job(row))
 
 
@@ -144,14 +191,14 @@ class JobLogEntry(BaseModel):
     data: Any | None = None
 
 
-def _to_log(row: JobLogRow) -> JobLogEntry:
-    return JobLogEntry(
-        job_log_id=row.job_log_id,
-        ts=row.ts,
-        level=row.level,
-        message=row.message,
-        data=row.data,
-    )
+def _log_to_dict(row: JobLogRow) -> dict[str, Any]:
+    return {
+        "job_log_id": row.job_log_id,
+        "ts": row.ts,
+        "level": row.level,
+        "message": row.message,
+        "data": row.data,
+    }
 
 
 class JobLogResponse(BaseModel):
@@ -160,24 +207,27 @@ class JobLogResponse(BaseModel):
 
 
 @router.get("/jobs/{job_id}/log", response_model=ApiResponse[JobLogResponse])
-async def jobs_log(
+def jobs_log(
     request: Request,
+    db_path: DbPath,
     job_id: str,
     after_id: int = Query(default=0, ge=0),
     limit: int = Query(default=500, ge=1, le=2000),
-) -> ApiResponse[JobLogResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
-    job = get_job(db_path, job_id=job_id, include_deleted=False)
-    if job is None:
+) -> Response:
+    rows = tail_job_logs(db_path, job_id=job_id, after_id=after_id, limit=limit)
+    if rows is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    rows = list_job_logs(db_path, job_id=job_id, after_id=after_id, limit=limit)
-    items = [_to_log(r) for r in rows]
-    next_after = items[-1].job_log_id if items else after_id
-    return ok(JobLogResponse(items=items, next_after_id=next_after))
+    # Polled while a job runs, up to 2000 rows per call: serialize the rows directly.
+    next_after = rows[-1].job_log_id if rows else after_id
+
+    # Logs are append-only, so the page is fixed by the cursor range it covers.
+    etag = weak_etag(job_id, after_id, limit, next_after)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    resp = ok_json({"items": [_log_to_dict(r) for r in rows], "next_after_id": next_after})
+    set_etag(resp, etag)
+    return resp
 
 
 class JobCancelResponse(BaseModel):
@@ -186,22 +236,10 @@ class JobCancelResponse(BaseModel):
 
 
 @router.post("/jobs/{job_id}/cancel", response_model=ApiResponse[JobCancelResponse])
-async def jobs_cancel(request: Request, job_id: str) -> ApiResponse[JobCancelResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
-    job = get_job(db_path, job_id=job_id, include_deleted=False)
+def jobs_cancel(db_path: DbPath, job_id: str) -> ApiResponse[JobCancelResponse]:
+    ok_cancel, job = cancel_job(db_path, job_id=job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    ok_cancel = request_job_cancel(db_path, job_id=job_id)
-    if ok_cancel:
-        append_job_log(db_path, job_id=job_id, level="info", message="Cancel requested")
-
     # Return current state (may still be running; cancellation is cooperative).
-    job2 = get_job(db_path, job_id=job_id, include_deleted=False)
-    if job2 is None:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    return ok(JobCancelResponse(cancel_requested=ok_cancel, job=_to_job(job2)))
+    return ok(JobCancelResponse(cancel_requested=ok_cancel, job=_to_job(job)))
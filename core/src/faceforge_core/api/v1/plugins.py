@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
-from jsonschema import Draft202012Validator
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
-from faceforge_core.api.models import ApiResponse, fail, ok
+from faceforge_core.api.deps import DbPath, Paths
+from faceforge_core.api.etag import if_none_match, not_modified, set_etag, weak_etag_for_bytes
+from faceforge_core.api.models import ApiResponse, fail_json, ok, ok_json
 from faceforge_core.db.plugins import (
     PluginRegistryRow,
     get_plugin_registry,
@@ -15,8 +15,9 @@ from faceforge_core.db.plugins import (
     set_plugin_config,
     set_plugin_enabled,
     upsert_plugin_discovery,
+    upsert_plugins_discovery,
 )
-from faceforge_core.plugins.discovery import discover_plugins
+from faceforge_core.plugins.discovery import config_schema_validator, discover_plugins_cached
 
 router = APIRouter(tags=["plugins"])
 
@@ -49,46 +50,33 @@ def _registry_to_plugin(
     )
 
 
-def _validation_error_json(*, message: str, details: Any) -> JSONResponse:
-    return JSONResponse(
-        status_code=422,
-        content=fail(
-            code="validation_error",
-            message=message,
-            details=details,
-        ).model_dump(mode="json"),
-    )
+def _validation_error_json(*, message: str, details: Any) -> Response:
+    return fail_json(422, code="validation_error", message=message, details=details)
 
 
 def _validate_config(schema: dict[str, Any], config: Any) -> list[dict[str, Any]]:
-    validator = Draft202012Validator(schema)
-    errors: list[dict[str, Any]] = []
-    for e in validator.iter_errors(config):
-        errors.append(
-            {
-                "path": list(e.path),
-                "message": e.message,
-                "schema_path": list(e.schema_path),
-                "validator": e.validator,
-            }
-        )
+    errors = [
+        {
+            "path": list(e.path),
+            "message": e.message,
+            "schema_path": list(e.schema_path),
+            "validator": e.validator,
+        }
+        for e in config_schema_validator(schema).iter_errors(config)
+    ]
     errors.sort(key=lambda err: ("/".join(map(str, err.get("path", []))), err.get("message", "")))
     return errors
 
 
 @router.get("/plugins", response_model=ApiResponse[dict[str, list[Plugin]]])
-async def plugins_list(request: Request) -> ApiResponse[dict[str, list[Plugin]]]:
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if db_path is None or paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-
-    discovered = discover_plugins(plugins_dir=paths.plugins_dir)
-    discovered_by_id = {p.manifest.id: p for p in discovered}
+def plugins_list(request: Request, db_path: DbPath, paths: Paths) -> Response:
+    index = discover_plugins_cached(plugins_dir=paths.plugins_dir)
+    discovered_by_id = index.by_id
 
     # Ensure all discovered plugins have a registry row.
-    for p in discovered:
-        upsert_plugin_discovery(db_path, plugin_id=p.manifest.id, version=p.manifest.version)
+    upsert_plugins_discovery(
+        db_path, items=[(p.manifest.id, p.manifest.version) for p in index.plugins]
+    )
 
     rows = list_plugin_registry(db_path, include_deleted=False)
 
@@ -104,17 +92,18 @@ async def plugins_list(request: Request) -> ApiResponse[dict[str, list[Plugin]]]
             )
         )
 
-    return ok({"items": items})
+    # The payload mixes registry rows with on-disk manifests, so tag the rendered body.
+    resp = ok_json({"items": [p.model_dump(mode="json") for p in items]})
+    etag = weak_etag_for_bytes(bytes(resp.body))
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    set_etag(resp, etag)
+    return resp
 
 
 @router.post("/plugins/{plugin_id}/enable", response_model=ApiResponse[Plugin])
-async def plugins_enable(request: Request, plugin_id: str) -> ApiResponse[Plugin]:
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if db_path is None or paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+def plugins_enable(db_path: DbPath, paths: Paths, plugin_id: str) -> ApiResponse[Plugin]:
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         raise HTTPException(status_code=404, detail="Plugin not discovered")
 
@@ -139,13 +128,8 @@ async def plugins_enable(request: Request, plugin_id: str) -> ApiResponse[Plugin
 
 
 @router.post("/plugins/{plugin_id}/disable", response_model=ApiResponse[Plugin])
-async def plugins_disable(request: Request, plugin_id: str) -> ApiResponse[Plugin]:
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if db_path is None or paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+def plugins_disable(db_path: DbPath, paths: Paths, plugin_id: str) -> ApiResponse[Plugin]:
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         raise HTTPException(status_code=404, detail="Plugin not discovered")
 
@@ -175,16 +159,10 @@ class PluginConfigResponse(BaseModel):
 
 
 @router.get("/plugins/{plugin_id}/config", response_model=ApiResponse[PluginConfigResponse])
-async def plugins_get_config(request: Request, plugin_id: str) -> ApiResponse[PluginConfigResponse]:
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-
-    if paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+def plugins_get_config(
+    db_path: DbPath, paths: Paths, plugin_id: str
+) -> ApiResponse[PluginConfigResponse]:
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         raise HTTPException(status_code=404, detail="Plugin not discovered")
 
@@ -212,17 +190,13 @@ class PluginConfigPutRequest(BaseModel):
 
 
 @router.put("/plugins/{plugin_id}/config", response_model=ApiResponse[PluginConfigResponse])
-async def plugins_put_config(
-    request: Request,
+def plugins_put_config(
+    db_path: DbPath,
+    paths: Paths,
     plugin_id: str,
     payload: PluginConfigPutRequest,
-) -> ApiResponse[PluginConfigResponse] | JSONResponse:
-    db_path = getattr(request.app.state, "db_path", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if db_path is None or paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
-
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+) -> ApiResponse[PluginConfigResponse] | Response:
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         raise HTTPException(status_code=404, detail="Plugin not discovered")
 
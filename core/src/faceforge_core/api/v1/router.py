@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter
 from pydantic import BaseModel
 
 from faceforge_core import __version__
+from faceforge_core.api.deps import Paths
 from faceforge_core.api.models import ApiResponse, ok
 from faceforge_core.api.v1.admin_field_defs import router as admin_field_defs_router
 from faceforge_core.api.v1.assets import router as assets_router
@@ -12,6 +13,7 @@ from faceforge_core.api.v1.entities import router as entities_router
 from faceforge_core.api.v1.jobs import router as jobs_router
 from faceforge_core.api.v1.plugins import router as plugins_router
 from faceforge_core.api.v1.relationships import router as relationships_router
+from faceforge_core.home import FaceForgePaths
 
 router = APIRouter(prefix="/v1", tags=["v1"])
 
@@ -36,23 +38,25 @@ async def ping() -> ApiResponse[dict[str, bool]]:
 
 
 @router.get("/system/info", response_model=ApiResponse[SystemInfo])
-async def system_info(request: Request) -> ApiResponse[SystemInfo]:
+async def system_info(paths: Paths) -> ApiResponse[SystemInfo]:
+    # Normally answered from the bytes precomputed at startup (see
+    # PrecomputedResponseMiddleware); this route documents it and is the fallback.
+    return ok(build_system_info(paths))
+
+
+def build_system_info(paths: FaceForgePaths) -> SystemInfo:
     # Keep this endpoint stable and boring: basic runtime identity + resolved paths.
     # (No secrets, and no deep config introspection.)
-    home = getattr(request.app.state, "faceforge_home", None)
-    paths = getattr(request.app.state, "faceforge_paths", None)
-
-    info = SystemInfo(
+    return SystemInfo(
         version=__version__,
-        faceforge_home=str(home) if home is not None else "",
+        faceforge_home=str(paths.home),
         paths={
-            "db_dir": str(paths.db_dir) if paths is not None else "",
-            "s3_dir": str(paths.s3_dir) if paths is not None else "",
-            "assets_dir": str(paths.assets_dir) if paths is not None else "",
-            "logs_dir": str(paths.logs_dir) if paths is not None else "",
-            "config_dir": str(paths.config_dir) if paths is not None else "",
-            "plugins_dir": str(paths.plugins_dir) if paths is not None else "",
-            "tmp_dir": str(paths.tmp_dir) if paths is not None else "",
+            "db_dir": str(paths.db_dir),
+            "s3_dir": str(paths.s3_dir),
+            "assets_dir": str(paths.assets_dir),
+            "logs_dir": str(paths.logs_dir),
+            "config_dir": str(paths.config_dir),
+            "plugins_dir": str(paths.plugins_dir),
+            "tmp_dir": str(paths.tmp_dir),
         },
     )
-    return ok(info)
@@ -1,24 +1,41 @@
 from __future__ import annotations
 
 import logging
+import mimetypes
 from contextlib import asynccontextmanager
-from logging.handlers import RotatingFileHandler
+from typing import Any
 
-from fastapi import Depends, FastAPI, HTTPException, Request
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 from starlette.staticfiles import StaticFiles
 
-from faceforge_core.api.models import fail
+from faceforge_core.api.access_log import AccessLogMiddleware
+from faceforge_core.api.compression import ApiGZipMiddleware
+from faceforge_core.api.deps import AppContext
+from faceforge_core.api.models import fail_json, ok
+from faceforge_core.api.precomputed import PrecomputedResponseMiddleware
+from faceforge_core.api.v1.router import build_system_info
 from faceforge_core.api.v1.router import router as v1_router
-from faceforge_core.auth import extract_token_from_request, is_exempt_path, require_install_token
-from faceforge_core.config import ensure_install_token, load_core_config, resolve_configured_paths
+from faceforge_core.auth import TokenAuthMiddleware, add_token_security_to_openapi
+from faceforge_core.config import (
+    CoreConfig,
+    ensure_install_token,
+    load_core_config,
+    resolve_configured_paths,
+)
 from faceforge_core.db import resolve_db_path
+from faceforge_core.db.connection import close_all_connections
+from faceforge_core.db.ids import sha256_backend
 from faceforge_core.db.migrate import apply_migrations
-from faceforge_core.home import ensure_faceforge_layout, resolve_faceforge_home
+from faceforge_core.home import FaceForgePaths, ensure_faceforge_layout, resolve_faceforge_home
+from faceforge_core.ingest.exiftool import ExifToolWorker, find_exiftool_executable
+from faceforge_core.ingest.metadata_batch import MetadataBatchWriter, batch_size_from_env
+from faceforge_core.jobs.dispatcher import JobRunner, job_workers_from_env
+from faceforge_core.logfile import start_file_logging
 from faceforge_core.seaweedfs import start_managed_seaweed, stop_managed_seaweed
 from faceforge_core.storage.manager import build_storage_manager
 from faceforge_core.ui.router import STATIC_DIR as UI_STATIC_DIR
@@ -27,47 +44,90 @@ from faceforge_core.ui.router import router as ui_router
 logger = logging.getLogger(__name__)
 
 
-def create_app() -> FastAPI:
+def create_app(*, paths: FaceForgePaths | None = None, config: CoreConfig | None = None) -> FastAPI:
+    """Build the Core ASGI app.
+
+    Callers that already resolved paths/config (e.g. `python -m faceforge_core`) may pass
+    them in so startup does not re-create the layout and re-parse core.json.
+    """
+
+    preloaded = (paths, config) if paths is not None and config is not None else None
+
     @asynccontextmanager
     async def _lifespan(app: FastAPI):
-        home = resolve_faceforge_home()
-        paths = ensure_faceforge_layout(home)
-        config = load_core_config(paths)
-        paths = resolve_configured_paths(paths, config)
+        if preloaded is not None:
+            paths, config = preloaded
+            home = paths.home
+        else:
+            home = resolve_faceforge_home()
+            paths = ensure_faceforge_layout(home)
+            config = load_core_config(paths)
+            paths = resolve_configured_paths(paths, config)
         config = ensure_install_token(paths, config)
 
-        # Configure Logging
-        log_path = paths.logs_dir / "core.log"
-        file_handler = RotatingFileHandler(
-            log_path,
-            maxBytes=config.logging.max_size_mb * 1024 * 1024,
-            backupCount=config.logging.backup_count,
-            encoding="utf-8",
+        # Configure root logger to capture all module logs; file writes happen on a
+        # listener thread (see faceforge_core.logfile).
+        logging.getLogger().setLevel(logging.INFO)
+        file_logging = start_file_logging(
+            paths.logs_dir / "core.log",
+            max_bytes=config.logging.max_size_mb * 1024 * 1024,
+            backup_count=config.logging.backup_count,
         )
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(formatter)
-
-        # Configure root logger to capture all module logs
-        root = logging.getLogger()
-        root.setLevel(logging.INFO)
-        # Avoid adding duplicate handlers if reloaded
-        if not any(isinstance(h, RotatingFileHandler) for h in root.handlers):
-            root.addHandler(file_handler)
 
         logger.info("FaceForge Core starting up")
         logger.info(f"Logs directory: {paths.logs_dir}")
+        logger.info(f"SHA-256 backend: {sha256_backend()}")
 
         db_path = resolve_db_path(paths)
         apply_migrations(db_path)
 
+        # Load the system MIME tables now rather than on the first download.
+        mimetypes.init()
+
         app.state.faceforge_home = home
         app.state.faceforge_paths = paths
         app.state.faceforge_config = config
         app.state.db_path = db_path
 
+        # Batched writer for background-extracted asset metadata (ExifTool).
+        metadata_writer = MetadataBatchWriter(db_path, batch_size=batch_size_from_env())
+        metadata_writer.start()
+
+        # Resolve ExifTool once and warm a persistent process so the first upload
+        # skips its cold start.
+        exiftool_path = find_exiftool_executable(config, paths)
+        exiftool_worker: ExifToolWorker | None = None
+        if exiftool_path is not None:
+            exiftool_worker = ExifToolWorker(exiftool_path)
+            try:
+                exiftool_worker.start()
+            except OSError as e:
+                logger.warning(f"ExifTool worker failed to start: {e}")
+
+        job_runner = JobRunner(workers=job_workers_from_env())
+
         # Storage manager (filesystem + optional S3).
         app.state.storage_manager = build_storage_manager(paths=paths, config=config)
 
+        app.state.ctx = AppContext(
+            db_path=db_path,
+            paths=paths,
+            config=config,
+            storage_mgr=app.state.storage_manager,
+            exiftool_path=exiftool_path,
+            exiftool_worker=exiftool_worker,
+            metadata_writer=metadata_writer,
+            job_runner=job_runner,
+            install_token_bytes=(config.auth.install_token or "").encode("utf-8"),
+            precomputed_responses={
+                "/healthz": orjson.dumps({"status": "ok"}),
+                "/v1/ping": orjson.dumps(ok({"pong": True}).model_dump(mode="json")),
+                "/v1/system/info": orjson.dumps(
+                    ok(build_system_info(paths)).model_dump(mode="json")
+                ),
+            },
+        )
+
         # Optional: Core-managed SeaweedFS process (dev/testing only; Desktop orchestrates later).
         app.state.seaweed_process = start_managed_seaweed(paths, config)
 
@@ -75,65 +135,36 @@ def create_app() -> FastAPI:
             yield
         finally:
             stop_managed_seaweed(getattr(app.state, "seaweed_process", None))
+            if exiftool_worker is not None:
+                exiftool_worker.close()
+            job_runner.stop()
+            metadata_writer.stop()
+            close_all_connections(db_path)
+            if file_logging is not None:
+                file_logging.stop()
 
     app = FastAPI(title="FaceForge Core", version="0.1.9", lifespan=_lifespan)
 
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        response = await call_next(request)
-        # Log after response to get status code
-        # We can add more details here if needed
-        logger.info(f"{request.method} {request.url.path} - {response.status_code}")
-        return response
-
-    class _TokenAuthMiddleware(BaseHTTPMiddleware):
-        async def dispatch(self, request: Request, call_next) -> Response:
-            path = request.url.path
-            if is_exempt_path(path):
-                return await call_next(request)
-
-            expected = getattr(getattr(request.app.state, "faceforge_config", None), "auth", None)
-            expected_token = getattr(expected, "install_token", None)
-            if not expected_token:
-                return JSONResponse(
-                    status_code=500,
-                    content=fail(
-                        code="internal_error",
-                        message="Server auth token not initialized",
-                    ).model_dump(mode="json"),
-                )
-
-            provided = extract_token_from_request(request)
-            if not provided:
-                return JSONResponse(
-                    status_code=401,
-                    content=fail(code="unauthorized", message="Missing token").model_dump(
-                        mode="json"
-                    ),
-                )
-            if provided != expected_token:
-                return JSONResponse(
-                    status_code=401,
-                    content=fail(code="unauthorized", message="Invalid token").model_dump(
-                        mode="json"
-                    ),
-                )
-
-            return await call_next(request)
-
-    app.add_middleware(_TokenAuthMiddleware)
+    # Added before the logging and token middlewares, so it runs inside both.
+    app.add_middleware(PrecomputedResponseMiddleware)
+
+    app.add_middleware(AccessLogMiddleware, logger=logger)
+
+    app.add_middleware(TokenAuthMiddleware)
+
+    # Outermost. Small bodies (health checks, single records, errors) are sent as-is;
+    # level 1 keeps the CPU cost of large list pages low. Asset downloads bypass it.
+    app.add_middleware(ApiGZipMiddleware, minimum_size=1024, compresslevel=1)
 
+    # exc.errors() can carry non-JSON values (e.g. the exception in "ctx"); fail_json
+    # stringifies those instead of failing to serialize.
     @app.exception_handler(RequestValidationError)
-    async def _validation_error_handler(
-        request: Request, exc: RequestValidationError
-    ) -> JSONResponse:
-        return JSONResponse(
-            status_code=422,
-            content=fail(
-                code="validation_error",
-                message="Request validation failed",
-                details=exc.errors(),
-            ).model_dump(mode="json"),
+    async def _validation_error_handler(request: Request, exc: RequestValidationError) -> Response:
+        return fail_json(
+            422,
+            code="validation_error",
+            message="Request validation failed",
+            details=exc.errors(),
         )
 
     def _status_to_code(status_code: int) -> str:
@@ -152,38 +183,37 @@ def create_app() -> FastAPI:
         return "server_error"
 
     @app.exception_handler(HTTPException)
-    async def _http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=fail(
-                code=_status_to_code(exc.status_code),
-                message=str(exc.detail),
-            ).model_dump(mode="json"),
+    async def _http_exception_handler(request: Request, exc: HTTPException) -> Response:
+        return fail_json(
+            exc.status_code, code=_status_to_code(exc.status_code), message=str(exc.detail)
         )
 
     @app.exception_handler(StarletteHTTPException)
     async def _starlette_http_exception_handler(
         request: Request, exc: StarletteHTTPException
-    ) -> JSONResponse:
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=fail(
-                code=_status_to_code(exc.status_code),
-                message=exc.detail if isinstance(exc.detail, str) else "HTTP error",
-            ).model_dump(mode="json"),
+    ) -> Response:
+        return fail_json(
+            exc.status_code,
+            code=_status_to_code(exc.status_code),
+            message=exc.detail if isinstance(exc.detail, str) else "HTTP error",
         )
 
     @app.exception_handler(Exception)
-    async def _unhandled_error_handler(request: Request, exc: Exception) -> JSONResponse:
+    async def _unhandled_error_handler(request: Request, exc: Exception) -> Response:
         # Avoid leaking internals; details can be logged later.
-        return JSONResponse(
-            status_code=500,
-            content=fail(code="internal_error", message="Internal server error").model_dump(
-                mode="json"
-            ),
-        )
+        return fail_json(500, code="internal_error", message="Internal server error")
+
+    # Auth for /v1 is enforced once, by TokenAuthMiddleware; no per-route dependency.
+    app.include_router(v1_router)
+
+    base_openapi = app.openapi
+
+    def _openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            add_token_security_to_openapi(base_openapi(), path_prefix="/v1/")
+        return app.openapi_schema
 
-    app.include_router(v1_router, dependencies=[Depends(require_install_token)])
+    app.openapi = _openapi  # type: ignore[method-assign]
 
     # Server-rendered UI (served by Core; no runtime Node dependency).
     if UI_STATIC_DIR.is_dir():
@@ -1,30 +1,24 @@
 from __future__ import annotations
 
-from typing import Final
+import hmac
+from typing import Any, Final
 
-from fastapi import HTTPException, Request, Security
-from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Request
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from faceforge_core.api.models import fail_body
 
 AUTHORIZATION_HEADER: Final[str] = "Authorization"
 TOKEN_HEADER: Final[str] = "X-FaceForge-Token"
 TOKEN_COOKIE: Final[str] = "ff_token"
 
-_bearer_scheme = HTTPBearer(auto_error=False)
-_token_header_scheme = APIKeyHeader(name=TOKEN_HEADER, auto_error=False)
+_EXEMPT_EXACT: Final[frozenset[str]] = frozenset({"/healthz", "/openapi.json", "/ui/login"})
+_EXEMPT_PREFIXES: Final[tuple[str, ...]] = ("/docs", "/redoc")
 
 
 def is_exempt_path(path: str) -> bool:
-    if path == "/healthz":
-        return True
-    if path == "/openapi.json":
-        return True
-    if path.startswith("/docs"):
-        return True
-    if path.startswith("/redoc"):
-        return True
-    if path == "/ui/login":
-        return True
-    return False
+    return path in _EXEMPT_EXACT or path.startswith(_EXEMPT_PREFIXES)
 
 
 def extract_token_from_request(request: Request) -> str | None:
@@ -46,34 +40,121 @@ def extract_token_from_request(request: Request) -> str | None:
     return None
 
 
-async def require_install_token(
-    request: Request,
-    bearer: HTTPAuthorizationCredentials | None = Security(_bearer_scheme),  # noqa: B008
-    header_token: str | None = Security(_token_header_scheme),  # noqa: B008
-) -> None:
-    """Require the per-install token for protected endpoints.
+def expected_install_token(request: Request) -> str | None:
+    """The install token from the startup AppContext (None before startup)."""
+
+    try:
+        return request.app.state.ctx.config.auth.install_token or None
+    except AttributeError:
+        return None
+
 
-    Accepts either:
-    - Authorization: Bearer <token>
-    - X-FaceForge-Token: <token>
+def _token_from_scope(scope: Scope) -> bytes | None:
+    """Same precedence as extract_token_from_request, read straight off the ASGI scope.
+
+    Returns the raw bytes so the header and bearer paths never decode.
     """
 
-    expected = getattr(getattr(request.app.state, "faceforge_config", None), "auth", None)
-    expected_token = getattr(expected, "install_token", None)
+    header_token: bytes | None = None
+    auth: bytes | None = None
+    cookies: list[bytes] = []
+    for name, value in scope["headers"]:
+        if name == b"x-faceforge-token":
+            if header_token is None:
+                header_token = value
+        elif name == b"authorization":
+            if auth is None:
+                auth = value
+        elif name == b"cookie":
+            cookies.append(value)
 
-    # If no token exists, fail closed. Startup should ensure one exists.
-    if not expected_token:
-        raise HTTPException(status_code=500, detail="Server auth token not initialized")
+    if header_token:
+        return header_token
 
-    provided = header_token
-    if not provided and bearer is not None:
-        provided = bearer.credentials
+    if cookies:
+        jar: dict[str, str] = {}
+        for raw in cookies:
+            jar.update(cookie_parser(raw.decode("latin-1")))
+        cookie_token = jar.get(TOKEN_COOKIE)
+        if cookie_token:
+            return cookie_token.encode("latin-1", "replace")
 
-    if not provided:
-        provided = request.cookies.get(TOKEN_COOKIE)
+    if auth and auth.startswith(b"Bearer "):
+        return auth[len(b"Bearer ") :].strip() or None
+    return None
+
+
+_NO_TOKEN_CONFIGURED_BODY: Final[bytes] = fail_body(
+    "internal_error", "Server auth token not initialized"
+)
+_MISSING_TOKEN_BODY: Final[bytes] = fail_body("unauthorized", "Missing token")
+_INVALID_TOKEN_BODY: Final[bytes] = fail_body("unauthorized", "Invalid token")
 
-    if not provided:
-        raise HTTPException(status_code=401, detail="Missing token")
 
-    if provided != expected_token:
-        raise HTTPException(status_code=401, detail="Invalid token")
+class TokenAuthMiddleware:
+    """Pure ASGI gate requiring the install token on every non-exempt HTTP request.
+
+    Unlike a BaseHTTPMiddleware it builds no Request/Response objects and spawns no
+    extra task; rejections are sent from pre-serialized bodies.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or is_exempt_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            expected_token = scope["app"].state.ctx.install_token_bytes
+        except (AttributeError, KeyError):
+            expected_token = None
+        if not expected_token:
+            await _send_json(send, 500, _NO_TOKEN_CONFIGURED_BODY)
+            return
+
+        provided = _token_from_scope(scope)
+        if not provided:
+            await _send_json(send, 401, _MISSING_TOKEN_BODY)
+            return
+        if not hmac.compare_digest(provided, expected_token):
+            await _send_json(send, 401, _INVALID_TOKEN_BODY)
+            return
+
+        await self.app(scope, receive, send)
+
+
+async def _send_json(send: Send, status: int, body: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+# Documented in OpenAPI only; the token middleware is what enforces it.
+_OPENAPI_SECURITY_SCHEMES: Final[dict[str, dict[str, str]]] = {
+    "HTTPBearer": {"type": "http", "scheme": "bearer"},
+    "APIKeyHeader": {"type": "apiKey", "in": "header", "name": TOKEN_HEADER},
+}
+
+
+def add_token_security_to_openapi(schema: dict[str, Any], *, path_prefix: str) -> None:
+    """Mark every operation under `path_prefix` as requiring the install token."""
+
+    components = schema.setdefault("components", {})
+    components.setdefault("securitySchemes", {}).update(_OPENAPI_SECURITY_SCHEMES)
+    requirement = [{name: []} for name in _OPENAPI_SECURITY_SCHEMES]
+    for path, ops in schema.get("paths", {}).items():
+        if not path.startswith(path_prefix):
+            continue
+        for op in ops.values():
+            if isinstance(op, dict):
+                op["security"] = requirement
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 import secrets
 from pathlib import Path
 from typing import Any
 
+import orjson
 from pydantic import BaseModel, Field
 
 from faceforge_core.home import FaceForgePaths
@@ -127,8 +127,7 @@ class CoreConfig(BaseModel):
 
 
 def _read_json(path: Path) -> dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return orjson.loads(path.read_bytes())
 
 
 def load_core_config(paths: FaceForgePaths) -> CoreConfig:
@@ -151,7 +150,9 @@ def write_core_config(paths: FaceForgePaths, config: CoreConfig) -> None:
 
     payload = config.model_dump(mode="json", exclude_none=True)
     paths.config_dir.mkdir(parents=True, exist_ok=True)
-    paths.core_config_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    paths.core_config_path.write_bytes(
+        orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
 
 
 def ensure_install_token(paths: FaceForgePaths, config: CoreConfig) -> CoreConfig:
@@ -192,9 +193,16 @@ def resolve_configured_paths(paths: FaceForgePaths, config: CoreConfig) -> FaceF
     logs_dir = _resolve_dir(config.paths.logs_dir, paths.logs_dir)
     plugins_dir = _resolve_dir(config.paths.plugins_dir, paths.plugins_dir)
 
-    # Ensure overridden dirs exist so file edits are enough.
-    for p in (db_dir, s3_dir, logs_dir, plugins_dir):
-        p.mkdir(parents=True, exist_ok=True)
+    # Ensure overridden dirs exist so file edits are enough. Unchanged defaults were
+    # already created by ensure_faceforge_layout.
+    for p, default in (
+        (db_dir, paths.db_dir),
+        (s3_dir, paths.s3_dir),
+        (logs_dir, paths.logs_dir),
+        (plugins_dir, paths.plugins_dir),
+    ):
+        if p != default:
+            p.mkdir(parents=True, exist_ok=True)
 
     return FaceForgePaths(
         home=paths.home,
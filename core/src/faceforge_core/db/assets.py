@@ -1,27 +1,22 @@
 from __future__ import annotations
 
-import json
 import sqlite3
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from typing import Any
+from typing import Any, NamedTuple
 
-
-def _utc_now_sqlite_iso() -> str:
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+from faceforge_core.db.connection import connect
+from faceforge_core.db.json_columns import dumps_json, encode_json, loads_json
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def _loads_json(raw: str) -> Any:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads_json(raw)
+    except ValueError:
         return {}
 
 
@@ -66,46 +61,56 @@ def _asset_from_db_row(row: sqlite3.Row) -> AssetRow:
     )
 
 
-def get_asset(db_path, *, asset_id: str, include_deleted: bool = False) -> AssetRow | None:
-    where = "WHERE asset_id = ?"
-    params: list[Any] = [asset_id]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
+_SELECT_ASSET = """
+SELECT asset_id, kind, filename, content_hash, byte_size, mime_type,
+       storage_provider, storage_key, meta_json, created_at, updated_at, deleted_at
+FROM assets
+""".strip()
+
+_GET_ASSET_SQL = f"{_SELECT_ASSET} WHERE asset_id = ?;"
+_GET_ASSET_LIVE_SQL = f"{_SELECT_ASSET} WHERE asset_id = ? AND deleted_at IS NULL;"
+
 
+def get_asset(db_path, *, asset_id: str, include_deleted: bool = False) -> AssetRow | None:
+    sql = _GET_ASSET_SQL if include_deleted else _GET_ASSET_LIVE_SQL
     with _connect(db_path) as conn:
-        row = conn.execute(
-            f"""
-            SELECT asset_id, kind, filename, content_hash, byte_size, mime_type,
-                   storage_provider, storage_key, meta_json, created_at, updated_at, deleted_at
-            FROM assets
-            {where};
-            """.strip(),
-            params,
-        ).fetchone()
+        row = conn.execute(sql, (asset_id,)).fetchone()
 
     return _asset_from_db_row(row) if row is not None else None
 
 
+_GET_ASSET_BY_HASH_SQL = f"{_SELECT_ASSET} WHERE content_hash = ?;"
+_GET_ASSET_BY_HASH_LIVE_SQL = f"{_SELECT_ASSET} WHERE content_hash = ? AND deleted_at IS NULL;"
+
+
 def get_asset_by_content_hash(
     db_path, *, content_hash: str, include_deleted: bool = False
 ) -> AssetRow | None:
-    where = "WHERE content_hash = ?"
-    params: list[Any] = [content_hash]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
+    sql = _GET_ASSET_BY_HASH_SQL if include_deleted else _GET_ASSET_BY_HASH_LIVE_SQL
+    with _connect(db_path) as conn:
+        row = conn.execute(sql, (content_hash,)).fetchone()
+
+    return _asset_from_db_row(row) if row is not None else None
+
+
+def list_assets_by_content_prefix(
+    db_path, *, content_hash_prefix: str, byte_size: int, limit: int = 2
+) -> list[AssetRow]:
+    """Live assets whose first-MiB hash and size match (dedupe candidates)."""
 
     with _connect(db_path) as conn:
-        row = conn.execute(
-            f"""
+        rows = conn.execute(
+            """
             SELECT asset_id, kind, filename, content_hash, byte_size, mime_type,
                    storage_provider, storage_key, meta_json, created_at, updated_at, deleted_at
             FROM assets
-            {where};
+            WHERE content_hash_prefix = ? AND byte_size = ? AND deleted_at IS NULL
+            LIMIT ?;
             """.strip(),
-            params,
-        ).fetchone()
+            (content_hash_prefix, byte_size, limit),
+        ).fetchall()
 
-    return _asset_from_db_row(row) if row is not None else None
+    return [_asset_from_db_row(r) for r in rows]
 
 
 def create_asset(
@@ -120,11 +125,12 @@ def create_asset(
     storage_provider: str,
     storage_key: str,
     meta: Any,
+    content_hash_prefix: str | None = None,
 ) -> AssetRow:
-    meta_json = json.dumps(meta if meta is not None else {}, ensure_ascii=False)
+    meta_json = dumps_json(meta if meta is not None else {})
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO assets (
                 asset_id,
@@ -135,9 +141,13 @@ def create_asset(
                 mime_type,
                 storage_provider,
                 storage_key,
-                meta_json
+                meta_json,
+                content_hash_prefix
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            RETURNING asset_id, kind, filename, content_hash, byte_size, mime_type,
+                      storage_provider, storage_key, meta_json,
+                      created_at, updated_at, deleted_at;
             """.strip(),
             (
                 asset_id,
@@ -149,17 +159,8 @@ def create_asset(
                 storage_provider,
                 storage_key,
                 meta_json,
+                content_hash_prefix,
             ),
-        )
-
-        row = conn.execute(
-            """
-            SELECT asset_id, kind, filename, content_hash, byte_size, mime_type,
-                   storage_provider, storage_key, meta_json, created_at, updated_at, deleted_at
-            FROM assets
-            WHERE asset_id = ?;
-            """.strip(),
-            (asset_id,),
         ).fetchone()
 
     if row is None:
@@ -168,52 +169,183 @@ def create_asset(
     return _asset_from_db_row(row)
 
 
-def update_asset_meta(db_path, *, asset_id: str, meta: Any) -> AssetRow | None:
-    meta_json = json.dumps(meta if meta is not None else {}, ensure_ascii=False)
+class NewAsset(NamedTuple):
+    """Insert parameters for create_assets_bulk (same fields as create_asset)."""
+
+    asset_id: str
+    kind: str
+    filename: str | None
+    content_hash: str
+    byte_size: int
+    mime_type: str | None
+    storage_provider: str
+    storage_key: str
+    meta: Any
+    content_hash_prefix: str | None = None
 
+
+def create_assets_bulk(db_path, *, items: Sequence[NewAsset]) -> list[bool]:
+    """Insert many assets in one transaction.
+
+    Returns one flag per item: False when the asset (same asset_id or content_hash)
+    already existed, including an earlier item of the same batch.
+    """
+
+    if not items:
+        return []
+
+    inserted: list[bool] = []
     with _connect(db_path) as conn:
-        cur = conn.execute(
-            """
-            UPDATE assets
-            SET meta_json = ?, updated_at = ?
-            WHERE asset_id = ? AND deleted_at IS NULL;
-            """.strip(),
-            (meta_json, _utc_now_sqlite_iso(), asset_id),
-        )
-        if cur.rowcount == 0:
-            return None
+        for item in items:
+            cur = conn.execute(
+                """
+                INSERT INTO assets (
+                    asset_id,
+                    kind,
+                    filename,
+                    content_hash,
+                    byte_size,
+                    mime_type,
+                    storage_provider,
+                    storage_key,
+                    meta_json,
+                    content_hash_prefix
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT DO NOTHING;
+                """.strip(),
+                (
+                    item.asset_id,
+                    item.kind,
+                    item.filename,
+                    item.content_hash,
+                    item.byte_size,
+                    item.mime_type,
+                    item.storage_provider,
+                    item.storage_key,
+                    dumps_json(item.meta if item.meta is not None else {}),
+                    item.content_hash_prefix,
+                ),
+            )
+            inserted.append(cur.rowcount == 1)
 
+    return inserted
+
+
+def update_asset_meta(db_path, *, asset_id: str, meta: Any) -> AssetRow | None:
+    meta_json = dumps_json(meta if meta is not None else {})
+
+    with _connect(db_path) as conn:
         row = conn.execute(
             """
-            SELECT asset_id, kind, filename, content_hash, byte_size, mime_type,
-                   storage_provider, storage_key, meta_json, created_at, updated_at, deleted_at
-            FROM assets
-            WHERE asset_id = ?;
+            UPDATE assets
+            SET meta_json = ?, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+            WHERE asset_id = ? AND deleted_at IS NULL
+            RETURNING asset_id, kind, filename, content_hash, byte_size, mime_type,
+                      storage_provider, storage_key, meta_json,
+                      created_at, updated_at, deleted_at;
             """.strip(),
-            (asset_id,),
+            (meta_json, asset_id),
         ).fetchone()
 
     return _asset_from_db_row(row) if row is not None else None
 
 
+# meta_json with one JSON entry (the parameter) appended to meta.metadata, computed by
+# SQLite's JSON1 functions. Normalizes like the Python decode would: a meta that is
+# not a JSON object becomes {}, a metadata value that is not an array becomes [].
+_APPEND_METADATA_SQL = """
+UPDATE assets
+SET meta_json = json_set(
+        CASE
+            WHEN NOT json_valid(meta_json) THEN '{}'
+            WHEN json_type(meta_json) = 'object' THEN meta_json
+            ELSE '{}'
+        END,
+        '$.metadata',
+        json_insert(
+            CASE
+                WHEN NOT json_valid(meta_json) THEN '[]'
+                WHEN json_type(meta_json, '$.metadata') = 'array'
+                    THEN json_extract(meta_json, '$.metadata')
+                ELSE '[]'
+            END,
+            '$[#]',
+            json(?)
+        )
+    ),
+    updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+WHERE asset_id = ? AND deleted_at IS NULL
+""".strip()
+
+
 def append_asset_metadata_entry(
     db_path, *, asset_id: str, entry: dict[str, Any]
 ) -> AssetRow | None:
-    current = get_asset(db_path, asset_id=asset_id, include_deleted=False)
-    if current is None:
-        return None
+    """Append `entry` to meta.metadata in one statement (no decode/encode of meta)."""
 
-    meta = current.meta
+    entry_json, standard = encode_json(entry)
+    with _connect(db_path) as conn:
+        if not standard:
+            if not _append_metadata_in_python(conn, asset_id=asset_id, entry=entry):
+                return None
+            row = conn.execute(_GET_ASSET_LIVE_SQL, (asset_id,)).fetchone()
+        else:
+            row = conn.execute(
+                f"""
+                {_APPEND_METADATA_SQL}
+                RETURNING asset_id, kind, filename, content_hash, byte_size, mime_type,
+                          storage_provider, storage_key, meta_json,
+                          created_at, updated_at, deleted_at;
+                """.strip(),
+                (entry_json, asset_id),
+            ).fetchone()
+
+    return _asset_from_db_row(row) if row is not None else None
+
+
+def _append_metadata_in_python(
+    conn: sqlite3.Connection, *, asset_id: str, entry: dict[str, Any]
+) -> bool:
+    # For entries holding NaN/Infinity, which JSON1's json() rejects as malformed.
+    # Normalizes meta the same way _APPEND_METADATA_SQL does.
+    row = conn.execute(
+        "SELECT meta_json FROM assets WHERE asset_id = ? AND deleted_at IS NULL;", (asset_id,)
+    ).fetchone()
+    if row is None:
+        return False
+    meta = _loads_json(row["meta_json"])
     if not isinstance(meta, dict):
         meta = {}
+    metadata = meta.get("metadata")
+    if not isinstance(metadata, list):
+        metadata = []
+    metadata.append(entry)
+    meta["metadata"] = metadata
+    conn.execute(
+        """
+        UPDATE assets
+        SET meta_json = ?, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+        WHERE asset_id = ?;
+        """.strip(),
+        (dumps_json(meta), asset_id),
+    )
+    return True
+
 
-    items = meta.get("metadata")
-    if not isinstance(items, list):
-        items = []
-    items.append(entry)
-    meta["metadata"] = items
+def entity_and_asset_exist(db_path, *, entity_id: str, asset_id: str) -> tuple[bool, bool]:
+    """(entity exists, asset exists), both live, in a single round-trip."""
 
-    return update_asset_meta(db_path, asset_id=asset_id, meta=meta)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT
+                EXISTS(SELECT 1 FROM entities WHERE entity_id = ? AND deleted_at IS NULL) AS e,
+                EXISTS(SELECT 1 FROM assets WHERE asset_id = ? AND deleted_at IS NULL) AS a;
+            """.strip(),
+            (entity_id, asset_id),
+        ).fetchone()
+    return bool(row["e"]), bool(row["a"])
 
 
 def link_asset_to_entity(
@@ -223,19 +355,17 @@ def link_asset_to_entity(
     asset_id: str,
     role: str | None = None,
 ) -> None:
-    now = _utc_now_sqlite_iso()
-
     with _connect(db_path) as conn:
         # Idempotent: if it already exists, update role and clear deleted_at.
         conn.execute(
             """
-            INSERT INTO entity_assets (entity_id, asset_id, role, created_at, deleted_at)
-            VALUES (?, ?, ?, ?, NULL)
+            INSERT INTO entity_assets (entity_id, asset_id, role, deleted_at)
+            VALUES (?, ?, ?, NULL)
             ON CONFLICT(entity_id, asset_id) DO UPDATE SET
                 role = excluded.role,
                 deleted_at = NULL;
             """.strip(),
-            (entity_id, asset_id, role, now),
+            (entity_id, asset_id, role),
         )
 
 
@@ -244,10 +374,10 @@ def unlink_asset_from_entity(db_path, *, entity_id: str, asset_id: str) -> bool:
         cur = conn.execute(
             """
             UPDATE entity_assets
-            SET deleted_at = ?
+            SET deleted_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
             WHERE entity_id = ? AND asset_id = ? AND deleted_at IS NULL;
             """.strip(),
-            (_utc_now_sqlite_iso(), entity_id, asset_id),
+            (entity_id, asset_id),
         )
         return cur.rowcount > 0
 
@@ -269,8 +399,10 @@ def list_assets_for_entity(
     if not include_deleted_assets:
         asset_where += " AND a.deleted_at IS NULL"
 
+    # Rows are converted while stepping the cursor, so a large link set is never held
+    # as sqlite3.Row objects and dataclasses at the same time.
     with _connect(db_path) as conn:
-        rows = conn.execute(
+        cur = conn.execute(
             f"""
             SELECT
                 ea.entity_id,
@@ -294,17 +426,39 @@ def list_assets_for_entity(
             ORDER BY ea.created_at DESC, a.asset_id ASC;
             """.strip(),
             params,
-        ).fetchall()
-
-    out: list[EntityAssetRow] = []
-    for r in rows:
-        asset = _asset_from_db_row(r)
-        out.append(
+        )
+        return [
             EntityAssetRow(
                 entity_id=r["entity_id"],
-                asset=asset,
+                asset=_asset_from_db_row(r),
                 role=r["role"],
                 linked_at=r["linked_at"],
             )
-        )
-    return out
+            for r in cur
+        ]
+
+
+def append_asset_metadata_entries(
+    db_path, *, entries: list[tuple[str, dict[str, Any]]]
+) -> list[str]:
+    """Append metadata entries for many assets in a single transaction.
+
+    Returns the asset IDs that were not found (or are deleted).
+    """
+
+    missing: list[str] = []
+    if not entries:
+        return missing
+
+    with _connect(db_path) as conn:
+        for asset_id, entry in entries:
+            entry_json, standard = encode_json(entry)
+            if not standard:
+                found = _append_metadata_in_python(conn, asset_id=asset_id, entry=entry)
+            else:
+                cur = conn.execute(f"{_APPEND_METADATA_SQL};", (entry_json, asset_id))
+                found = cur.rowcount > 0
+            if not found:
+                missing.append(asset_id)
+
+    return missing
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+# Applied once per connection; journal_mode=WAL is persistent and set by migrations.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -65536;",
+    "PRAGMA mmap_size = 268435456;",
+    # Sorter/GROUP BY temp b-trees (e.g. display_name sorts, relation-type dedupe).
+    "PRAGMA temp_store = MEMORY;",
+)
+
+# sqlite3 keys its per-connection statement cache on the SQL text; the helpers use
+# fixed literals (plus a few f-string variants), so a larger cache keeps them all hot.
+_CACHED_STATEMENTS = 512
+
+_local = threading.local()
+
+# Every cached connection, by path, so shutdown can also close the ones cached on
+# other threads (threadpool workers that served sync handlers). Closing bumps the
+# path's generation, which tells each thread its cached entry is stale.
+_registry_lock = threading.Lock()
+_registry: dict[str, set[sqlite3.Connection]] = {}
+_generations: dict[str, int] = {}
+
+
+def _open(db_path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so close_all_connections may close it from
+    # another thread; each connection is still used by the thread that opened it.
+    conn = sqlite3.connect(db_path, cached_statements=_CACHED_STATEMENTS, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def connect(db_path) -> sqlite3.Connection:
+    """Return this thread's cached connection to db_path, opening it on first use.
+
+    Connections are reused per (thread, path) so repeated helper calls skip the
+    connect + PRAGMA cost. Callers keep using `with connect(...) as conn:` for
+    commit/rollback; the connection itself is not closed on exit.
+    """
+
+    conns: dict[str, tuple[sqlite3.Connection, int]] | None = getattr(_local, "conns", None)
+    if conns is None:
+        conns = {}
+        _local.conns = conns
+
+    key = os.fspath(db_path)
+    cached = conns.get(key)
+    if cached is not None and cached[1] == _generations.get(key, 0):
+        return cached[0]
+
+    conn = _open(key)
+    with _registry_lock:
+        _registry.setdefault(key, set()).add(conn)
+        generation = _generations.get(key, 0)
+    conns[key] = (conn, generation)
+    return conn
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_thread_connections() -> None:
+    """Close every connection cached for the calling thread."""
+
+    conns: dict[str, tuple[sqlite3.Connection, int]] | None = getattr(_local, "conns", None)
+    if not conns:
+        return
+    with _registry_lock:
+        for key, (conn, _generation) in conns.items():
+            registered = _registry.get(key)
+            if registered is not None:
+                registered.discard(conn)
+    for conn, _generation in conns.values():
+        _close_quietly(conn)
+    conns.clear()
+
+
+def close_all_connections(db_path) -> None:
+    """Close the connections to db_path cached by every thread.
+
+    For shutdown, once nothing is using the database any more: closing the last
+    connection checkpoints the WAL and releases the file. A thread that connects
+    again afterwards gets a fresh connection.
+    """
+
+    key = os.fspath(db_path)
+    with _registry_lock:
+        _generations[key] = _generations.get(key, 0) + 1
+        conns = _registry.pop(key, set())
+    for conn in conns:
+        _close_quietly(conn)
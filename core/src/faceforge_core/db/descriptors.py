@@ -1,34 +1,27 @@
 from __future__ import annotations
 
-import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import Any
 
+from faceforge_core.db.connection import connect
 from faceforge_core.db.ids import new_descriptor_id
-
-
-def _utc_now_sqlite_iso() -> str:
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+from faceforge_core.db.json_columns import dumps_json, loads_json
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def _loads_json(raw: str) -> Any:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads_json(raw)
+    except ValueError:
         return None
 
 
 def _dumps_json(value: Any) -> str:
-    return json.dumps(value, ensure_ascii=False)
+    return dumps_json(value)
 
 
 @dataclass(frozen=True)
@@ -56,47 +49,39 @@ def _descriptor_from_db_row(row: sqlite3.Row) -> DescriptorRow:
     )
 
 
+_SELECT_DESCRIPTOR = """
+SELECT descriptor_id, entity_id, scope, field_key, value_json,
+       created_at, updated_at, deleted_at
+FROM descriptors
+""".strip()
+
+_DESCRIPTOR_ORDER = "ORDER BY scope ASC, field_key ASC, descriptor_id ASC"
+_LIST_DESCRIPTORS_SQL = f"{_SELECT_DESCRIPTOR} WHERE entity_id = ? {_DESCRIPTOR_ORDER};"
+_LIST_DESCRIPTORS_LIVE_SQL = (
+    f"{_SELECT_DESCRIPTOR} WHERE entity_id = ? AND deleted_at IS NULL {_DESCRIPTOR_ORDER};"
+)
+
+
 def list_descriptors_for_entity(
     db_path, *, entity_id: str, include_deleted: bool = False
 ) -> list[DescriptorRow]:
-    where = "WHERE entity_id = ?"
-    params: list[Any] = [entity_id]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
-
+    sql = _LIST_DESCRIPTORS_SQL if include_deleted else _LIST_DESCRIPTORS_LIVE_SQL
     with _connect(db_path) as conn:
-        rows = conn.execute(
-            f"""
-            SELECT descriptor_id, entity_id, scope, field_key, value_json,
-                   created_at, updated_at, deleted_at
-            FROM descriptors
-            {where}
-            ORDER BY scope ASC, field_key ASC, descriptor_id ASC;
-            """.strip(),
-            params,
-        ).fetchall()
+        cur = conn.execute(sql, (entity_id,))
+        # Built straight from the cursor; an entity can carry many descriptors.
+        return [_descriptor_from_db_row(r) for r in cur]
+
 
-    return [_descriptor_from_db_row(r) for r in rows]
+_GET_DESCRIPTOR_SQL = f"{_SELECT_DESCRIPTOR} WHERE descriptor_id = ?;"
+_GET_DESCRIPTOR_LIVE_SQL = f"{_SELECT_DESCRIPTOR} WHERE descriptor_id = ? AND deleted_at IS NULL;"
 
 
 def get_descriptor(
     db_path, *, descriptor_id: str, include_deleted: bool = False
 ) -> DescriptorRow | None:
-    where = "WHERE descriptor_id = ?"
-    params: list[Any] = [descriptor_id]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
-
+    sql = _GET_DESCRIPTOR_SQL if include_deleted else _GET_DESCRIPTOR_LIVE_SQL
     with _connect(db_path) as conn:
-        row = conn.execute(
-            f"""
-            SELECT descriptor_id, entity_id, scope, field_key, value_json,
-                   created_at, updated_at, deleted_at
-            FROM descriptors
-            {where};
-            """.strip(),
-            params,
-        ).fetchone()
+        row = conn.execute(sql, (descriptor_id,)).fetchone()
 
     return _descriptor_from_db_row(row) if row is not None else None
 
@@ -113,22 +98,14 @@ def create_descriptor(
     value_json = _dumps_json(value)
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO descriptors (descriptor_id, entity_id, scope, field_key, value_json)
-            VALUES (?, ?, ?, ?, ?);
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING descriptor_id, entity_id, scope, field_key, value_json,
+                      created_at, updated_at, deleted_at;
             """.strip(),
             (descriptor_id, entity_id, scope, field_key, value_json),
-        )
-
-        row = conn.execute(
-            """
-            SELECT descriptor_id, entity_id, scope, field_key, value_json,
-                   created_at, updated_at, deleted_at
-            FROM descriptors
-            WHERE descriptor_id = ?;
-            """.strip(),
-            (descriptor_id,),
         ).fetchone()
 
     if row is None:
@@ -141,39 +118,29 @@ def patch_descriptor_value(db_path, *, descriptor_id: str, value: Any) -> Descri
     value_json = _dumps_json(value)
 
     with _connect(db_path) as conn:
-        cur = conn.execute(
-            """
-            UPDATE descriptors
-            SET value_json = ?, updated_at = ?
-            WHERE descriptor_id = ? AND deleted_at IS NULL;
-            """.strip(),
-            (value_json, _utc_now_sqlite_iso(), descriptor_id),
-        )
-        if cur.rowcount == 0:
-            return None
-
         row = conn.execute(
             """
-            SELECT descriptor_id, entity_id, scope, field_key, value_json,
-                   created_at, updated_at, deleted_at
-            FROM descriptors
-            WHERE descriptor_id = ? AND deleted_at IS NULL;
+            UPDATE descriptors
+            SET value_json = ?, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+            WHERE descriptor_id = ? AND deleted_at IS NULL
+            RETURNING descriptor_id, entity_id, scope, field_key, value_json,
+                      created_at, updated_at, deleted_at;
             """.strip(),
-            (descriptor_id,),
+            (value_json, descriptor_id),
         ).fetchone()
 
     return _descriptor_from_db_row(row) if row is not None else None
 
 
 def soft_delete_descriptor(db_path, *, descriptor_id: str) -> bool:
-    now = _utc_now_sqlite_iso()
     with _connect(db_path) as conn:
         cur = conn.execute(
             """
             UPDATE descriptors
-            SET deleted_at = ?, updated_at = ?
+            SET deleted_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+                updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
             WHERE descriptor_id = ? AND deleted_at IS NULL;
             """.strip(),
-            (now, now, descriptor_id),
+            (descriptor_id,),
         )
         return cur.rowcount > 0
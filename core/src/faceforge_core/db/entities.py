@@ -1,22 +1,17 @@
 from __future__ import annotations
 
-import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from typing import Any
+from typing import Any, NamedTuple
 
+from faceforge_core.db.connection import connect
 from faceforge_core.db.ids import new_entity_id
+from faceforge_core.db.json_columns import dumps_json, loads_json
 
 
-def _utc_now_sqlite_iso() -> str:
-    # Match the DB default format closely: YYYY-MM-DDTHH:MM:SS.sssZ
-    # SQLite stores TEXT; we standardize to milliseconds.
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
-
-
-@dataclass(frozen=True)
-class EntityRow:
+# A NamedTuple: list pages build up to 200 of these, and tuple construction is
+# much cheaper than a frozen dataclass __init__.
+class EntityRow(NamedTuple):
     entity_id: str
     display_name: str
     aliases: list[str]
@@ -29,8 +24,8 @@ class EntityRow:
 
 def _loads_list(raw: str) -> list[str]:
     try:
-        v = json.loads(raw)
-    except json.JSONDecodeError:
+        v = loads_json(raw)
+    except ValueError:
         return []
     if isinstance(v, list) and all(isinstance(x, str) for x in v):
         return v
@@ -39,8 +34,8 @@ def _loads_list(raw: str) -> list[str]:
 
 def _loads_dict(raw: str) -> dict[str, Any]:
     try:
-        v = json.loads(raw)
-    except json.JSONDecodeError:
+        v = loads_json(raw)
+    except ValueError:
         return {}
     if isinstance(v, dict):
         return v
@@ -61,10 +56,7 @@ def _entity_from_db_row(row: sqlite3.Row) -> EntityRow:
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def create_entity(
@@ -76,27 +68,19 @@ def create_entity(
     fields: dict[str, Any] | None = None,
 ) -> EntityRow:
     entity_id = new_entity_id()
-    aliases_json = json.dumps(aliases or [], ensure_ascii=False)
-    tags_json = json.dumps(tags or [], ensure_ascii=False)
-    fields_json = json.dumps(fields or {}, ensure_ascii=False)
+    aliases_json = dumps_json(aliases or [])
+    tags_json = dumps_json(tags or [])
+    fields_json = dumps_json(fields or {})
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO entities (entity_id, display_name, aliases_json, tags_json, fields_json)
-            VALUES (?, ?, ?, ?, ?);
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING entity_id, display_name, aliases_json, tags_json, fields_json,
+                      created_at, updated_at, deleted_at;
             """.strip(),
             (entity_id, display_name, aliases_json, tags_json, fields_json),
-        )
-
-        row = conn.execute(
-            """
-            SELECT entity_id, display_name, aliases_json, tags_json, fields_json,
-                   created_at, updated_at, deleted_at
-            FROM entities
-            WHERE entity_id = ?;
-            """.strip(),
-            (entity_id,),
         ).fetchone()
 
     if row is None:
@@ -105,22 +89,20 @@ def create_entity(
     return _entity_from_db_row(row)
 
 
-def get_entity(db_path, *, entity_id: str, include_deleted: bool = False) -> EntityRow | None:
-    where = "WHERE entity_id = ?"
-    params: list[Any] = [entity_id]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
+_SELECT_ENTITY = """
+SELECT entity_id, display_name, aliases_json, tags_json, fields_json,
+       created_at, updated_at, deleted_at
+FROM entities
+""".strip()
+
+_GET_ENTITY_SQL = f"{_SELECT_ENTITY} WHERE entity_id = ?;"
+_GET_ENTITY_LIVE_SQL = f"{_SELECT_ENTITY} WHERE entity_id = ? AND deleted_at IS NULL;"
 
+
+def get_entity(db_path, *, entity_id: str, include_deleted: bool = False) -> EntityRow | None:
+    sql = _GET_ENTITY_SQL if include_deleted else _GET_ENTITY_LIVE_SQL
     with _connect(db_path) as conn:
-        row = conn.execute(
-            f"""
-            SELECT entity_id, display_name, aliases_json, tags_json, fields_json,
-                   created_at, updated_at, deleted_at
-            FROM entities
-            {where};
-            """.strip(),
-            params,
-        ).fetchone()
+        row = conn.execute(sql, (entity_id,)).fetchone()
 
     if row is None:
         return None
@@ -130,7 +112,30 @@ def get_entity(db_path, *, entity_id: str, include_deleted: bool = False) -> Ent
 @dataclass(frozen=True)
 class EntityListResult:
     items: list[EntityRow]
-    total: int
+    # None when the page was fetched by keyset (after=...), which skips the COUNT.
+    total: int | None
+    has_more: bool = False
+
+
+def existing_entity_ids(db_path, *, entity_ids: list[str]) -> set[str]:
+    """Return the subset of entity_ids that exist and are not soft-deleted (one query)."""
+
+    if not entity_ids:
+        return set()
+    placeholders = ", ".join("?" for _ in entity_ids)
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            f"SELECT entity_id FROM entities "
+            f"WHERE entity_id IN ({placeholders}) AND deleted_at IS NULL;",
+            entity_ids,
+        ).fetchall()
+    return {r["entity_id"] for r in rows}
+
+
+def _uses_trigram_index(pattern: str) -> bool:
+    # FTS5's trigram tokenizer only narrows a LIKE that has 3+ consecutive literal
+    # characters; anything shorter would scan the whole index.
+    return any(len(run) >= 3 for run in pattern.replace("_", "%").split("%"))
 
 
 def _build_list_filters(
@@ -138,24 +143,34 @@ def _build_list_filters(
     q: str | None,
     tag: str | None,
 ) -> tuple[str, list[Any]]:
-    clauses: list[str] = ["deleted_at IS NULL"]
+    # Unary + keeps the planner off idx_entities_deleted_at: nearly every row is live,
+    # so it is a poor driver next to the sort index or the tag/search IN lists below.
+    clauses: list[str] = ["+deleted_at IS NULL"]
     params: list[Any] = []
 
+    # The tag filter goes first: it is an indexed lookup that narrows the rows the
+    # four-column substring match below has to scan.
+    if tag is not None and tag.strip():
+        # entity_tags mirrors tags_json (lowercased) via triggers; matching is
+        # case-insensitive, as the earlier LIKE over the JSON was.
+        clauses.append("entity_id IN (SELECT entity_id FROM entity_tags WHERE tag_lc = lower(?))")
+        params.append(tag.strip())
+
     if q is not None and q.strip():
         # Minimal search primitive (intentionally not fancy): substring match.
         like = f"%{q.strip()}%"
+        if _uses_trigram_index(like):
+            # Candidate rows from the trigram index (entities_search, migration 0009);
+            # the LIKE below still decides, so results are exactly the substring matches.
+            clauses.append(
+                "entity_id IN (SELECT entity_id FROM entities_search WHERE search_text LIKE ?)"
+            )
+            params.append(like)
         clauses.append(
             "(display_name LIKE ? OR aliases_json LIKE ? OR tags_json LIKE ? OR fields_json LIKE ?)"
         )
         params.extend([like, like, like, like])
 
-    if tag is not None and tag.strip():
-        # tags are stored as a JSON array of strings.
-        # Minimal filter: string contains \"<tag>\".
-        needle = f'%"{tag.strip()}"%'
-        clauses.append("tags_json LIKE ?")
-        params.append(needle)
-
     where_sql = "WHERE " + " AND ".join(clauses)
     return where_sql, params
 
@@ -169,7 +184,16 @@ def list_entities(
     sort_order: str,
     q: str | None = None,
     tag: str | None = None,
+    after: tuple[str, str] | None = None,
+    with_total: bool = True,
 ) -> EntityListResult:
+    """List live entities, by offset or (when `after` is given) by keyset.
+
+    `after` is the (sort value, entity_id) of the last row of the previous page; the
+    next page is then an index seek instead of scan-and-skip, and no COUNT is run.
+    Offset listings skip the COUNT too unless `with_total` is set.
+    """
+
     allowed_sort_by = {
         "created_at": "created_at",
         "updated_at": "updated_at",
@@ -182,12 +206,21 @@ def list_entities(
 
     where_sql, params = _build_list_filters(q=q, tag=tag)
 
+    total: int | None = None
+    if after is not None:
+        # Rows sort by (sort_col order_sql, entity_id ASC); resume strictly after `after`.
+        op = "<" if order_sql == "DESC" else ">"
+        where_sql += f" AND ({sort_col} {op} ? OR ({sort_col} = ? AND entity_id > ?))"
+        params = [*params, after[0], after[0], after[1]]
+        offset = 0
+
     with _connect(db_path) as conn:
-        total_row = conn.execute(
-            f"SELECT COUNT(1) AS n FROM entities {where_sql};",
-            params,
-        ).fetchone()
-        total = int(total_row["n"]) if total_row is not None else 0
+        if with_total and after is None:
+            total_row = conn.execute(
+                f"SELECT COUNT(1) AS n FROM entities {where_sql};",
+                params,
+            ).fetchone()
+            total = int(total_row["n"]) if total_row is not None else 0
 
         rows = conn.execute(
             f"""
@@ -198,11 +231,11 @@ def list_entities(
             ORDER BY {sort_col} {order_sql}, entity_id ASC
             LIMIT ? OFFSET ?;
             """.strip(),
-            [*params, limit, offset],
+            [*params, limit + 1, offset],
         ).fetchall()
 
-    items = [_entity_from_db_row(r) for r in rows]
-    return EntityListResult(items=items, total=total)
+    items = [_entity_from_db_row(r) for r in rows[:limit]]
+    return EntityListResult(items=items, total=total, has_more=len(rows) > limit)
 
 
 def patch_entity(
@@ -214,11 +247,6 @@ def patch_entity(
     tags: list[str] | None = None,
     fields: dict[str, Any] | None = None,
 ) -> EntityRow | None:
-    # Read current to support partial updates without clobbering.
-    current = get_entity(db_path, entity_id=entity_id, include_deleted=False)
-    if current is None:
-        return None
-
     updates: list[str] = []
     params: list[Any] = []
 
@@ -228,41 +256,33 @@ def patch_entity(
 
     if aliases is not None:
         updates.append("aliases_json = ?")
-        params.append(json.dumps(aliases, ensure_ascii=False))
+        params.append(dumps_json(aliases))
 
     if tags is not None:
         updates.append("tags_json = ?")
-        params.append(json.dumps(tags, ensure_ascii=False))
+        params.append(dumps_json(tags))
 
     if fields is not None:
         updates.append("fields_json = ?")
-        params.append(json.dumps(fields, ensure_ascii=False))
+        params.append(dumps_json(fields))
 
+    # Only the given columns are SET, so partial updates never clobber the rest.
     if not updates:
-        return current
+        return get_entity(db_path, entity_id=entity_id, include_deleted=False)
 
-    updates.append("updated_at = ?")
-    params.append(_utc_now_sqlite_iso())
+    updates.append("updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')")
     params.append(entity_id)
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             f"""
             UPDATE entities
             SET {", ".join(updates)}
-            WHERE entity_id = ? AND deleted_at IS NULL;
+            WHERE entity_id = ? AND deleted_at IS NULL
+            RETURNING entity_id, display_name, aliases_json, tags_json, fields_json,
+                      created_at, updated_at, deleted_at;
             """.strip(),
             params,
-        )
-
-        row = conn.execute(
-            """
-            SELECT entity_id, display_name, aliases_json, tags_json, fields_json,
-                   created_at, updated_at, deleted_at
-            FROM entities
-            WHERE entity_id = ? AND deleted_at IS NULL;
-            """.strip(),
-            (entity_id,),
         ).fetchone()
 
     if row is None:
@@ -271,14 +291,14 @@ def patch_entity(
 
 
 def soft_delete_entity(db_path, *, entity_id: str) -> bool:
-    now = _utc_now_sqlite_iso()
     with _connect(db_path) as conn:
         cur = conn.execute(
             """
             UPDATE entities
-            SET deleted_at = ?, updated_at = ?
+            SET deleted_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+                updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
             WHERE entity_id = ? AND deleted_at IS NULL;
             """.strip(),
-            (now, now, entity_id),
+            (entity_id,),
         )
     return cur.rowcount > 0
@@ -1,34 +1,27 @@
 from __future__ import annotations
 
-import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import Any
 
+from faceforge_core.db.connection import connect
 from faceforge_core.db.ids import new_field_def_id
-
-
-def _utc_now_sqlite_iso() -> str:
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+from faceforge_core.db.json_columns import dumps_json, loads_json
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def _loads_json(raw: str) -> Any:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads_json(raw)
+    except ValueError:
         return {}
 
 
 def _dumps_json(value: Any) -> str:
-    return json.dumps(value if value is not None else {}, ensure_ascii=False)
+    return dumps_json(value if value is not None else {})
 
 
 @dataclass(frozen=True)
@@ -74,12 +67,14 @@ def create_field_def(
     options_json = _dumps_json(options)
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO field_definitions (
                 field_def_id, scope, field_key, field_type, required, options_json, regex
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?);
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING field_def_id, scope, field_key, field_type, required, options_json, regex,
+                      created_at, updated_at, deleted_at;
             """.strip(),
             (
                 field_def_id,
@@ -90,16 +85,6 @@ def create_field_def(
                 options_json,
                 regex,
             ),
-        )
-
-        row = conn.execute(
-            """
-            SELECT field_def_id, scope, field_key, field_type, required, options_json, regex,
-                   created_at, updated_at, deleted_at
-            FROM field_definitions
-            WHERE field_def_id = ?;
-            """.strip(),
-            (field_def_id,),
         ).fetchone()
 
     if row is None:
@@ -108,46 +93,38 @@ def create_field_def(
     return _field_def_from_db_row(row)
 
 
+_SELECT_FIELD_DEF = """
+SELECT field_def_id, scope, field_key, field_type, required, options_json, regex,
+       created_at, updated_at, deleted_at
+FROM field_definitions
+""".strip()
+
+_GET_FIELD_DEF_SQL = f"{_SELECT_FIELD_DEF} WHERE field_def_id = ?;"
+_GET_FIELD_DEF_LIVE_SQL = f"{_SELECT_FIELD_DEF} WHERE field_def_id = ? AND deleted_at IS NULL;"
+
+
 def get_field_def(
     db_path, *, field_def_id: str, include_deleted: bool = False
 ) -> FieldDefRow | None:
-    where = "WHERE field_def_id = ?"
-    params: list[Any] = [field_def_id]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
-
+    sql = _GET_FIELD_DEF_SQL if include_deleted else _GET_FIELD_DEF_LIVE_SQL
     with _connect(db_path) as conn:
-        row = conn.execute(
-            f"""
-            SELECT field_def_id, scope, field_key, field_type, required, options_json, regex,
-                   created_at, updated_at, deleted_at
-            FROM field_definitions
-            {where};
-            """.strip(),
-            params,
-        ).fetchone()
+        row = conn.execute(sql, (field_def_id,)).fetchone()
 
     return _field_def_from_db_row(row) if row is not None else None
 
 
+_GET_FIELD_DEF_BY_KEY_SQL = f"{_SELECT_FIELD_DEF} WHERE scope = ? AND field_key = ?;"
+_GET_FIELD_DEF_BY_KEY_LIVE_SQL = (
+    f"{_SELECT_FIELD_DEF} WHERE scope = ? AND field_key = ? AND deleted_at IS NULL;"
+)
+
+
 def get_field_def_by_key(
     db_path, *, scope: str, field_key: str, include_deleted: bool = False
 ) -> FieldDefRow | None:
-    where = "WHERE scope = ? AND field_key = ?"
-    params: list[Any] = [scope, field_key]
-    if not include_deleted:
-        where += " AND deleted_at IS NULL"
-
+    sql = _GET_FIELD_DEF_BY_KEY_SQL if include_deleted else _GET_FIELD_DEF_BY_KEY_LIVE_SQL
     with _connect(db_path) as conn:
-        row = conn.execute(
-            f"""
-            SELECT field_def_id, scope, field_key, field_type, required, options_json, regex,
-                   created_at, updated_at, deleted_at
-            FROM field_definitions
-            {where};
-            """.strip(),
-            params,
-        ).fetchone()
+        row = conn.execute(sql, (scope, field_key)).fetchone()
 
     return _field_def_from_db_row(row) if row is not None else None
 
@@ -173,7 +150,7 @@ def list_field_defs(
         where_sql = "WHERE " + " AND ".join(clauses)
 
     with _connect(db_path) as conn:
-        rows = conn.execute(
+        cur = conn.execute(
             f"""
             SELECT field_def_id, scope, field_key, field_type, required, options_json, regex,
                    created_at, updated_at, deleted_at
@@ -182,9 +159,8 @@ def list_field_defs(
             ORDER BY scope ASC, field_key ASC, field_def_id ASC;
             """.strip(),
             params,
-        ).fetchall()
-
-    return [_field_def_from_db_row(r) for r in rows]
+        )
+        return [_field_def_from_db_row(r) for r in cur]
 
 
 def patch_field_def(
@@ -198,10 +174,6 @@ def patch_field_def(
     options: Any | None = None,
     regex: str | None = None,
 ) -> FieldDefRow | None:
-    current = get_field_def(db_path, field_def_id=field_def_id, include_deleted=False)
-    if current is None:
-        return None
-
     updates: list[str] = []
     params: list[Any] = []
 
@@ -230,44 +202,35 @@ def patch_field_def(
         params.append(regex)
 
     if not updates:
-        return current
+        return get_field_def(db_path, field_def_id=field_def_id, include_deleted=False)
 
-    updates.append("updated_at = ?")
-    params.append(_utc_now_sqlite_iso())
+    updates.append("updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')")
     params.append(field_def_id)
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             f"""
             UPDATE field_definitions
             SET {", ".join(updates)}
-            WHERE field_def_id = ? AND deleted_at IS NULL;
+            WHERE field_def_id = ? AND deleted_at IS NULL
+            RETURNING field_def_id, scope, field_key, field_type, required, options_json, regex,
+                      created_at, updated_at, deleted_at;
             """.strip(),
             params,
-        )
-
-        row = conn.execute(
-            """
-            SELECT field_def_id, scope, field_key, field_type, required, options_json, regex,
-                   created_at, updated_at, deleted_at
-            FROM field_definitions
-            WHERE field_def_id = ? AND deleted_at IS NULL;
-            """.strip(),
-            (field_def_id,),
         ).fetchone()
 
     return _field_def_from_db_row(row) if row is not None else None
 
 
 def soft_delete_field_def(db_path, *, field_def_id: str) -> bool:
-    now = _utc_now_sqlite_iso()
     with _connect(db_path) as conn:
         cur = conn.execute(
             """
             UPDATE field_definitions
-            SET deleted_at = ?, updated_at = ?
+            SET deleted_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+                updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
             WHERE field_def_id = ? AND deleted_at IS NULL;
             """.strip(),
-            (now, now, field_def_id),
+            (field_def_id,),
         )
         return cur.rowcount > 0
@@ -1,15 +1,37 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import uuid
 from pathlib import Path
 from typing import BinaryIO
 
+import xxhash
+
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def sha256_backend() -> str:
+    """Describe the SHA-256 implementation hashlib is using (for startup logs).
+
+    OpenSSL-backed hashlib picks SHA-NI / AVX2 code paths at runtime, so the
+    OpenSSL version is what determines hashing throughput; "builtin" means CPython's
+    portable fallback.
+    """
+
+    if getattr(hashlib.sha256, "__name__", "") == "openssl_sha256":
+        import ssl
+
+        return ssl.OPENSSL_VERSION
+    return "builtin"
+
+
+# Bytes covered by an asset's content_hash_prefix.
+CONTENT_HASH_PREFIX_BYTES = 1024 * 1024
+
+
 def sha256_hex_stream(stream: BinaryIO, *, chunk_size: int = 1024 * 1024) -> str:
     """Compute a SHA-256 hex digest from a binary stream."""
 
@@ -22,9 +44,37 @@ def sha256_hex_stream(stream: BinaryIO, *, chunk_size: int = 1024 * 1024) -> str
     return h.hexdigest()
 
 
-def sha256_hex_file(path: Path, *, chunk_size: int = 1024 * 1024) -> str:
+def sha256_hex_file(path: Path) -> str:
+    """Compute a SHA-256 hex digest of a file on disk.
+
+    Uses hashlib.file_digest, which reads into a reusable buffer and hashes in C
+    without a Python-level chunk loop.
+    """
+
+    with path.open("rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def content_prefix_key(prefix: bytes) -> str:
+    """Dedupe pre-filter key for the first CONTENT_HASH_PREFIX_BYTES of some content.
+
+    Non-cryptographic (xxh3-128): it only narrows candidates, and every hit is
+    confirmed against the SHA-256 content_hash before it is trusted.
+    """
+
+    return xxhash.xxh3_128_hexdigest(prefix)
+
+
+def content_prefix_key_file(path: Path) -> str:
+    """content_prefix_key() of a file on disk."""
+
     with path.open("rb") as f:
-        return sha256_hex_stream(f, chunk_size=chunk_size)
+        return content_prefix_key(f.read(CONTENT_HASH_PREFIX_BYTES))
 
 
 def new_entity_id() -> str:
@@ -1,34 +1,28 @@
 from __future__ import annotations
 
-import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from typing import Any
+from typing import Any, NamedTuple
 
-
-def _utc_now_sqlite_iso() -> str:
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+from faceforge_core.db.connection import connect
+from faceforge_core.db.json_columns import dumps_json, loads_json
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def _loads_json(raw: str | None) -> Any:
     if raw is None:
         return None
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads_json(raw)
+    except ValueError:
         return None
 
 
-@dataclass(frozen=True)
-class JobRow:
+# NamedTuple rather than a frozen dataclass for cheap per-row construction.
+class JobRow(NamedTuple):
     job_id: str
     job_type: str
     status: str
@@ -46,16 +40,16 @@ class JobRow:
 
 
 def _job_from_db_row(row: sqlite3.Row) -> JobRow:
-    keys = set(row.keys())
+    # Every job SELECT lists the full column set.
     return JobRow(
         job_id=row["job_id"],
         job_type=row["job_type"],
         status=row["status"],
         progress_percent=row["progress_percent"],
         progress_step=row["progress_step"],
-        input=_loads_json(row["input_json"]) if "input_json" in keys else None,
-        result=_loads_json(row["result_json"]) if "result_json" in keys else None,
-        cancel_requested_at=row["cancel_requested_at"] if "cancel_requested_at" in keys else None,
+        input=_loads_json(row["input_json"]),
+        result=_loads_json(row["result_json"]),
+        cancel_requested_at=row["cancel_requested_at"],
         created_at=row["created_at"],
         started_at=row["started_at"],
         finished_at=row["finished_at"],
@@ -65,29 +59,38 @@ def _job_from_db_row(row: sqlite3.Row) -> JobRow:
     )
 
 
-def create_job(db_path, *, job_id: str, job_type: str, status: str, input: Any) -> JobRow:
-    input_json = json.dumps(input if input is not None else {}, ensure_ascii=False)
+def create_job(
+    db_path,
+    *,
+    job_id: str,
+    job_type: str,
+    status: str,
+    input: Any,
+    log_message: str | None = None,
+) -> JobRow:
+    """Insert a job; with `log_message`, its first (info) log line is written in the
+    same transaction."""
+
+    input_json = dumps_json(input if input is not None else {})
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO jobs (job_id, job_type, status, input_json)
-            VALUES (?, ?, ?, ?);
+            VALUES (?, ?, ?, ?)
+            RETURNING job_id, job_type, status, progress_percent, progress_step,
+                      input_json, result_json, cancel_requested_at,
+                      created_at, started_at, finished_at, canceled_at, error_json, deleted_at;
             """.strip(),
             (job_id, job_type, status, input_json),
-        )
-
-        row = conn.execute(
-            """
-            SELECT job_id, job_type, status, progress_percent, progress_step,
-                   input_json, result_json, cancel_requested_at,
-                   created_at, started_at, finished_at, canceled_at, error_json, deleted_at
-            FROM jobs
-            WHERE job_id = ?;
-            """.strip(),
-            (job_id,),
         ).fetchone()
 
+        if log_message is not None:
+            conn.execute(
+                "INSERT INTO job_logs (job_id, level, message) VALUES (?, 'info', ?);",
+                (job_id, log_message),
+            )
+
     if row is None:
         raise RuntimeError("Failed to read job after insert")
 
@@ -118,7 +121,9 @@ def get_job(db_path, *, job_id: str, include_deleted: bool = False) -> JobRow |
 @dataclass(frozen=True)
 class JobListResult:
     items: list[JobRow]
-    total: int
+    # None when the page was fetched by keyset (after=...), which skips the COUNT.
+    total: int | None
+    has_more: bool = False
 
 
 def list_jobs(
@@ -128,7 +133,15 @@ def list_jobs(
     offset: int,
     status: str | None = None,
     job_type: str | None = None,
+    after: tuple[str, str] | None = None,
+    with_total: bool = True,
 ) -> JobListResult:
+    """List live jobs newest first, by offset or (when `after` is given) by keyset.
+
+    `after` is the (created_at, job_id) of the last row of the previous page. The
+    COUNT behind `total` only runs for offset listings with `with_total`.
+    """
+
     clauses: list[str] = ["deleted_at IS NULL"]
     params: list[Any] = []
 
@@ -140,14 +153,21 @@ def list_jobs(
         clauses.append("job_type = ?")
         params.append(job_type.strip())
 
+    total: int | None = None
+    if after is not None:
+        clauses.append("(created_at < ? OR (created_at = ? AND job_id > ?))")
+        params.extend([after[0], after[0], after[1]])
+        offset = 0
+
     where_sql = "WHERE " + " AND ".join(clauses)
 
     with _connect(db_path) as conn:
-        total_row = conn.execute(
-            f"SELECT COUNT(1) AS n FROM jobs {where_sql};",
-            params,
-        ).fetchone()
-        total = int(total_row["n"]) if total_row is not None else 0
+        if with_total and after is None:
+            total_row = conn.execute(
+                f"SELECT COUNT(1) AS n FROM jobs {where_sql};",
+                params,
+            ).fetchone()
+            total = int(total_row["n"]) if total_row is not None else 0
 
         rows = conn.execute(
             f"""
@@ -159,10 +179,14 @@ def list_jobs(
             ORDER BY created_at DESC, job_id ASC
             LIMIT ? OFFSET ?;
             """.strip(),
-            [*params, limit, offset],
+            [*params, limit + 1, offset],
         ).fetchall()
 
-    return JobListResult(items=[_job_from_db_row(r) for r in rows], total=total)
+    return JobListResult(
+        items=[_job_from_db_row(r) for r in rows[:limit]],
+        total=total,
+        has_more=len(rows) > limit,
+    )
 
 
 def mark_job_running(db_path, *, job_id: str) -> None:
@@ -170,10 +194,11 @@ def mark_job_running(db_path, *, job_id: str) -> None:
         conn.execute(
             """
             UPDATE jobs
-            SET status = 'running', started_at = COALESCE(started_at, ?)
+            SET status = 'running',
+                started_at = COALESCE(started_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
             WHERE job_id = ? AND deleted_at IS NULL AND status IN ('queued');
             """.strip(),
-            (_utc_now_sqlite_iso(), job_id),
+            (job_id,),
         )
 
 
@@ -212,7 +237,7 @@ def update_job_progress(
 
 
 def mark_job_succeeded(db_path, *, job_id: str, result: Any | None = None) -> None:
-    result_json = json.dumps(result, ensure_ascii=False) if result is not None else None
+    result_json = dumps_json(result) if result is not None else None
 
     with _connect(db_path) as conn:
         conn.execute(
@@ -220,73 +245,113 @@ def mark_job_succeeded(db_path, *, job_id: str, result: Any | None = None) -> No
             UPDATE jobs
             SET status = 'succeeded',
                 progress_percent = COALESCE(progress_percent, 100.0),
-                finished_at = COALESCE(finished_at, ?),
+                finished_at = COALESCE(finished_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
                 result_json = COALESCE(result_json, ?)
                         WHERE job_id = ?
                             AND deleted_at IS NULL
                             AND status NOT IN ('succeeded', 'failed', 'canceled');
             """.strip(),
-            (_utc_now_sqlite_iso(), result_json, job_id),
+            (result_json, job_id),
         )
 
 
 def mark_job_failed(db_path, *, job_id: str, error: Any) -> None:
-    error_json = json.dumps(error, ensure_ascii=False)
+    error_json = dumps_json(error)
 
     with _connect(db_path) as conn:
         conn.execute(
             """
             UPDATE jobs
             SET status = 'failed',
-                finished_at = COALESCE(finished_at, ?),
+                finished_at = COALESCE(finished_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
                 error_json = ?
                         WHERE job_id = ?
                             AND deleted_at IS NULL
                             AND status NOT IN ('succeeded', 'failed', 'canceled');
             """.strip(),
-            (_utc_now_sqlite_iso(), error_json, job_id),
+            (error_json, job_id),
         )
 
 
 def request_job_cancel(db_path, *, job_id: str) -> bool:
-    now = _utc_now_sqlite_iso()
-
     with _connect(db_path) as conn:
         cur = conn.execute(
             """
             UPDATE jobs
-            SET cancel_requested_at = COALESCE(cancel_requested_at, ?)
+            SET cancel_requested_at = COALESCE(
+                cancel_requested_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+            )
             WHERE job_id = ?
               AND deleted_at IS NULL
               AND status IN ('queued', 'running');
             """.strip(),
-            (now, job_id),
+            (job_id,),
         )
         return cur.rowcount > 0
 
 
+def cancel_job(db_path, *, job_id: str) -> tuple[bool, JobRow | None]:
+    """Request cooperative cancellation and return (requested, current job row).
+
+    The cancel flag, its "Cancel requested" log line and the re-read happen in one
+    transaction. `requested` is False when the job is already finished; the row is
+    None when the job does not exist.
+    """
+
+    with _connect(db_path) as conn:
+        cur = conn.execute(
+            """
+            UPDATE jobs
+            SET cancel_requested_at = COALESCE(
+                cancel_requested_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+            )
+            WHERE job_id = ?
+              AND deleted_at IS NULL
+              AND status IN ('queued', 'running');
+            """.strip(),
+            (job_id,),
+        )
+        requested = cur.rowcount > 0
+        if requested:
+            conn.execute(
+                "INSERT INTO job_logs (job_id, level, message) VALUES (?, 'info', ?);",
+                (job_id, "Cancel requested"),
+            )
+
+        row = conn.execute(
+            """
+            SELECT job_id, job_type, status, progress_percent, progress_step,
+                   input_json, result_json, cancel_requested_at,
+                   created_at, started_at, finished_at, canceled_at, error_json, deleted_at
+            FROM jobs
+            WHERE job_id = ? AND deleted_at IS NULL;
+            """.strip(),
+            (job_id,),
+        ).fetchone()
+
+    return requested, (_job_from_db_row(row) if row is not None else None)
+
+
 def mark_job_canceled(db_path, *, job_id: str, result: Any | None = None) -> None:
-    result_json = json.dumps(result, ensure_ascii=False) if result is not None else None
-    now = _utc_now_sqlite_iso()
+    result_json = dumps_json(result) if result is not None else None
 
     with _connect(db_path) as conn:
         conn.execute(
             """
             UPDATE jobs
             SET status = 'canceled',
-                canceled_at = COALESCE(canceled_at, ?),
-                finished_at = COALESCE(finished_at, ?),
+                canceled_at = COALESCE(canceled_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+                finished_at = COALESCE(finished_at, strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
                 result_json = COALESCE(result_json, ?)
                         WHERE job_id = ?
                             AND deleted_at IS NULL
                             AND status NOT IN ('succeeded', 'failed', 'canceled');
             """.strip(),
-            (now, now, result_json, job_id),
+            (result_json, job_id),
         )
 
 
-@dataclass(frozen=True)
-class JobLogRow:
+class JobLogRow(NamedTuple):
     job_log_id: int
     job_id: str
     ts: str
@@ -314,27 +379,16 @@ def append_job_log(
     message: str,
     data: Any | None = None,
 ) -> JobLogRow:
-    data_json = json.dumps(data, ensure_ascii=False) if data is not None else None
+    data_json = dumps_json(data) if data is not None else None
 
     with _connect(db_path) as conn:
-        cur = conn.execute(
+        row = conn.execute(
             """
             INSERT INTO job_logs (job_id, level, message, data_json)
-            VALUES (?, ?, ?, ?);
+            VALUES (?, ?, ?, ?)
+            RETURNING job_log_id, job_id, ts, level, message, data_json;
             """.strip(),
             (job_id, level, message, data_json),
-        )
-        if cur.lastrowid is None:
-            raise RuntimeError("Failed to insert job log")
-        job_log_id = int(cur.lastrowid)
-
-        row = conn.execute(
-            """
-            SELECT job_log_id, job_id, ts, level, message, data_json
-            FROM job_logs
-            WHERE job_log_id = ?;
-            """.strip(),
-            (job_log_id,),
         ).fetchone()
 
     if row is None:
@@ -363,3 +417,35 @@ def list_job_logs(
         ).fetchall()
 
     return [_job_log_from_db_row(r) for r in rows]
+
+
+def tail_job_logs(
+    db_path,
+    *,
+    job_id: str,
+    after_id: int = 0,
+    limit: int = 500,
+) -> list[JobLogRow] | None:
+    """Log rows after `after_id` for a live job, or None when the job does not exist.
+
+    One statement serves the existence check and the page: the job row is LEFT
+    JOINed to its logs (a seek on idx_job_logs_job_id, whose implicit rowid suffix
+    covers job_log_id), so an idle poll still costs a single query.
+    """
+
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT l.job_log_id, j.job_id, l.ts, l.level, l.message, l.data_json
+            FROM jobs AS j
+            LEFT JOIN job_logs AS l ON l.job_id = j.job_id AND l.job_log_id > ?
+            WHERE j.job_id = ? AND j.deleted_at IS NULL
+            ORDER BY l.job_log_id ASC
+            LIMIT ?;
+            """.strip(),
+            (after_id, job_id, limit),
+        ).fetchall()
+
+    if not rows:
+        return None
+    return [_job_log_from_db_row(r) for r in rows if r["job_log_id"] is not None]
@@ -0,0 +1,79 @@
+"""Encoding for the *_json TEXT columns.
+
+orjson instead of the stdlib json: these run for every row written, and
+loads_json for every row read on the list endpoints. Output is compact UTF-8
+(non-ASCII kept as-is, like json.dumps(ensure_ascii=False)), and non-string dict
+keys are stringified as the stdlib does.
+
+orjson is limited to 64-bit integers (it refuses larger ones when encoding and
+reads them back as floats), writes NaN/Infinity as null and rejects those
+literals when decoding. Values like that go through the stdlib instead, so they
+round-trip exactly as before. Sidecar _meta.json parsing uses loads_json for the
+same reason.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any
+
+import orjson
+
+# Integer literals of 19+ digits may not fit in 64 bits. Also matches digit runs
+# inside strings; those just take the (still correct) stdlib path.
+_MAYBE_BIG_INT = re.compile(r"\d{19}")
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, float):
+            if not math.isfinite(v):
+                return True
+        elif isinstance(v, dict):
+            stack.extend(v.values())
+        elif isinstance(v, list | tuple):
+            stack.extend(v)
+    return False
+
+
+def _stdlib_dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_json(value: Any) -> tuple[str, bool]:
+    """Serialize `value`; the flag is False when the text carries NaN/Infinity.
+
+    Such text is what json.dumps writes, but it is not standard JSON, so SQLite's
+    JSON1 functions reject it.
+    """
+
+    try:
+        out = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        text = _stdlib_dumps(value)
+        return text, not _has_non_finite_float(value)
+    # orjson writes non-finite floats as null rather than raising; only a payload
+    # with a null in it can have lost one, so the walk is skipped otherwise.
+    if b"null" in out and _has_non_finite_float(value):
+        return _stdlib_dumps(value), False
+    return out.decode("utf-8"), True
+
+
+def dumps_json(value: Any) -> str:
+    return encode_json(value)[0]
+
+
+def loads_json(raw: str) -> Any:
+    """Decode a stored JSON value; raises ValueError when it is not valid JSON."""
+
+    if _MAYBE_BIG_INT.search(raw):
+        return json.loads(raw)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity, as written by the stdlib encoder before orjson was used.
+        return json.loads(raw)
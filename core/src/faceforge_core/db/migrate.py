@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 from faceforge_core.db.migrations import MIGRATIONS
@@ -19,7 +20,10 @@ def apply_migrations(db_path: Path) -> None:
 
     ensure_db_parent_dir(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    # closing(): the connection's own context manager only commits.
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        # WAL is persistent in the DB file; it lets readers proceed during writes.
+        conn.execute("PRAGMA journal_mode = WAL;")
         conn.execute("PRAGMA foreign_keys = ON;")
         conn.execute(
             "CREATE TABLE IF NOT EXISTS schema_migrations ("
@@ -174,6 +174,117 @@ ALTER TABLE jobs ADD COLUMN cancel_requested_at TEXT;
 
 CREATE INDEX IF NOT EXISTS idx_jobs_job_type ON jobs(job_type);
 CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
+""",
+    ),
+    (
+        "0005_assets_content_hash_prefix",
+        """
+PRAGMA foreign_keys = ON;
+
+-- xxh3-128 (non-cryptographic) of the first 1 MiB of content; lets uploads spot a likely duplicate
+-- (prefix + byte_size) before spooling the bytes. NULL for rows that predate it.
+ALTER TABLE assets ADD COLUMN content_hash_prefix TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_assets_content_hash_prefix
+    ON assets(content_hash_prefix, byte_size);
+""",
+    ),
+    (
+        "0006_list_keyset_indexes",
+        """
+-- Keyset pagination seeks on (sort key, id) for the default newest-first listings.
+CREATE INDEX IF NOT EXISTS idx_entities_created_at_id ON entities(created_at DESC, entity_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at_id ON jobs(created_at DESC, job_id);
+""",
+    ),
+    (
+        "0007_relationship_types_covering_index",
+        """
+-- Lets relation-type suggestions read distinct live types from the index alone.
+CREATE INDEX IF NOT EXISTS idx_relationships_type_deleted_at
+    ON relationships(relationship_type, deleted_at);
+""",
+    ),
+    (
+        "0008_entity_tags_index",
+        """
+PRAGMA foreign_keys = ON;
+
+-- One row per (lowercased tag, entity), kept in sync with entities.tags_json by triggers, so the
+-- entity list tag filter is an index lookup instead of a LIKE over every row's JSON.
+CREATE TABLE IF NOT EXISTS entity_tags (
+    tag_lc TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    PRIMARY KEY (tag_lc, entity_id),
+    FOREIGN KEY(entity_id) REFERENCES entities(entity_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO entity_tags (tag_lc, entity_id)
+SELECT lower(j.value), e.entity_id
+FROM entities AS e,
+     json_each(CASE WHEN json_valid(e.tags_json) THEN e.tags_json ELSE '[]' END) AS j
+WHERE j.type = 'text';
+
+CREATE TRIGGER IF NOT EXISTS trg_entities_tags_ai AFTER INSERT ON entities
+BEGIN
+    INSERT OR IGNORE INTO entity_tags (tag_lc, entity_id)
+    SELECT lower(j.value), NEW.entity_id
+    FROM json_each(CASE WHEN json_valid(NEW.tags_json) THEN NEW.tags_json ELSE '[]' END) AS j
+    WHERE j.type = 'text';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_entities_tags_au AFTER UPDATE OF tags_json ON entities
+BEGIN
+    DELETE FROM entity_tags WHERE entity_id = OLD.entity_id;
+    INSERT OR IGNORE INTO entity_tags (tag_lc, entity_id)
+    SELECT lower(j.value), NEW.entity_id
+    FROM json_each(CASE WHEN json_valid(NEW.tags_json) THEN NEW.tags_json ELSE '[]' END) AS j
+    WHERE j.type = 'text';
+END;
+""",
+    ),
+    (
+        "0009_entities_search_trigram",
+        """
+-- Trigram index over the columns the entity list q filter matches, so a substring
+-- search of 3+ characters is answered from the index instead of LIKE over every row.
+-- Keyed by entity_id rather than rowid: VACUUM may renumber the rowids of entities.
+CREATE VIRTUAL TABLE IF NOT EXISTS entities_search USING fts5(
+    entity_id UNINDEXED,
+    search_text,
+    tokenize = 'trigram'
+);
+
+INSERT INTO entities_search (entity_id, search_text)
+SELECT entity_id,
+       display_name || char(31) || aliases_json || char(31) || tags_json
+           || char(31) || fields_json
+FROM entities
+WHERE entity_id NOT IN (SELECT entity_id FROM entities_search);
+
+CREATE TRIGGER IF NOT EXISTS trg_entities_search_ai AFTER INSERT ON entities
+BEGIN
+    INSERT INTO entities_search (entity_id, search_text)
+    VALUES (
+        NEW.entity_id,
+        NEW.display_name || char(31) || NEW.aliases_json || char(31) || NEW.tags_json
+            || char(31) || NEW.fields_json
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_entities_search_au
+AFTER UPDATE OF display_name, aliases_json, tags_json, fields_json ON entities
+BEGIN
+    UPDATE entities_search
+    SET search_text = NEW.display_name || char(31) || NEW.aliases_json || char(31)
+        || NEW.tags_json || char(31) || NEW.fields_json
+    WHERE entity_id = OLD.entity_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_entities_search_ad AFTER DELETE ON entities
+BEGIN
+    DELETE FROM entities_search WHERE entity_id = OLD.entity_id;
+END;
 """,
     ),
 ]
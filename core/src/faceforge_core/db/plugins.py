@@ -1,32 +1,27 @@
 from __future__ import annotations
 
-import json
 import sqlite3
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import Any
 
-
-def _utc_now_sqlite_iso() -> str:
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+from faceforge_core.db.connection import connect
+from faceforge_core.db.json_columns import dumps_json, loads_json
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def _loads_json(raw: str) -> Any:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads_json(raw)
+    except ValueError:
         return {}
 
 
 def _dumps_json(value: Any) -> str:
-    return json.dumps(value if value is not None else {}, ensure_ascii=False)
+    return dumps_json(value if value is not None else {})
 
 
 @dataclass(frozen=True)
@@ -52,35 +47,49 @@ def _row_from_db(row: sqlite3.Row) -> PluginRegistryRow:
     )
 
 
+_UPSERT_DISCOVERY_SQL = """
+INSERT INTO plugin_registry (
+    plugin_id,
+    enabled,
+    version,
+    config_json,
+    discovered_at,
+    updated_at,
+    deleted_at
+)
+VALUES (
+    ?, 0, ?, '{}',
+    strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+    strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+    NULL
+)
+ON CONFLICT(plugin_id) DO UPDATE SET
+    version = excluded.version,
+    discovered_at = excluded.discovered_at,
+    updated_at = excluded.updated_at,
+    deleted_at = NULL;
+""".strip()
+
+
+def upsert_plugins_discovery(db_path, *, items: Iterable[tuple[str, str | None]]) -> None:
+    """Upsert registry rows for many discovered (plugin_id, version) pairs in one transaction."""
+
+    params = list(items)
+    if not params:
+        return
+
+    with _connect(db_path) as conn:
+        conn.executemany(_UPSERT_DISCOVERY_SQL, params)
+
+
 def upsert_plugin_discovery(
     db_path,
     *,
     plugin_id: str,
     version: str | None,
 ) -> PluginRegistryRow:
-    now = _utc_now_sqlite_iso()
-
     with _connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO plugin_registry (
-                plugin_id,
-                enabled,
-                version,
-                config_json,
-                discovered_at,
-                updated_at,
-                deleted_at
-            )
-            VALUES (?, 0, ?, '{}', ?, ?, NULL)
-            ON CONFLICT(plugin_id) DO UPDATE SET
-                version = excluded.version,
-                discovered_at = excluded.discovered_at,
-                updated_at = excluded.updated_at,
-                deleted_at = NULL;
-            """.strip(),
-            (plugin_id, version, now, now),
-        )
+        conn.execute(_UPSERT_DISCOVERY_SQL, (plugin_id, version))
 
         row = conn.execute(
             """
@@ -143,24 +152,15 @@ def get_plugin_registry(
 
 def set_plugin_enabled(db_path, *, plugin_id: str, enabled: bool) -> PluginRegistryRow | None:
     with _connect(db_path) as conn:
-        cur = conn.execute(
-            """
-            UPDATE plugin_registry
-            SET enabled = ?, updated_at = ?, deleted_at = NULL
-            WHERE plugin_id = ? AND deleted_at IS NULL;
-            """.strip(),
-            (1 if enabled else 0, _utc_now_sqlite_iso(), plugin_id),
-        )
-        if cur.rowcount == 0:
-            return None
-
         row = conn.execute(
             """
-            SELECT plugin_id, enabled, version, config_json, discovered_at, updated_at, deleted_at
-            FROM plugin_registry
-            WHERE plugin_id = ? AND deleted_at IS NULL;
+            UPDATE plugin_registry
+            SET enabled = ?, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now'), deleted_at = NULL
+            WHERE plugin_id = ? AND deleted_at IS NULL
+            RETURNING plugin_id, enabled, version, config_json, discovered_at, updated_at,
+                      deleted_at;
             """.strip(),
-            (plugin_id,),
+            (1 if enabled else 0, plugin_id),
         ).fetchone()
 
     return _row_from_db(row) if row is not None else None
@@ -177,24 +177,17 @@ def set_plugin_config(db_path, *, plugin_id: str, config: Any) -> PluginRegistry
     config_json = _dumps_json(config)
 
     with _connect(db_path) as conn:
-        cur = conn.execute(
-            """
-            UPDATE plugin_registry
-            SET config_json = ?, updated_at = ?, deleted_at = NULL
-            WHERE plugin_id = ? AND deleted_at IS NULL;
-            """.strip(),
-            (config_json, _utc_now_sqlite_iso(), plugin_id),
-        )
-        if cur.rowcount == 0:
-            return None
-
         row = conn.execute(
             """
-            SELECT plugin_id, enabled, version, config_json, discovered_at, updated_at, deleted_at
-            FROM plugin_registry
-            WHERE plugin_id = ? AND deleted_at IS NULL;
+            UPDATE plugin_registry
+            SET config_json = ?,
+                updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+                deleted_at = NULL
+            WHERE plugin_id = ? AND deleted_at IS NULL
+            RETURNING plugin_id, enabled, version, config_json, discovered_at, updated_at,
+                      deleted_at;
             """.strip(),
-            (plugin_id,),
+            (config_json, plugin_id),
         ).fetchone()
 
     return _row_from_db(row) if row is not None else None
@@ -1,29 +1,24 @@
 from __future__ import annotations
 
-import json
+import functools
 import sqlite3
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import Any
 
+from faceforge_core.db.connection import connect
 from faceforge_core.db.ids import new_relationship_id
-
-
-def _utc_now_sqlite_iso() -> str:
-    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+from faceforge_core.db.json_columns import dumps_json, loads_json
 
 
 def _connect(db_path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(db_path)
 
 
 def _loads_dict(raw: str) -> dict[str, Any]:
     try:
-        v = json.loads(raw)
-    except json.JSONDecodeError:
+        v = loads_json(raw)
+    except ValueError:
         return {}
     if isinstance(v, dict):
         return v
@@ -31,7 +26,7 @@ def _loads_dict(raw: str) -> dict[str, Any]:
 
 
 def _dumps_dict(value: dict[str, Any] | None) -> str:
-    return json.dumps(value or {}, ensure_ascii=False)
+    return dumps_json(value or {})
 
 
 @dataclass(frozen=True)
@@ -69,7 +64,7 @@ def create_relationship(
     fields_json = _dumps_dict(fields)
 
     with _connect(db_path) as conn:
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO relationships (
                 relationship_id,
@@ -78,19 +73,11 @@ def create_relationship(
                 relationship_type,
                 fields_json
             )
-            VALUES (?, ?, ?, ?, ?);
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING relationship_id, src_entity_id, dst_entity_id, relationship_type,
+                      fields_json, created_at, deleted_at;
             """.strip(),
             (relationship_id, src_entity_id, dst_entity_id, relationship_type, fields_json),
-        )
-
-        row = conn.execute(
-            """
-            SELECT relationship_id, src_entity_id, dst_entity_id, relationship_type,
-                   fields_json, created_at, deleted_at
-            FROM relationships
-            WHERE relationship_id = ?;
-            """.strip(),
-            (relationship_id,),
         ).fetchone()
 
     if row is None:
@@ -151,56 +138,63 @@ def list_relationships_for_entity(
 
 
 def soft_delete_relationship(db_path, *, relationship_id: str) -> bool:
-    now = _utc_now_sqlite_iso()
     with _connect(db_path) as conn:
         cur = conn.execute(
             """
             UPDATE relationships
-            SET deleted_at = ?
+            SET deleted_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
             WHERE relationship_id = ? AND deleted_at IS NULL;
             """.strip(),
-            (now, relationship_id),
+            (relationship_id,),
         )
         return cur.rowcount > 0
 
 
-def list_relationship_types(
+@functools.lru_cache(maxsize=8)
+def _suggest_types_sql(seed_count: int) -> str:
+    seed_values = ", ".join("(?, ?)" for _ in range(seed_count)) or "(NULL, NULL)"
+    # Each candidate carries its lowered form (lt), so lower() runs once per stored
+    # type instead of in the filter, the GROUP BY and the ORDER BY.
+    return f"""
+WITH seeds(t, lt) AS (VALUES {seed_values}),
+cands AS (
+    SELECT t, lt, 0 AS src FROM seeds WHERE t IS NOT NULL
+    UNION ALL
+    SELECT DISTINCT relationship_type, lower(relationship_type), 1 FROM relationships
+    WHERE deleted_at IS NULL AND trim(relationship_type) != ''
+),
+picked AS (
+    SELECT substr(MIN(src || t), 2) AS t, lt
+    FROM cands
+    WHERE instr(lt, ?) > 0
+    GROUP BY lt
+)
+SELECT t FROM picked
+ORDER BY CASE WHEN instr(lt, ?) = 1 THEN 0 ELSE 1 END, lt
+LIMIT ?;
+""".strip()
+
+
+def suggest_relationship_types(
     db_path,
     *,
+    seeds: Sequence[tuple[str, str]],
     query: str | None,
     limit: int,
-    include_deleted: bool = False,
 ) -> list[str]:
-    clauses: list[str] = []
-    params: list[Any] = []
+    """Suggest relation types from `seeds` plus the distinct types in use.
 
-    if not include_deleted:
-        clauses.append("deleted_at IS NULL")
+    `seeds` are (type, type.lower()) pairs, lowered once by the caller. Filtering
+    (case-insensitive substring), de-duplication (case-insensitive, seed spelling
+    wins), ranking (prefix matches first, then alphabetical) and the limit all
+    happen in one SQL statement.
+    """
 
     q = (query or "").strip().lower()
-    if q:
-        clauses.append("LOWER(relationship_type) LIKE ?")
-        params.append(f"%{q}%")
-
-    where_sql = ""
-    if clauses:
-        where_sql = "WHERE " + " AND ".join(clauses)
+    params: list[object] = [v for pair in seeds for v in pair]
+    params += [q, q, limit]
 
     with _connect(db_path) as conn:
-        rows = conn.execute(
-            f"""
-            SELECT DISTINCT relationship_type
-            FROM relationships
-            {where_sql}
-            ORDER BY relationship_type ASC
-            LIMIT ?;
-            """.strip(),
-            [*params, limit],
-        ).fetchall()
+        rows = conn.execute(_suggest_types_sql(len(seeds)), params).fetchall()
 
-    out: list[str] = []
-    for r in rows:
-        v = r["relationship_type"]
-        if isinstance(v, str) and v.strip():
-            out.append(v)
-    return out
+    return [r["t"] for r in rows]
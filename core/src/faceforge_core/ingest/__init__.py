@@ -1,5 +1,10 @@
 from __future__ import annotations
 
-from faceforge_core.ingest.exiftool import run_exiftool, should_skip_exiftool
+from faceforge_core.ingest.exiftool import (
+    ExifToolWorker,
+    find_exiftool_executable,
+    run_exiftool,
+    should_skip_exiftool,
+)
 
-__all__ = ["run_exiftool", "should_skip_exiftool"]
+__all__ = ["ExifToolWorker", "find_exiftool_executable", "run_exiftool", "should_skip_exiftool"]
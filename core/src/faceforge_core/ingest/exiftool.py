@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -39,6 +41,55 @@ EXIFTOOL_REMOVE_KEYS: set[str] = {
 }
 
 
+def find_exiftool_executable(config: Any, paths: Any) -> Path | None:
+    """Locate the ExifTool binary from core config + the managed tools dir.
+
+    Returns None when ExifTool is disabled or not installed.
+    """
+
+    enabled = bool(getattr(getattr(config, "tools", None), "exiftool_enabled", True))
+    if not enabled:
+        return None
+
+    tools_dir = getattr(paths, "tools_dir", None)
+    if tools_dir is None:
+        return None
+
+    tools_dir = Path(tools_dir)
+
+    raw = getattr(getattr(config, "tools", None), "exiftool_path", None)
+    if raw and str(raw).strip():
+        p = Path(str(raw)).expanduser()
+        # Relative paths are resolved relative to the managed tools dir.
+        p = p if p.is_absolute() else (tools_dir / p)
+        p = p.resolve()
+        return p if p.exists() else None
+
+    # Bundled locations only (no PATH fallback).
+    is_windows = os.name == "nt"
+    candidates: list[Path] = []
+    if is_windows:
+        candidates.extend(
+            [
+                tools_dir / "exiftool.exe",
+                tools_dir / "exiftool" / "exiftool.exe",
+            ]
+        )
+    else:
+        candidates.extend(
+            [
+                tools_dir / "exiftool",
+                tools_dir / "exiftool" / "exiftool",
+            ]
+        )
+
+    for c in candidates:
+        if c.exists():
+            return c
+
+    return None
+
+
 def should_skip_exiftool(filename: str) -> bool:
     name = (filename or "").strip()
     if not name:
@@ -75,6 +126,29 @@ def build_exiftool_entry(exiftool_output: Any) -> dict[str, Any]:
     }
 
 
+def _entry_from_exiftool_output(out: str) -> dict[str, Any]:
+    out = out.strip()
+    if not out:
+        raise RuntimeError("exiftool produced empty output")
+
+    try:
+        parsed = json.loads(out)
+    except json.JSONDecodeError as e:
+        raise RuntimeError("exiftool output was not valid JSON") from e
+
+    filtered = _filter_exiftool_payload(parsed)
+
+    # Validate non-empty after filtering.
+    if filtered in (None, ""):
+        raise RuntimeError("exiftool JSON became empty after filtering")
+    if isinstance(filtered, list) and len(filtered) == 0:
+        raise RuntimeError("exiftool JSON list was empty")
+    if isinstance(filtered, dict) and len(filtered) == 0:
+        raise RuntimeError("exiftool JSON object was empty")
+
+    return build_exiftool_entry(filtered)
+
+
 def run_exiftool(*, exiftool_path: Path, asset_path: Path) -> dict[str, Any]:
     """Run exiftool using a parameter file as required by spec.
 
@@ -100,31 +174,148 @@ def run_exiftool(*, exiftool_path: Path, asset_path: Path) -> dict[str, Any]:
             check=False,
         )
 
-        out = (proc.stdout or "").strip()
         if proc.returncode != 0:
             raise RuntimeError(f"exiftool exited with code {proc.returncode}")
-        if not out:
-            raise RuntimeError("exiftool produced empty output")
 
-        try:
-            parsed = json.loads(out)
-        except json.JSONDecodeError as e:
-            raise RuntimeError("exiftool output was not valid JSON") from e
-
-        filtered = _filter_exiftool_payload(parsed)
-
-        # Validate non-empty after filtering.
-        if filtered in (None, ""):
-            raise RuntimeError("exiftool JSON became empty after filtering")
-        if isinstance(filtered, list) and len(filtered) == 0:
-            raise RuntimeError("exiftool JSON list was empty")
-        if isinstance(filtered, dict) and len(filtered) == 0:
-            raise RuntimeError("exiftool JSON object was empty")
-
-        entry = build_exiftool_entry(filtered)
-        return entry
+        return _entry_from_exiftool_output(proc.stdout or "")
     finally:
         try:
             args_file.unlink(missing_ok=True)
         except OSError:
             pass
+
+
+# How long a caller waits for the shared worker before giving up on it (callers then
+# use run_exiftool), and how long one extraction may take before the process is killed.
+WORKER_LOCK_TIMEOUT_S = 0.25
+WORKER_READ_TIMEOUT_S = 60.0
+
+
+class ExifToolWorker:
+    """A long-lived `exiftool -stay_open True -@ -` process.
+
+    Each request writes the same argument line used by run_exiftool, the asset path
+    and `-execute` to stdin, then reads stdout up to the `{ready}` sentinel. This
+    avoids a Perl interpreter start per asset.
+
+    Calls are serialized with a lock (callers run in worker threads). A call that
+    cannot take the lock within `lock_timeout_s` raises instead of queueing, and a
+    call whose output does not complete within `read_timeout_s` kills the process.
+    In both cases, and whenever the process dies, the call raises so callers can
+    fall back to run_exiftool; a dead process is restarted on the next call.
+    """
+
+    def __init__(
+        self,
+        exiftool_path: Path,
+        *,
+        lock_timeout_s: float = WORKER_LOCK_TIMEOUT_S,
+        read_timeout_s: float = WORKER_READ_TIMEOUT_S,
+    ) -> None:
+        self.exiftool_path = exiftool_path
+        self.lock_timeout_s = lock_timeout_s
+        self.read_timeout_s = read_timeout_s
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen[str] | None = None
+
+    def _ensure_started(self) -> subprocess.Popen[str]:
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            return proc
+
+        if not self.exiftool_path.exists():
+            raise FileNotFoundError(str(self.exiftool_path))
+
+        proc = subprocess.Popen(
+            [str(self.exiftool_path), "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._proc = proc
+        return proc
+
+    def start(self) -> None:
+        """Spawn the process now (otherwise it starts on the first run())."""
+
+        with self._lock:
+            self._ensure_started()
+
+    def run(self, *, asset_path: Path) -> dict[str, Any]:
+        if not asset_path.exists():
+            raise FileNotFoundError(str(asset_path))
+
+        if not self._lock.acquire(timeout=self.lock_timeout_s):
+            raise RuntimeError("exiftool worker busy")
+        try:
+            proc = self._ensure_started()
+            assert proc.stdin is not None and proc.stdout is not None
+            # readline() has no timeout; killing the process makes it return EOF.
+            timed_out = threading.Event()
+
+            def _expire() -> None:
+                timed_out.set()
+                proc.kill()
+
+            watchdog = threading.Timer(self.read_timeout_s, _expire)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                proc.stdin.write(f"{EXIFTOOL_ARGSFILE_LINE}\n{asset_path}\n-execute\n")
+                proc.stdin.flush()
+
+                lines: list[str] = []
+                while True:
+                    line = proc.stdout.readline()
+                    if not line:
+                        if timed_out.is_set():
+                            raise RuntimeError("exiftool worker timed out")
+                        raise RuntimeError("exiftool worker exited unexpectedly")
+                    if line.strip() == "{ready}":
+                        break
+                    lines.append(line)
+            except BaseException:
+                # Any failure mid-exchange (e.g. undecodable output) can leave this
+                # asset's output unread in the pipe, where the next call would read it.
+                self._terminate()
+                raise
+            finally:
+                watchdog.cancel()
+        finally:
+            self._lock.release()
+
+        return _entry_from_exiftool_output("".join(lines))
+
+    def _terminate(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def close(self) -> None:
+        """Ask exiftool to exit, killing it if it does not stop promptly."""
+
+        with self._lock:
+            proc = self._proc
+            self._proc = None
+            if proc is None:
+                return
+            try:
+                if proc.stdin is not None:
+                    proc.stdin.write("-stay_open\nFalse\n")
+                    proc.stdin.flush()
+                    proc.stdin.close()
+                proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
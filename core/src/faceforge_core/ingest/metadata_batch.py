@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from faceforge_core.db.assets import append_asset_metadata_entries, append_asset_metadata_entry
+from faceforge_core.db.connection import close_thread_connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_FLUSH_INTERVAL_S = 0.25
+
+
+def batch_size_from_env() -> int:
+    raw = (os.environ.get("FACEFORGE_EXIFTOOL_BATCH") or "").strip()
+    if not raw:
+        return DEFAULT_BATCH_SIZE
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_BATCH_SIZE
+    return value if value > 0 else DEFAULT_BATCH_SIZE
+
+
+class MetadataBatchWriter:
+    """Collect extracted metadata entries and write them in batched transactions.
+
+    `submit()` is cheap and thread-safe. A daemon thread flushes whenever
+    `batch_size` entries are pending or every `flush_interval_s` seconds, so bursts
+    of uploads share one SQLite transaction instead of one per asset.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+    ) -> None:
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self._pending: deque[tuple[str, dict[str, Any]]] = deque()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="ff-metadata-batch", daemon=True)
+        self._thread.start()
+
+    def submit(self, asset_id: str, entry: dict[str, Any]) -> None:
+        self._pending.append((asset_id, entry))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Write everything currently pending (called from the flusher thread)."""
+
+        while self._pending:
+            batch: list[tuple[str, dict[str, Any]]] = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popleft())
+            try:
+                missing = append_asset_metadata_entries(self.db_path, entries=batch)
+            except Exception:
+                # The batch transaction rolled back; retry per asset so one bad entry
+                # (or a transient SQLITE_BUSY) only costs that asset its metadata.
+                missing = self._write_individually(batch)
+            for asset_id in missing:
+                logger.warning(
+                    "ExifTool metadata extracted but asset not found",
+                    extra={"asset_id": asset_id},
+                )
+
+    def _write_individually(self, batch: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        missing: list[str] = []
+        for asset_id, entry in batch:
+            try:
+                row = append_asset_metadata_entry(self.db_path, asset_id=asset_id, entry=entry)
+            except Exception as e:
+                logger.warning(
+                    "Failed to write ExifTool metadata",
+                    extra={"asset_id": asset_id, "error": str(e)},
+                )
+                continue
+            if row is None:
+                missing.append(asset_id)
+        return missing
+
+    def stop(self) -> None:
+        """Stop the flusher thread after writing any pending entries."""
+
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            while not self._stopping:
+                self._wake.wait(self.flush_interval_s)
+                self._wake.clear()
+                self.flush()
+            self.flush()
+        finally:
+            close_thread_connections()
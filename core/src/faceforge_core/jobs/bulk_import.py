@@ -1,24 +1,33 @@
 from __future__ import annotations
 
-import json
 import mimetypes
-import sqlite3
+import os
 import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from faceforge_core.db.assets import (
+    NewAsset,
     append_asset_metadata_entry,
-    create_asset,
+    create_assets_bulk,
+    get_asset,
     get_asset_by_content_hash,
 )
-from faceforge_core.db.ids import asset_id_from_content_hash, sha256_hex_file
+from faceforge_core.db.ids import (
+    asset_id_from_content_hash,
+    content_prefix_key_file,
+    sha256_hex_file,
+)
 from faceforge_core.db.jobs import (
     append_job_log,
     get_job,
     mark_job_canceled,
     update_job_progress,
 )
+from faceforge_core.db.json_columns import loads_json
 from faceforge_core.storage.manager import StorageManager
 
 
@@ -29,16 +38,28 @@ def _guess_mime_type(filename: str | None) -> str | None:
     return guess
 
 
+# Same cap as the upload endpoint's sidecar limit.
+MAX_SIDECAR_BYTES = 16 * 1024 * 1024
+
+# Asset rows are inserted in one transaction per this many stored files.
+INSERT_BATCH_SIZE = 64
+
+
 def _read_sidecar_json(sidecar_path: Path) -> Any:
-    raw = sidecar_path.read_bytes()
+    with sidecar_path.open("rb") as f:
+        raw = f.read(MAX_SIDECAR_BYTES + 1)
+    if len(raw) > MAX_SIDECAR_BYTES:
+        raise ValueError("_meta.json is too large")
+
     try:
         text = raw.decode("utf-8")
     except UnicodeDecodeError as e:
         raise ValueError("_meta.json must be UTF-8") from e
 
+    # Accepts what json.loads does (big integers kept exact, NaN/Infinity literals).
     try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError as e:
+        parsed = loads_json(text)
+    except ValueError as e:
         raise ValueError("_meta.json must be valid JSON") from e
 
     if parsed in (None, ""):
@@ -47,6 +68,47 @@ def _read_sidecar_json(sidecar_path: Path) -> Any:
     return parsed
 
 
+def _discard_unreferenced_blob(db_path: Path, *, asset_id: str, path: Path | None) -> None:
+    """Remove a stored file whose asset row could not be inserted.
+
+    Only local (filesystem) blobs are removed, and only while no row references
+    the content-addressed key (another import may have inserted it meanwhile).
+    """
+
+    if path is None:
+        return
+    try:
+        if get_asset(db_path, asset_id=asset_id, include_deleted=True) is None:
+            path.unlink(missing_ok=True)
+    except Exception:
+        pass
+
+
+def _hash_workers() -> int:
+    # Hashing is I/O + OpenSSL work that releases the GIL, so threads scale; cap the
+    # fan-out to keep concurrent reads reasonable on spinning disks.
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _iter_content_hashes(files: list[Path], *, workers: int) -> Iterator[tuple[Path, Future[str]]]:
+    """Yield (path, future content hash) in order, hashing a bounded window ahead."""
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ff-import-hash") as pool:
+        window: deque[tuple[Path, Future[str]]] = deque()
+        it = iter(files)
+        try:
+            for p in it:
+                window.append((p, pool.submit(sha256_hex_file, p)))
+                if len(window) >= workers * 2:
+                    yield window.popleft()
+            while window:
+                yield window.popleft()
+        finally:
+            # Stop hashing ahead if the consumer bails out (e.g. job canceled).
+            for _p, fut in window:
+                fut.cancel()
+
+
 def _sidecar_candidates(file_path: Path) -> list[Path]:
     name = file_path.name
     stem = file_path.stem
@@ -116,8 +178,72 @@ def run_assets_bulk_import(ctx, job_id: str, job_input: dict[str, Any]) -> dict[
             "errors": 0,
         }
 
-    for idx, file_path in enumerate(files, start=1):
+    # (source file, row to insert, local blob written for it, if any)
+    pending: list[tuple[Path, NewAsset, Path | None]] = []
+
+    def flush_pending() -> None:
+        nonlocal imported, skipped_existing, errors
+        if not pending:
+            return
+        batch = pending.copy()
+        pending.clear()
+        try:
+            results = list(
+                zip(batch, create_assets_bulk(db_path, items=[p[1] for p in batch]), strict=True)
+            )
+        except Exception:
+            # One bad row rolls back the whole transaction; retry row by row so only
+            # the failing files are reported.
+            results = []
+            for queued in batch:
+                file_path, item, local_path = queued
+                try:
+                    (created,) = create_assets_bulk(db_path, items=[item])
+                except Exception as e:
+                    errors += 1
+                    append_job_log(
+                        db_path,
+                        job_id=job_id,
+                        level="error",
+                        message="Import failed",
+                        data={"file": str(file_path), "error": str(e)},
+                    )
+                    _discard_unreferenced_blob(db_path, asset_id=item.asset_id, path=local_path)
+                    continue
+                results.append((queued, created))
+
+        for (file_path, item, _local_path), created in results:
+            if not created:
+                # A duplicate earlier in the batch (or a lost race): handle it like the
+                # already-imported path, keeping this file's sidecar on the asset.
+                skipped_existing += 1
+                for entry in item.meta["metadata"]:
+                    append_asset_metadata_entry(db_path, asset_id=item.asset_id, entry=entry)
+                append_job_log(
+                    db_path,
+                    job_id=job_id,
+                    level="info",
+                    message="Skipped (already imported)",
+                    data={"file": str(file_path), "asset_id": item.asset_id},
+                )
+                continue
+            imported += 1
+            append_job_log(
+                db_path,
+                job_id=job_id,
+                level="info",
+                message="Imported",
+                data={"file": str(file_path), "asset_id": item.asset_id, "bytes": item.byte_size},
+            )
+
+    # Hash files ahead of the import loop in parallel; throttled jobs use one thread.
+    workers = 1 if throttle_ms > 0 else _hash_workers()
+
+    for idx, (file_path, hash_future) in enumerate(
+        _iter_content_hashes(files, workers=workers), start=1
+    ):
         if cancel_requested():
+            flush_pending()
             append_job_log(db_path, job_id=job_id, level="info", message="Bulk import canceled")
             mark_job_canceled(
                 db_path,
@@ -175,7 +301,7 @@ def run_assets_bulk_import(ctx, job_id: str, job_input: dict[str, Any]) -> dict[
                 )
                 continue
 
-            content_hash = sha256_hex_file(file_path)
+            content_hash = hash_future.result()
             asset_id = asset_id_from_content_hash(content_hash)
 
             existing = get_asset_by_content_hash(
@@ -201,6 +327,7 @@ def run_assets_bulk_import(ctx, job_id: str, job_input: dict[str, Any]) -> dict[
                 )
                 continue
 
+            content_hash_prefix = content_prefix_key_file(file_path)
             upload_result = storage_mgr.store_existing_file(
                 source_path=file_path,
                 asset_id=asset_id,
@@ -222,34 +349,26 @@ def run_assets_bulk_import(ctx, job_id: str, job_input: dict[str, Any]) -> dict[
 
             mime_type = _guess_mime_type(file_path.name)
 
-            created = False
-            try:
-                create_asset(
-                    db_path,
-                    asset_id=asset_id,
-                    kind=kind,
-                    filename=file_path.name,
-                    content_hash=content_hash,
-                    byte_size=byte_size,
-                    mime_type=mime_type,
-                    storage_provider=upload_result.storage_provider,
-                    storage_key=upload_result.storage_key,
-                    meta=meta_obj,
-                )
-                created = True
-            except sqlite3.IntegrityError:
-                # Lost a race; treat as already imported.
-                skipped_existing += 1
-
-            if created:
-                imported += 1
-                append_job_log(
-                    db_path,
-                    job_id=job_id,
-                    level="info",
-                    message="Imported",
-                    data={"file": str(file_path), "asset_id": asset_id, "bytes": byte_size},
+            pending.append(
+                (
+                    file_path,
+                    NewAsset(
+                        asset_id=asset_id,
+                        kind=kind,
+                        filename=file_path.name,
+                        content_hash=content_hash,
+                        byte_size=byte_size,
+                        mime_type=mime_type,
+                        storage_provider=upload_result.storage_provider,
+                        storage_key=upload_result.storage_key,
+                        meta=meta_obj,
+                        content_hash_prefix=content_hash_prefix,
+                    ),
+                    upload_result.local_path,
                 )
+            )
+            if len(pending) >= INSERT_BATCH_SIZE:
+                flush_pending()
 
         except Exception as e:
             errors += 1
@@ -264,6 +383,7 @@ def run_assets_bulk_import(ctx, job_id: str, job_input: dict[str, Any]) -> dict[
         if throttle_ms > 0:
             time.sleep(throttle_ms / 1000.0)
 
+    flush_pending()
     update_job_progress(db_path, job_id=job_id, progress_percent=100.0, progress_step="done")
     return {
         "path": str(src_dir),
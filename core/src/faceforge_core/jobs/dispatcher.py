@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import logging
+import os
+import queue
 import threading
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from faceforge_core.db.connection import close_thread_connections
 from faceforge_core.db.jobs import (
     append_job_log,
     get_job,
@@ -17,6 +21,10 @@ from faceforge_core.db.jobs import (
 from faceforge_core.jobs.bulk_import import run_assets_bulk_import
 from faceforge_core.storage.manager import StorageManager
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_WORKERS = 4
+
 JobHandler = Callable[["JobContext", str, dict[str, Any]], dict[str, Any]]
 
 
@@ -31,18 +39,106 @@ _JOB_HANDLERS: dict[str, JobHandler] = {
 }
 
 
-def known_job_types() -> set[str]:
-    return set(_JOB_HANDLERS.keys())
+# The handler table is static, so the membership set is built once at import.
+_KNOWN_JOB_TYPES: frozenset[str] = frozenset(_JOB_HANDLERS)
+
 
+def known_job_types() -> frozenset[str]:
+    return _KNOWN_JOB_TYPES
 
-def start_job_thread(*, ctx: JobContext, job_id: str) -> None:
-    t = threading.Thread(
-        target=_run_job,
-        kwargs={"ctx": ctx, "job_id": job_id},
-        name=f"ff-job-{job_id[:8]}",
-        daemon=True,
-    )
-    t.start()
+
+def job_workers_from_env() -> int:
+    raw = (os.environ.get("FACEFORGE_JOB_WORKERS") or "").strip()
+    if not raw:
+        return DEFAULT_JOB_WORKERS
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_JOB_WORKERS
+    return value if value > 0 else DEFAULT_JOB_WORKERS
+
+
+class JobRunner:
+    """Run jobs on a fixed pool of worker threads.
+
+    `submit()` only enqueues, so the request path never pays for thread start-up,
+    and at most `workers` jobs run at once; the rest wait (still `queued`). Workers
+    are daemon threads (like the per-job threads they replace) so a long import
+    never blocks interpreter exit; they also keep their SQLite connections warm
+    across jobs.
+    """
+
+    def __init__(self, *, workers: int = DEFAULT_JOB_WORKERS) -> None:
+        self._workers = max(1, workers)
+        self._queue: queue.SimpleQueue[tuple[JobContext, str] | None] = queue.SimpleQueue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def submit(self, *, ctx: JobContext, job_id: str) -> None:
+        # Enqueue under the lock so stop() sees every job: either it drains this one,
+        # or this call sees the runner stopped and fails the job itself.
+        with self._lock:
+            if not self._stopped:
+                self._ensure_started_locked()
+                self._queue.put((ctx, job_id))
+                return
+        _fail_unstarted_job(ctx=ctx, job_id=job_id)
+
+    def _ensure_started_locked(self) -> None:
+        if self._threads:
+            return
+        for i in range(self._workers):
+            t = threading.Thread(target=self._worker, name=f"ff-job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                ctx, job_id = item
+                try:
+                    _run_job(ctx=ctx, job_id=job_id)
+                except Exception:
+                    # _run_job records handler failures itself; this guards the worker.
+                    logger.exception("Job runner failed", extra={"job_id": job_id})
+        finally:
+            close_thread_connections()
+
+    def stop(self) -> None:
+        """Let workers exit after their current job.
+
+        Jobs still waiting in the queue, and any submitted afterwards, are marked
+        failed (code `shutdown`) rather than left `queued`, since nothing resubmits
+        them on the next start. A stopped runner does not start again.
+        """
+
+        with self._lock:
+            self._stopped = True
+            threads, self._threads = self._threads, []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                _fail_unstarted_job(ctx=item[0], job_id=item[1])
+        for _ in threads:
+            self._queue.put(None)
+
+
+def _fail_unstarted_job(*, ctx: JobContext, job_id: str) -> None:
+    try:
+        mark_job_failed(
+            ctx.db_path,
+            job_id=job_id,
+            error={"code": "shutdown", "message": "Core stopped before the job started"},
+        )
+    except Exception:
+        logger.exception("Failed to mark queued job as failed", extra={"job_id": job_id})
 
 
 def _run_job(*, ctx: JobContext, job_id: str) -> None:
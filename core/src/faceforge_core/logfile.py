@@ -0,0 +1,82 @@
+"""Core's rotating log file, written off the request path.
+
+Loggers only enqueue records (QueueHandler); a QueueListener thread formats them
+and does the file writes and rollover checks, so a handler on the event loop or
+in the threadpool never blocks on disk I/O.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class _RotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler without the per-record filesystem probes.
+
+    The stdlib checks os.path.exists() and isfile() on every emit so it never rolls
+    over a non-regular file (bpo-45401). Here that check only runs once a rollover
+    is actually due.
+    """
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
+        pos = self.stream.tell()
+        if not pos:
+            return False
+        msg = f"{self.format(record)}\n"
+        if pos + len(msg) < self.maxBytes:
+            return False
+        return os.path.isfile(self.baseFilename)
+
+
+class _CoreLogQueueHandler(QueueHandler):
+    """Marker type so a second app in the same process does not attach twice."""
+
+
+@dataclass(frozen=True, slots=True)
+class FileLogging:
+    handler: QueueHandler
+    listener: QueueListener
+
+    def stop(self) -> None:
+        logging.getLogger().removeHandler(self.handler)
+        # Drains queued records before returning.
+        self.listener.stop()
+        for h in self.listener.handlers:
+            h.close()
+
+
+def start_file_logging(log_path: Path, *, max_bytes: int, backup_count: int) -> FileLogging | None:
+    """Attach the queued file handler to the root logger.
+
+    Returns None when another running app in this process already owns it.
+    """
+
+    root = logging.getLogger()
+    if any(isinstance(h, _CoreLogQueueHandler) for h in root.handlers):
+        return None
+
+    file_handler = _RotatingFileHandler(
+        log_path,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    q: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = _CoreLogQueueHandler(q)
+    listener = QueueListener(q, file_handler, respect_handler_level=True)
+    listener.start()
+    root.addHandler(handler)
+    return FileLogging(handler=handler, listener=listener)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import functools
 import json
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from jsonschema import Draft202012Validator
 from pydantic import BaseModel, Field
 
 
@@ -60,3 +63,69 @@ def discover_plugins(*, plugins_dir: Path) -> list[DiscoveredPlugin]:
 
     out.sort(key=lambda p: p.manifest.id.casefold())
     return out
+
+
+@dataclass(frozen=True)
+class PluginIndex:
+    plugins: tuple[DiscoveredPlugin, ...]
+    by_id: dict[str, DiscoveredPlugin]
+
+
+_index_lock = threading.Lock()
+_index_cache: dict[Path, tuple[tuple[Any, ...], PluginIndex]] = {}
+
+
+def _manifest_signature(plugins_dir: Path) -> tuple[Any, ...]:
+    # Directory mtime catches added/removed plugin folders; per-manifest
+    # (mtime, size) catches edits inside an existing folder.
+    try:
+        dir_mtime = plugins_dir.stat().st_mtime_ns
+    except OSError:
+        return ()
+
+    manifests: list[tuple[str, int, int]] = []
+    for plugin_json in plugins_dir.glob("*/plugin.json"):
+        try:
+            st = plugin_json.stat()
+        except OSError:
+            continue
+        manifests.append((str(plugin_json), st.st_mtime_ns, st.st_size))
+    manifests.sort()
+    return (dir_mtime, *manifests)
+
+
+def discover_plugins_cached(*, plugins_dir: Path) -> PluginIndex:
+    """discover_plugins(), reparsing manifests only when they change on disk.
+
+    Each call still stats the plugin manifests, but skips reading, JSON parsing and
+    manifest validation when nothing has changed since the previous call.
+    """
+
+    sig = _manifest_signature(plugins_dir)
+    with _index_lock:
+        cached = _index_cache.get(plugins_dir)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+
+    plugins = tuple(discover_plugins(plugins_dir=plugins_dir))
+    index = PluginIndex(plugins=plugins, by_id={p.manifest.id: p for p in plugins})
+    with _index_lock:
+        _index_cache[plugins_dir] = (sig, index)
+    return index
+
+
+@functools.lru_cache(maxsize=256)
+def _validator_for_schema_json(schema_json: str) -> Draft202012Validator:
+    return Draft202012Validator(json.loads(schema_json))
+
+
+def config_schema_validator(schema: dict[str, Any]) -> Draft202012Validator:
+    """Return a (shared) validator for a plugin config_schema.
+
+    Keyed on the schema's canonical JSON, so each distinct schema is compiled once
+    and an edited manifest gets a fresh validator.
+    """
+
+    # Stdlib json like the manifest parser: orjson would refuse integers beyond 64 bits
+    # (e.g. a "maximum" of 2**70) and round-trip them as floats.
+    return _validator_for_schema_json(json.dumps(schema, sort_keys=True))
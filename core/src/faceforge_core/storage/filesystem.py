@@ -6,6 +6,30 @@ from dataclasses import dataclass
 from pathlib import Path
 
 
+def _copy_file_contents(src: Path, dst: Path) -> None:
+    """Copy file bytes, keeping them in kernel space where the platform allows.
+
+    Prefers copy_file_range (Linux); shutil.copyfile falls back to sendfile/fcopyfile.
+    """
+
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with src.open("rb") as fsrc, dst.open("wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+
+    shutil.copyfile(src, dst)
+
+
 @dataclass(frozen=True)
 class StorageLocation:
     provider: str
@@ -61,9 +85,8 @@ class FilesystemStorageProvider:
         try:
             temp_path.replace(dst)
         except OSError:
-            # Cross-device moves are unlikely here, but fall back to copy+remove.
-            with temp_path.open("rb") as src, dst.open("wb") as out:
-                shutil.copyfileobj(src, out, length=1024 * 1024)
+            # Cross-device moves (EXDEV) fall back to an in-kernel copy + remove.
+            _copy_file_contents(temp_path, dst)
             try:
                 temp_path.unlink(missing_ok=True)
             except OSError:
@@ -96,8 +119,7 @@ class FilesystemStorageProvider:
         except OSError:
             pass
 
-        with source_path.open("rb") as src, dst.open("wb") as out:
-            shutil.copyfileobj(src, out, length=1024 * 1024)
+        _copy_file_contents(source_path, dst)
 
         try:
             os.chmod(dst, 0o644)
@@ -210,7 +210,7 @@ class StorageManager:
             path = self._fs.resolve_path(storage_key)
             size = path.stat().st_size
 
-            def _iter_file_range(chunk_size: int = 1024 * 1024):
+            def _iter_file_range(chunk_size: int = 4 * 1024 * 1024):
                 with path.open("rb") as f:
                     f.seek(start)
                     remaining = end - start + 1
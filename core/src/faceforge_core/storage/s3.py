@@ -109,7 +109,7 @@ class S3StorageProvider:
         location: S3ObjectLocation,
         start: int,
         end: int,
-        chunk_size: int = 1024 * 1024,
+        chunk_size: int = 4 * 1024 * 1024,
     ) -> Iterator[bytes]:
         client = self._get_client()
         range_header = f"bytes={start}-{end}"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hmac
 import json
 import sqlite3
 from dataclasses import dataclass
@@ -9,10 +10,9 @@ from typing import Any
 from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from jsonschema import Draft202012Validator
 from starlette.responses import Response
 
-from faceforge_core.auth import TOKEN_COOKIE
+from faceforge_core.auth import TOKEN_COOKIE, expected_install_token
 from faceforge_core.db.assets import (
     get_asset,
     link_asset_to_entity,
@@ -29,24 +29,25 @@ from faceforge_core.db.entities import (
 )
 from faceforge_core.db.field_defs import create_field_def, get_field_def_by_key, list_field_defs
 from faceforge_core.db.jobs import (
-    append_job_log,
+    cancel_job,
     get_job,
     list_job_logs,
     list_jobs,
-    request_job_cancel,
 )
 from faceforge_core.db.plugins import (
     list_plugin_registry,
     set_plugin_config,
     set_plugin_enabled,
     upsert_plugin_discovery,
+    upsert_plugins_discovery,
 )
 from faceforge_core.db.relationships import (
     create_relationship,
     list_relationships_for_entity,
     soft_delete_relationship,
 )
-from faceforge_core.plugins.discovery import discover_plugins
+from faceforge_core.home import FaceForgePaths
+from faceforge_core.plugins.discovery import config_schema_validator, discover_plugins_cached
 
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = BASE_DIR / "templates"
@@ -83,16 +84,22 @@ def _parse_json(raw: str | None, *, default: Any) -> Any:
     return json.loads(text)
 
 
-def _get_db_path(request: Request) -> Any:
-    db_path = getattr(request.app.state, "db_path", None)
-    if db_path is None:
-        raise HTTPException(status_code=500, detail="DB not initialized")
-    return db_path
+def _get_db_path(request: Request) -> Path:
+    try:
+        return request.app.state.ctx.db_path
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="DB not initialized") from e
+
+
+def _get_paths(request: Request) -> FaceForgePaths:
+    try:
+        return request.app.state.ctx.paths
+    except AttributeError as e:
+        raise HTTPException(status_code=500, detail="Server not initialized") from e
 
 
 def _get_expected_token(request: Request) -> str:
-    expected = getattr(getattr(request.app.state, "faceforge_config", None), "auth", None)
-    token = getattr(expected, "install_token", None)
+    token = expected_install_token(request)
     if not token:
         raise HTTPException(status_code=500, detail="Server auth token not initialized")
     return str(token)
@@ -125,7 +132,7 @@ async def ui_login_post(request: Request, token: str = Form(...)) -> Response:
             status_code=400,
         )
 
-    if token != expected:
+    if not hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8")):
         return templates.TemplateResponse(
             request,
             "login.html",
@@ -742,9 +749,8 @@ async def ui_job_detail(request: Request, job_id: str) -> HTMLResponse:
 async def ui_job_cancel(request: Request, job_id: str) -> RedirectResponse:
     db_path = _get_db_path(request)
 
-    ok_cancel = request_job_cancel(db_path, job_id=job_id)
+    ok_cancel, _job = cancel_job(db_path, job_id=job_id)
     if ok_cancel:
-        append_job_log(db_path, job_id=job_id, level="info", message="Cancel requested")
         return RedirectResponse(
             url=f"/ui/jobs/{job_id}?msg=Cancel+requested&kind=ok", status_code=302
         )
@@ -820,7 +826,7 @@ def _schema_fields(schema: dict[str, Any], config: dict[str, Any]) -> list[Plugi
 
 
 def _validate_plugin_config(schema: dict[str, Any], config: Any) -> list[str]:
-    v = Draft202012Validator(schema)
+    v = config_schema_validator(schema)
     errors: list[str] = []
     for e in v.iter_errors(config):
         p = ".".join(str(x) for x in e.path)
@@ -832,15 +838,14 @@ def _validate_plugin_config(schema: dict[str, Any], config: Any) -> list[str]:
 async def ui_plugins(request: Request) -> HTMLResponse:
     db_path = _get_db_path(request)
 
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
+    paths = _get_paths(request)
 
-    discovered = discover_plugins(plugins_dir=paths.plugins_dir)
-    discovered_by_id = {p.manifest.id: p for p in discovered}
+    index = discover_plugins_cached(plugins_dir=paths.plugins_dir)
+    discovered_by_id = index.by_id
 
-    for p in discovered:
-        upsert_plugin_discovery(db_path, plugin_id=p.manifest.id, version=p.manifest.version)
+    upsert_plugins_discovery(
+        db_path, items=[(p.manifest.id, p.manifest.version) for p in index.plugins]
+    )
 
     rows = list_plugin_registry(db_path, include_deleted=False)
 
@@ -883,11 +888,9 @@ async def ui_plugins(request: Request) -> HTMLResponse:
 async def ui_plugins_enable(request: Request, plugin_id: str) -> RedirectResponse:
     db_path = _get_db_path(request)
 
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
+    paths = _get_paths(request)
 
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         return RedirectResponse(
             url="/ui/plugins?msg=Plugin+not+discovered&kind=bad", status_code=302
@@ -907,11 +910,9 @@ async def ui_plugins_enable(request: Request, plugin_id: str) -> RedirectRespons
 async def ui_plugins_disable(request: Request, plugin_id: str) -> RedirectResponse:
     db_path = _get_db_path(request)
 
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
+    paths = _get_paths(request)
 
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         return RedirectResponse(
             url="/ui/plugins?msg=Plugin+not+discovered&kind=bad", status_code=302
@@ -931,11 +932,9 @@ async def ui_plugins_disable(request: Request, plugin_id: str) -> RedirectRespon
 async def ui_plugins_config_save(request: Request, plugin_id: str) -> RedirectResponse:
     db_path = _get_db_path(request)
 
-    paths = getattr(request.app.state, "faceforge_paths", None)
-    if paths is None:
-        raise HTTPException(status_code=500, detail="Server not initialized")
+    paths = _get_paths(request)
 
-    discovered = {p.manifest.id: p for p in discover_plugins(plugins_dir=paths.plugins_dir)}
+    discovered = discover_plugins_cached(plugins_dir=paths.plugins_dir).by_id
     if plugin_id not in discovered:
         return RedirectResponse(
             url="/ui/plugins?msg=Plugin+not+discovered&kind=bad", status_code=302
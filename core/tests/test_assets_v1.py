@@ -6,6 +6,7 @@ from pathlib import Path
 
 from fastapi.testclient import TestClient
 
+from faceforge_core.api.v1 import assets as assets_api
 from faceforge_core.app import create_app
 
 
@@ -39,6 +40,8 @@ def test_assets_upload_metadata_download_range_and_linking(tmp_path: Path, monke
 
         r2 = client.get(f"/v1/assets/{asset_id}", headers=headers)
         assert r2.status_code == 200
+        assert r2.json()["ok"] is True
+        assert r2.json()["error"] is None
         meta = r2.json()["data"]
         assert meta["byte_size"] == len(content)
         assert meta["content_hash"] == _sha256_hex(content)
@@ -49,6 +52,9 @@ def test_assets_upload_metadata_download_range_and_linking(tmp_path: Path, monke
         d = client.get(f"/v1/assets/{asset_id}/download", headers=headers)
         assert d.status_code == 200
         assert d.content == content
+        assert d.headers.get("accept-ranges") == "bytes"
+        assert d.headers.get("content-length") == str(len(content))
+        assert 'filename="hello.txt"' in d.headers.get("content-disposition", "")
 
         d2 = client.get(
             f"/v1/assets/{asset_id}/download",
@@ -88,6 +94,29 @@ def test_assets_upload_metadata_download_range_and_linking(tmp_path: Path, monke
         assert unlink.json()["data"]["linked"] is True
 
 
+def test_asset_download_is_not_gzipped(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+
+        content = b"compressible text line\n" * 1000
+        r = client.post(
+            "/v1/assets/upload",
+            headers=headers,
+            files={"file": ("notes.txt", content, "text/plain")},
+        )
+        assert r.status_code == 200
+        asset_id = r.json()["data"]["asset_id"]
+
+        d = client.get(f"/v1/assets/{asset_id}/download", headers=headers)
+        assert d.status_code == 200
+        assert "content-encoding" not in d.headers
+        assert d.headers.get("content-length") == str(len(content))
+        assert d.content == content
+
+
 def test_assets_upload_s3_routing_falls_back_to_filesystem_when_unhealthy(
     tmp_path: Path, monkeypatch
 ) -> None:
@@ -126,3 +155,336 @@ def test_assets_upload_s3_routing_falls_back_to_filesystem_when_unhealthy(
         body = r.json()
         assert body["ok"] is True
         assert body["data"]["storage_provider"] == "fs"
+
+
+def test_assets_upload_rejects_invalid_sidecar_json(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for sidecar in (b"{not json", b'"\xff\xfe"'):
+            r = client.post(
+                "/v1/assets/upload",
+                headers=headers,
+                files={
+                    "file": ("hello.txt", b"hello sidecar", "text/plain"),
+                    "meta": ("_meta.json", sidecar, "application/json"),
+                },
+            )
+            assert r.status_code == 422
+            assert r.json()["error"]["code"] == "validation_error"
+
+
+def test_sidecar_json_keeps_big_integers_and_accepts_nan(tmp_path: Path, monkeypatch) -> None:
+    import math
+
+    from faceforge_core.db.assets import (
+        append_asset_metadata_entries,
+        append_asset_metadata_entry,
+        get_asset,
+    )
+    from faceforge_core.jobs.bulk_import import _read_sidecar_json
+
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+    big = 2**70
+    sidecar = f'{{"serial": {big}, "gain": NaN}}'.encode()
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        r = client.post(
+            "/v1/assets/upload",
+            headers=headers,
+            files={
+                "file": ("hello.txt", b"hello big sidecar", "text/plain"),
+                "meta": ("_meta.json", sidecar, "application/json"),
+            },
+        )
+        assert r.status_code == 200
+        asset_id = r.json()["data"]["asset_id"]
+        entries = r.json()["data"]["meta"]["metadata"]
+        data = next(x["Data"] for x in entries if x["Source"] == "UserSidecar")
+        assert data["serial"] == big
+
+        # Stored as the stdlib writes it: NaN stays NaN rather than becoming null.
+        db_path = client.app.state.ctx.db_path
+        stored = get_asset(db_path, asset_id=asset_id)
+        assert stored is not None
+        data = stored.meta["metadata"][0]["Data"]
+        assert data["serial"] == big and math.isnan(data["gain"])
+
+        # Appending such an entry works too (JSON1's json() rejects NaN).
+        extra = {"Source": "ExifTool", "Data": {"gain": float("inf")}}
+        appended = append_asset_metadata_entry(db_path, asset_id=asset_id, entry=extra)
+        assert appended is not None
+        assert appended.meta["metadata"][-1]["Data"]["gain"] == float("inf")
+        assert append_asset_metadata_entries(db_path, entries=[(asset_id, extra)]) == []
+        stored = get_asset(db_path, asset_id=asset_id)
+        assert stored is not None and len(stored.meta["metadata"]) == 3
+
+    path = tmp_path / "x_meta.json"
+    path.write_bytes(sidecar)
+    parsed = _read_sidecar_json(path)
+    assert parsed["serial"] == big
+    assert parsed["gain"] != parsed["gain"]
+
+
+def test_assets_upload_rejects_oversized_sidecar(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+    monkeypatch.setattr(assets_api, "MAX_SIDECAR_BYTES", 8)
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        r = client.post(
+            "/v1/assets/upload",
+            headers=headers,
+            files={
+                "file": ("hello.txt", b"hello big sidecar", "text/plain"),
+                "meta": ("_meta.json", b'{"foo": "0123456789"}', "application/json"),
+            },
+        )
+        assert r.status_code == 413
+
+
+def test_assets_by_hash_preflight_and_declared_hash_short_circuit(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        content = b"dedupe me"
+        content_hash = _sha256_hex(content)
+
+        missing = client.get(f"/v1/assets/by-hash/{content_hash}", headers=headers)
+        assert missing.status_code == 404
+
+        bad = client.get("/v1/assets/by-hash/not-a-hash", headers=headers)
+        assert bad.status_code == 422
+
+        r = client.post(
+            "/v1/assets/upload",
+            headers=headers,
+            files={"file": ("dedupe.txt", content, "text/plain")},
+        )
+        assert r.status_code == 200
+
+        found = client.get(f"/v1/assets/by-hash/{content_hash.upper()}", headers=headers)
+        assert found.status_code == 200
+        assert found.json()["data"]["asset_id"] == content_hash
+
+        # A declared hash for a known asset returns it without storing the new bytes.
+        again = client.post(
+            "/v1/assets/upload",
+            headers={**headers, "X-Content-Sha256": content_hash},
+            files={"file": ("other-name.txt", content, "text/plain")},
+        )
+        assert again.status_code == 200
+        assert again.json()["data"]["asset_id"] == content_hash
+        assert again.json()["data"]["filename"] == "dedupe.txt"
+        assert not list((tmp_path / "tmp").glob("upload-*.tmp"))
+
+        # Downloads carry the content hash as ETag; echoing it back in
+        # If-None-Match makes a re-upload fail fast.
+        dl = client.get(f"/v1/assets/{content_hash}/download", headers=headers)
+        etag = dl.headers["etag"]
+        assert etag == f'"{content_hash}"'
+        cond = client.post(
+            "/v1/assets/upload",
+            headers={**headers, "If-None-Match": etag},
+            files={"file": ("dedupe.txt", content, "text/plain")},
+        )
+        assert cond.status_code == 412
+
+
+def test_parse_range_header_forms() -> None:
+    parse = assets_api._parse_range_header
+
+    assert parse("bytes=0-0", size=100) == (0, 0)
+    assert parse("bytes=10-", size=100) == (10, 99)
+    assert parse("bytes=-5", size=100) == (95, 99)
+    assert parse("bytes=-500", size=100) == (0, 99)
+    assert parse("bytes=0-500", size=100) == (0, 99)
+    assert parse(" Bytes= 3 - 4 ", size=100) == (3, 4)
+
+    for bad in ("bytes=-", "bytes=-0", "bytes=5-2", "bytes=100-", "bytes=1-2,3-4", "items=0-1"):
+        assert parse(bad, size=100) is None
+
+
+def test_hash_and_write_copies_past_an_inaccurate_size_hint(tmp_path: Path) -> None:
+    import io
+
+    data = bytes(range(256)) * 40
+    for hint in (None, 0, 100, len(data)):
+        h = hashlib.sha256()
+        out = io.BytesIO()
+        n = assets_api._hash_and_write(io.BytesIO(data), out, h, chunk_size=4096, size_hint=hint)
+        assert n == len(data)
+        assert out.getvalue() == data
+        assert h.hexdigest() == _sha256_hex(data)
+
+
+def test_metadata_batch_writer_flushes_pending_entries(tmp_path: Path) -> None:
+    from faceforge_core.db.assets import create_asset, get_asset
+    from faceforge_core.db.migrate import apply_migrations
+    from faceforge_core.ingest.metadata_batch import MetadataBatchWriter
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+    asset_id = hashlib.sha256(b"batch").hexdigest()
+    create_asset(
+        db_path,
+        asset_id=asset_id,
+        kind="file",
+        filename="a.jpg",
+        content_hash=asset_id,
+        byte_size=5,
+        mime_type=None,
+        storage_provider="fs",
+        storage_key="a",
+        meta={"metadata": []},
+    )
+
+    writer = MetadataBatchWriter(db_path, batch_size=8, flush_interval_s=60)
+    writer.start()
+    writer.submit(asset_id, {"Source": "ExifTool", "Data": {"n": 1}})
+    writer.submit(asset_id, {"Source": "ExifTool", "Data": {"n": 2}})
+    writer.submit("0" * 64, {"Source": "ExifTool", "Data": {}})
+    writer.stop()
+
+    row = get_asset(db_path, asset_id=asset_id)
+    assert row is not None
+    assert [x["Data"]["n"] for x in row.meta["metadata"]] == [1, 2]
+
+    # An entry that cannot be written only loses itself, not the rest of its batch.
+    writer = MetadataBatchWriter(db_path, batch_size=8, flush_interval_s=60)
+    writer.submit(asset_id, {"Source": "ExifTool", "Data": {"n": 3}})
+    writer.submit(asset_id, {"Source": "ExifTool", "Data": {"n": object()}})
+    writer.submit(asset_id, {"Source": "ExifTool", "Data": {"n": 4}})
+    writer.flush()
+
+    row = get_asset(db_path, asset_id=asset_id)
+    assert row is not None
+    assert [x["Data"]["n"] for x in row.meta["metadata"]] == [1, 2, 3, 4]
+
+
+def test_file_range_response_uses_zerocopysend_when_offered(tmp_path: Path) -> None:
+    import asyncio
+
+    p = tmp_path / "blob.bin"
+    p.write_bytes(b"0123456789")
+
+    async def _run(extensions: dict) -> list[dict]:
+        sent: list[dict] = []
+
+        async def receive() -> dict:
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.zerocopysend":
+                f = message["file"]
+                f.seek(message["offset"])
+                message = {**message, "body": f.read(message["count"])}
+            sent.append(message)
+
+        resp = assets_api.FileRangeResponse(p, start=2, end=5, status_code=206)
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "extensions": extensions}
+        await resp(scope, receive, send)
+        return sent
+
+    zero = asyncio.run(_run({"http.response.zerocopysend": {}}))
+    assert [m["type"] for m in zero] == ["http.response.start", "http.response.zerocopysend"]
+    assert zero[1]["body"] == b"2345"
+
+    streamed = asyncio.run(_run({}))
+    body = b"".join(m.get("body", b"") for m in streamed if m["type"] == "http.response.body")
+    assert body == b"2345"
+
+
+def test_assets_upload_duplicate_detected_by_prefix_without_spooling(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # Larger than the prefix window so the confirm pass hashes a tail too.
+        content = b"x" * (1024 * 1024) + b"tail"
+        r = client.post("/v1/assets/upload", headers=headers, files={"file": ("a.bin", content)})
+        assert r.status_code == 200
+        asset_id = r.json()["data"]["asset_id"]
+
+        def _no_spool(*args, **kwargs):
+            raise AssertionError("duplicate upload should not be spooled")
+
+        spool = assets_api._hash_and_write
+        monkeypatch.setattr(assets_api, "_hash_and_write", _no_spool)
+        r2 = client.post("/v1/assets/upload", headers=headers, files={"file": ("b.bin", content)})
+        assert r2.status_code == 200
+        assert r2.json()["data"]["asset_id"] == asset_id
+
+        # Same prefix and size but different tail: falls through to a normal upload,
+        # reusing the digest from the confirm pass instead of hashing again.
+        hashers: list[object] = []
+
+        def _spool(src, out, h, **kwargs):
+            hashers.append(h)
+            return spool(src, out, h, **kwargs)
+
+        monkeypatch.setattr(assets_api, "_hash_and_write", _spool)
+        other = content[:-4] + b"TAIL"
+        r3 = client.post("/v1/assets/upload", headers=headers, files={"file": ("c.bin", other)})
+        assert r3.status_code == 200
+        assert r3.json()["data"]["asset_id"] == _sha256_hex(other)
+        assert hashers == [None]
+
+
+def test_append_metadata_entry_normalizes_meta_in_sql(tmp_path: Path) -> None:
+    from faceforge_core.db.assets import append_asset_metadata_entry, create_asset
+    from faceforge_core.db.connection import connect
+    from faceforge_core.db.migrate import apply_migrations
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+    stored = {
+        "keep": '{"metadata": [{"n": 0}], "k": "é"}',
+        "bad": "not json",
+        "list": "[1, 2]",
+        "obj": '{"metadata": {"n": 0}}',
+    }
+    for asset_id, raw in stored.items():
+        create_asset(
+            db_path,
+            asset_id=asset_id,
+            kind="file",
+            filename=None,
+            content_hash=asset_id,
+            byte_size=1,
+            mime_type=None,
+            storage_provider="fs",
+            storage_key=asset_id,
+            meta={},
+        )
+        with connect(db_path) as conn:
+            conn.execute("UPDATE assets SET meta_json = ? WHERE asset_id = ?;", (raw, asset_id))
+
+    entry = {"Source": "UserSidecar", "Data": {"ü": [1, None]}}
+    metas = {
+        asset_id: append_asset_metadata_entry(db_path, asset_id=asset_id, entry=entry)
+        for asset_id in stored
+    }
+    assert metas["keep"] is not None
+    assert metas["keep"].meta == {"metadata": [{"n": 0}, entry], "k": "é"}
+    for asset_id in ("bad", "list", "obj"):
+        row = metas[asset_id]
+        assert row is not None and row.meta == {"metadata": [entry]}
+    assert append_asset_metadata_entry(db_path, asset_id="missing", entry=entry) is None
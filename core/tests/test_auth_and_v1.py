@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from fastapi.testclient import TestClient
 
+from faceforge_core.api.models import fail_json, ok_json
 from faceforge_core.app import create_app
 
 
@@ -51,3 +53,57 @@ def test_docs_and_openapi_are_public(tmp_path: Path, monkeypatch) -> None:
 
         op2 = spec["paths"]["/v1/system/info"]["get"]
         assert "security" in op2
+
+
+def test_token_middleware_accepts_header_cookie_and_rejects_wrong_token(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+
+        assert client.get("/v1/ping", headers={"X-FaceForge-Token": token}).status_code == 200
+        assert (
+            client.get("/v1/ping", headers={"Cookie": f"a=b; ff_token={token}"}).status_code == 200
+        )
+
+        bad = client.get("/v1/ping", headers={"Authorization": "Bearer nope"})
+        assert bad.status_code == 401
+        assert bad.headers["content-type"] == "application/json"
+        assert bad.json()["error"] == {
+            "code": "unauthorized",
+            "message": "Invalid token",
+            "details": None,
+        }
+
+
+def test_validation_errors_serialize_non_json_details(tmp_path: Path, monkeypatch) -> None:
+    import orjson
+
+    from faceforge_core.api.models import fail_json
+
+    resp = fail_json(422, code="validation_error", message="m", details=[{"ctx": ValueError("x")}])
+    assert orjson.loads(resp.body)["error"]["details"] == [{"ctx": "x"}]
+
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+    with TestClient(create_app()) as client:
+        token = client.app.state.faceforge_config.auth.install_token
+        r = client.post(
+            "/v1/entities",
+            headers={"X-FaceForge-Token": token, "Content-Type": "application/json"},
+            content=b"{not json",
+        )
+        assert r.status_code == 422
+        body = r.json()
+        assert body["ok"] is False
+        assert body["error"]["code"] == "validation_error"
+        assert body["error"]["details"]
+
+
+def test_json_envelopes_fall_back_for_integers_beyond_64_bits() -> None:
+    big = 2**70
+    assert json.loads(ok_json({"n": big}).body) == {"ok": True, "data": {"n": big}, "error": None}
+
+    failed = json.loads(fail_json(422, code="bad", message="Bad", details=[big, b"x"]).body)
+    assert failed["error"]["details"] == [big, "x"]
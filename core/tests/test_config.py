@@ -51,3 +51,17 @@ def test_resolve_configured_paths_creates_overrides(tmp_path: Path) -> None:
 
     # Non-configurable dirs remain under home.
     assert resolved.config_dir == (tmp_path / "config").resolve()
+
+
+def test_write_core_config_roundtrips_as_indented_json(tmp_path: Path) -> None:
+    from faceforge_core.config import write_core_config
+
+    paths = ensure_faceforge_layout(tmp_path)
+    cfg = CoreConfig.model_validate({"paths": {"db_dir": "données"}})
+
+    write_core_config(paths, cfg)
+
+    text = paths.core_config_path.read_text(encoding="utf-8")
+    assert text.endswith("}\n")
+    assert json.loads(text) == cfg.model_dump(mode="json", exclude_none=True)
+    assert load_core_config(paths) == cfg
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from faceforge_core.db.ids import asset_id_from_content_hash, new_entity_id, sha256_hex
+from faceforge_core.db.ids import (
+    asset_id_from_content_hash,
+    new_entity_id,
+    sha256_backend,
+    sha256_hex,
+)
 
 
 def test_sha256_hex_known_value() -> None:
@@ -16,3 +21,8 @@ def test_new_entity_id_is_sha256_hex() -> None:
 def test_asset_id_from_content_hash_validation() -> None:
     h = sha256_hex(b"hello")
     assert asset_id_from_content_hash(h) == h
+
+
+def test_sha256_backend_is_reported() -> None:
+    backend = sha256_backend()
+    assert backend == "builtin" or "SSL" in backend
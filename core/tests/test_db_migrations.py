@@ -3,6 +3,8 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
+import pytest
+
 from faceforge_core.config import load_core_config, resolve_configured_paths
 from faceforge_core.db import resolve_db_path
 from faceforge_core.db.migrate import apply_migrations
@@ -49,3 +51,49 @@ def test_migrations_blank_to_latest(tmp_path: Path) -> None:
     assert "input_json" in jobs_cols
     assert "result_json" in jobs_cols
     assert "cancel_requested_at" in jobs_cols
+
+
+def test_migrations_enable_wal_and_connections_are_reused(tmp_path: Path) -> None:
+    from faceforge_core.db.connection import close_thread_connections, connect
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+
+    first = connect(db_path)
+    assert connect(db_path) is first
+    assert first.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+
+    close_thread_connections()
+    assert connect(db_path) is not first
+    close_thread_connections()
+
+
+def test_close_all_connections_closes_other_threads_connections(tmp_path: Path) -> None:
+    import threading
+
+    from faceforge_core.db.connection import close_all_connections, connect
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+
+    mine = connect(db_path)
+    opened: list[sqlite3.Connection] = []
+    worker = threading.Thread(target=lambda: opened.append(connect(db_path)))
+    worker.start()
+    worker.join()
+
+    close_all_connections(db_path)
+    for conn in (mine, opened[0]):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1;")
+
+    # WAL checkpointed and released once the last connection is gone.
+    assert not (tmp_path / "core.sqlite3-wal").exists()
+
+    fresh = connect(db_path)
+    assert fresh is not mine
+    assert fresh.execute("SELECT 1;").fetchone()[0] == 1
+    close_all_connections(db_path)
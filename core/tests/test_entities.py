@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+import time
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -43,7 +45,7 @@ def test_entities_crud_and_paging(tmp_path: Path, monkeypatch) -> None:
             created_ids.append(body["data"]["entity_id"])
 
         # Page through them
-        r1 = client.get("/v1/entities?limit=25&offset=0", headers=headers)
+        r1 = client.get("/v1/entities?limit=25&offset=0&with_total=1", headers=headers)
         assert r1.status_code == 200
         body1 = r1.json()["data"]
         assert body1["total"] == 100
@@ -51,18 +53,40 @@ def test_entities_crud_and_paging(tmp_path: Path, monkeypatch) -> None:
         assert body1["offset"] == 0
         assert len(body1["items"]) == 25
 
-        r2 = client.get("/v1/entities?limit=50&offset=75", headers=headers)
+        r2 = client.get("/v1/entities?limit=50&offset=75&with_total=1", headers=headers)
         assert r2.status_code == 200
         body2 = r2.json()["data"]
         assert body2["total"] == 100
         assert len(body2["items"]) == 25
 
+        # Keyset pages cover the same rows, in the same order, without a total.
+        all_ids = [
+            e["entity_id"]
+            for e in client.get("/v1/entities?limit=200", headers=headers).json()["data"]["items"]
+        ]
+        seen: list[str] = []
+        url = "/v1/entities?limit=30&with_total=1"
+        while True:
+            page = client.get(url, headers=headers).json()["data"]
+            seen.extend(e["entity_id"] for e in page["items"])
+            assert page["total"] == (100 if "cursor" not in url else None)
+            if page["next_cursor"] is None:
+                break
+            url = f"/v1/entities?limit=30&with_total=1&cursor={page['next_cursor']}"
+        assert seen == all_ids
+
+        bad = client.get("/v1/entities?cursor=not-a-cursor", headers=headers)
+        assert bad.status_code == 422
+
         # Minimal filter: tag
-        r3 = client.get("/v1/entities?tag=even", headers=headers)
+        r3 = client.get("/v1/entities?tag=even&with_total=1", headers=headers)
         assert r3.status_code == 200
         body3 = r3.json()["data"]
         assert body3["total"] == 50
 
+        # Without with_total the COUNT is skipped.
+        assert client.get("/v1/entities?tag=even", headers=headers).json()["data"]["total"] is None
+
 
 def test_entity_patch_only_updates_touched_fields(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
@@ -102,8 +126,9 @@ def test_entity_patch_only_updates_touched_fields(tmp_path: Path, monkeypatch) -
 
         # Timestamps behave sensibly: created_at is stable
         assert patched_entity["created_at"] == created_at
-        assert isinstance(patched_entity["updated_at"], str)
-        assert patched_entity["updated_at"]
+        # updated_at is stamped by SQLite in the same format as the column defaults.
+        assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z", patched_entity["updated_at"])
+        assert patched_entity["updated_at"] >= created_at
 
 
 def test_entity_delete_soft_hides_from_get_and_list(tmp_path: Path, monkeypatch) -> None:
@@ -130,3 +155,131 @@ def test_entity_delete_soft_hides_from_get_and_list(tmp_path: Path, monkeypatch)
         assert listed.status_code == 200
         items = listed.json()["data"]["items"]
         assert all(e["entity_id"] != entity_id for e in items)
+
+
+def test_entity_get_honors_if_none_match(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        headers = _auth_headers(client)
+
+        created = client.post("/v1/entities", headers=headers, json={"display_name": "Grace"})
+        entity_id = created.json()["data"]["entity_id"]
+
+        first = client.get(f"/v1/entities/{entity_id}", headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        cached = client.get(f"/v1/entities/{entity_id}", headers={**headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        time.sleep(0.002)
+        client.patch(f"/v1/entities/{entity_id}", headers=headers, json={"display_name": "Hopper"})
+        changed = client.get(
+            f"/v1/entities/{entity_id}", headers={**headers, "If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["data"]["display_name"] == "Hopper"
+
+
+def test_entity_tag_filter_tracks_patches_and_combines_with_q(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        headers = _auth_headers(client)
+
+        ids = {}
+        for name, tags in [("Alan", ["Person", "math"]), ("Alonzo", ["person"]), ("Bob", [])]:
+            r = client.post(
+                "/v1/entities", headers=headers, json={"display_name": name, "tags": tags}
+            )
+            ids[name] = r.json()["data"]["entity_id"]
+
+        def names(url: str) -> set[str]:
+            r = client.get(url, headers=headers)
+            assert r.status_code == 200
+            return {e["display_name"] for e in r.json()["data"]["items"]}
+
+        assert names("/v1/entities?tag=person") == {"Alan", "Alonzo"}
+        assert names("/v1/entities?tag=person&q=Alo") == {"Alonzo"}
+        assert names("/v1/entities?tag=%25") == set()
+
+        client.patch(f"/v1/entities/{ids['Bob']}", headers=headers, json={"tags": ["person"]})
+        client.patch(f"/v1/entities/{ids['Alan']}", headers=headers, json={"tags": ["math"]})
+        assert names("/v1/entities?tag=person") == {"Alonzo", "Bob"}
+
+
+def test_large_list_responses_are_gzipped(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        headers = _auth_headers(client)
+        for i in range(20):
+            r = client.post("/v1/entities", headers=headers, json={"display_name": f"E {i}"})
+            assert r.status_code == 200
+
+        gz = {**headers, "Accept-Encoding": "gzip"}
+        r = client.get("/v1/entities", headers=gz)
+        assert r.status_code == 200
+        assert r.headers.get("content-encoding") == "gzip"
+        assert len(r.json()["data"]["items"]) == 20
+
+        r = client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers
+
+
+def test_entity_q_search_uses_index_and_tracks_updates(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        headers = _auth_headers(client)
+
+        ids = {}
+        for name, fields in [("Grace Hopper", {"lang": "COBOL"}), ("Ada", {}), ("Alan", {})]:
+            r = client.post(
+                "/v1/entities", headers=headers, json={"display_name": name, "fields": fields}
+            )
+            ids[name] = r.json()["data"]["entity_id"]
+
+        def names(q: str) -> set[str]:
+            r = client.get("/v1/entities", headers=headers, params={"q": q})
+            assert r.status_code == 200
+            return {e["display_name"] for e in r.json()["data"]["items"]}
+
+        assert names("hopp") == {"Grace Hopper"}
+        assert names("cobol") == {"Grace Hopper"}
+        # Shorter than a trigram: plain LIKE scan, same results.
+        assert names("Al") == {"Alan"}
+        assert names("a") == {"Grace Hopper", "Ada", "Alan"}
+
+        client.patch(f"/v1/entities/{ids['Ada']}", headers=headers, json={"aliases": ["Lovelace"]})
+        assert names("lovel") == {"Ada"}
+        client.delete(f"/v1/entities/{ids['Grace Hopper']}", headers=headers)
+        assert names("hopp") == set()
+
+
+def test_entity_fields_keep_integers_beyond_64_bits(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        headers = _auth_headers(client)
+
+        big = 2**70
+        created = client.post(
+            "/v1/entities",
+            headers=headers,
+            json={"display_name": "Big", "fields": {"big": big, "neg": -big}},
+        )
+        assert created.status_code == 200
+        entity_id = created.json()["data"]["entity_id"]
+        assert created.json()["data"]["fields"] == {"big": big, "neg": -big}
+
+        got = client.get(f"/v1/entities/{entity_id}", headers=headers)
+        assert got.status_code == 200
+        assert got.json()["data"]["fields"] == {"big": big, "neg": -big}
+
+        listed = client.get("/v1/entities", headers=headers)
+        assert listed.status_code == 200
+        assert listed.json()["data"]["items"][0]["fields"] == {"big": big, "neg": -big}
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from faceforge_core.ingest.exiftool import should_skip_exiftool
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from faceforge_core.ingest.exiftool import ExifToolWorker, should_skip_exiftool
 
 
 def test_should_skip_exiftool_new_text_formats() -> None:
@@ -14,3 +21,94 @@ def test_should_skip_exiftool_new_text_formats() -> None:
 
 def test_should_skip_exiftool_non_matching_file() -> None:
     assert should_skip_exiftool("image.jpg") is False
+
+
+def _fake_stay_open_exiftool(tmp_path: Path) -> Path:
+    # Minimal stand-in for `exiftool -stay_open True -@ -`. Files named hang.* never
+    # finish; badutf.* get a line of invalid UTF-8 before their JSON.
+    fake = tmp_path / "exiftool"
+    fake.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys, time\n"
+        "args = []\n"
+        "for line in sys.stdin:\n"
+        "    line = line.strip()\n"
+        "    if line == '-execute':\n"
+        "        if os.path.basename(args[-1]).startswith('hang.'):\n"
+        "            time.sleep(60)\n"
+        "        if os.path.basename(args[-1]).startswith('badutf.'):\n"
+        "            sys.stdout.flush()\n"
+        "            sys.stdout.buffer.write(b'\\xff\\xfe\\n')\n"
+        "            sys.stdout.buffer.flush()\n"
+        "        print(json.dumps([{'File:Path': args[-1], 'Pid': os.getpid()}]))\n"
+        "        print('{ready}', flush=True)\n"
+        "        args = []\n"
+        "    elif args[-1:] == ['-stay_open'] and line == 'False':\n"
+        "        break\n"
+        "    else:\n"
+        "        args.append(line)\n",
+        encoding="utf-8",
+    )
+    os.chmod(fake, 0o755)
+    return fake
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a shebang script as a fake exiftool")
+def test_exiftool_worker_reuses_one_process(tmp_path: Path) -> None:
+    fake = _fake_stay_open_exiftool(tmp_path)
+    asset = tmp_path / "image.jpg"
+    asset.write_bytes(b"x")
+
+    worker = ExifToolWorker(fake)
+    try:
+        first = worker.run(asset_path=asset)
+        second = worker.run(asset_path=asset)
+    finally:
+        worker.close()
+
+    assert first["Source"] == "ExifTool"
+    assert first["Data"][0]["File:Path"] == str(asset)
+    assert first["Data"][0]["Pid"] == second["Data"][0]["Pid"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a shebang script as a fake exiftool")
+def test_exiftool_worker_gives_up_when_busy_or_hung(tmp_path: Path) -> None:
+    fake = _fake_stay_open_exiftool(tmp_path)
+    asset = tmp_path / "image.jpg"
+    asset.write_bytes(b"x")
+    hung = tmp_path / "hang.jpg"
+    hung.write_bytes(b"x")
+
+    worker = ExifToolWorker(fake, lock_timeout_s=0.01, read_timeout_s=0.5)
+    try:
+        with worker._lock:
+            with pytest.raises(RuntimeError, match="busy"):
+                worker.run(asset_path=asset)
+
+        started = time.monotonic()
+        with pytest.raises(RuntimeError, match="timed out"):
+            worker.run(asset_path=hung)
+        assert time.monotonic() - started < 10
+
+        # The killed process is replaced on the next call.
+        assert worker.run(asset_path=asset)["Data"][0]["File:Path"] == str(asset)
+    finally:
+        worker.close()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a shebang script as a fake exiftool")
+def test_exiftool_worker_restarts_after_undecodable_output(tmp_path: Path) -> None:
+    fake = _fake_stay_open_exiftool(tmp_path)
+    bad = tmp_path / "badutf.jpg"
+    bad.write_bytes(b"x")
+    asset = tmp_path / "image.jpg"
+    asset.write_bytes(b"x")
+
+    worker = ExifToolWorker(fake)
+    try:
+        with pytest.raises(UnicodeDecodeError):
+            worker.run(asset_path=bad)
+        # Must not read the rest of badutf.jpg's output left in the old pipe.
+        assert worker.run(asset_path=asset)["Data"][0]["File:Path"] == str(asset)
+    finally:
+        worker.close()
@@ -46,6 +46,12 @@ def test_field_defs_crud_and_descriptor_validation(tmp_path: Path, monkeypatch)
         items = listed.json()["data"]["items"]
         assert any(x["field_key"] == "country_code" for x in items)
 
+        # Single get returns the same envelope/payload as create
+        got = client.get(f"/v1/admin/field-defs/{field_def_id}", headers=headers)
+        assert got.status_code == 200
+        assert got.headers["content-type"] == "application/json"
+        assert got.json() == fd.json()
+
         # Create entity
         e = client.post(
             "/v1/entities",
@@ -93,6 +99,14 @@ def test_field_defs_crud_and_descriptor_validation(tmp_path: Path, monkeypatch)
         assert good_patch.status_code == 200
         assert good_patch.json()["data"]["value"] == "CA"
 
+        listed = client.get(f"/v1/entities/{entity_id}/descriptors", headers=headers)
+        assert listed.status_code == 200
+        assert listed.json() == {
+            "ok": True,
+            "data": {"items": [good_patch.json()["data"]]},
+            "error": None,
+        }
+
         # Delete descriptor
         deleted = client.delete(f"/v1/descriptors/{descriptor_id}", headers=headers)
         assert deleted.status_code == 200
@@ -143,3 +157,36 @@ def test_enum_options_validation(tmp_path: Path, monkeypatch) -> None:
             json={"scope": "descriptor", "field_key": "eye_color", "value": "green"},
         )
         assert good.status_code == 200
+
+
+def test_validate_value_specialized_validators() -> None:
+    from faceforge_core.api.v1.descriptors import _validate_value
+    from faceforge_core.db.field_defs import FieldDefRow
+
+    def fd(field_type: str, *, required=False, options=None, regex=None, updated_at="t0"):
+        return FieldDefRow(
+            field_def_id="fd_1",
+            scope="descriptor",
+            field_key="k",
+            field_type=field_type,
+            required=required,
+            options=options,
+            regex=regex,
+            created_at="t0",
+            updated_at=updated_at,
+            deleted_at=None,
+        )
+
+    assert _validate_value(fd("string", required=True), None) == ["value is required"]
+    assert _validate_value(fd("string", regex="[a-z]+"), "abc") == []
+    assert _validate_value(fd("string", regex="[a-z]+"), "ABC") == ["value does not match regex"]
+    assert _validate_value(fd("string", regex="("), "x") == ["field definition regex is invalid"]
+    assert _validate_value(fd("integer"), True) == ["value must be an integer"]
+    assert _validate_value(fd("enum", options={"options": ["a", "b"]}), "b") == []
+    assert _validate_value(fd("enum", options={"options": []}), "a") == [
+        "field definition has no options"
+    ]
+    # An edited definition (new options) must not reuse the old validator.
+    edited = fd("enum", options={"options": ["c"]}, updated_at="t1")
+    assert _validate_value(edited, "b") == ["value must be one of the allowed options"]
+    assert _validate_value(fd("mystery"), 1) == ["unknown field_type"]
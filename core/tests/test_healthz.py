@@ -14,3 +14,47 @@ def test_healthz_ok(tmp_path: Path, monkeypatch) -> None:
         response = client.get("/healthz")
         assert response.status_code == 200
         assert response.json() == {"status": "ok"}
+
+
+def test_requests_are_access_logged(tmp_path: Path, monkeypatch, caplog) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        with caplog.at_level("INFO", logger="faceforge_core.app"):
+            client.get("/healthz")
+            client.get("/v1/entities")
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "faceforge_core.app"]
+    assert "GET /healthz - 200" in messages
+    # The token middleware answers first, so rejected requests are not logged.
+    assert not any(m.startswith("GET /v1/entities") for m in messages)
+
+
+def test_core_log_is_written_and_flushed_on_shutdown(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        client.get("/healthz")
+
+    (log_file,) = tmp_path.rglob("core.log")
+    text = log_file.read_text(encoding="utf-8")
+    assert "FaceForge Core starting up" in text
+    assert "GET /healthz - 200" in text
+
+
+def test_rotating_file_handler_rolls_over_without_per_record_probes(tmp_path: Path) -> None:
+    import logging
+
+    from faceforge_core.logfile import _RotatingFileHandler
+
+    log_path = tmp_path / "core.log"
+    handler = _RotatingFileHandler(log_path, maxBytes=64, backupCount=1, encoding="utf-8")
+    try:
+        for i in range(4):
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, f"line {i} " * 4, None, None)
+            handler.handle(record)
+    finally:
+        handler.close()
+
+    assert (tmp_path / "core.log.1").is_file()
+    assert log_path.stat().st_size <= 64
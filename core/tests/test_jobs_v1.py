@@ -3,7 +3,7 @@ from __future__ import annotations
 import hashlib
 import time
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -58,7 +58,7 @@ def test_jobs_create_get_log_and_bulk_import(tmp_path: Path, monkeypatch) -> Non
         job = _wait_for_job(client, headers=headers, job_id=job_id)
         assert job["status"] == "succeeded"
 
-        listing = client.get("/v1/jobs", headers=headers)
+        listing = client.get("/v1/jobs?with_total=1", headers=headers)
         assert listing.status_code == 200
         body = listing.json()["data"]
         assert body["total"] >= 1
@@ -83,6 +83,77 @@ def test_jobs_create_get_log_and_bulk_import(tmp_path: Path, monkeypatch) -> Non
         assert dl.content == content
 
 
+def test_bulk_import_isolates_a_failing_row_in_its_batch(tmp_path: Path, monkeypatch) -> None:
+    from faceforge_core.jobs import bulk_import
+
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    src = tmp_path / "import"
+    src.mkdir()
+    for name in ("a.txt", "bad.txt", "c.txt"):
+        (src / name).write_bytes(f"content of {name}".encode())
+
+    real_create = bulk_import.create_assets_bulk
+
+    def _create(db_path, *, items):
+        if any(item.filename == "bad.txt" for item in items):
+            raise RuntimeError("constraint failed")
+        return real_create(db_path, items=items)
+
+    monkeypatch.setattr(bulk_import, "create_assets_bulk", _create)
+
+    with TestClient(create_app()) as client:
+        app = cast(FastAPI, client.app)
+        token = app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        r = client.post("/v1/assets/bulk-import", headers=headers, json={"path": str(src)})
+        assert r.status_code == 200
+        job = _wait_for_job(client, headers=headers, job_id=r.json()["data"]["job_id"])
+        assert job["status"] == "succeeded"
+        assert job["result"]["imported"] == 2
+        assert job["result"]["errors"] == 1
+
+        for name in ("a.txt", "c.txt"):
+            asset_id = _sha256_hex(f"content of {name}".encode())
+            assert client.get(f"/v1/assets/{asset_id}", headers=headers).status_code == 200
+
+        fs = app.state.ctx.storage_mgr.fs
+        bad_id = _sha256_hex(b"content of bad.txt")
+        assert client.get(f"/v1/assets/{bad_id}", headers=headers).status_code == 404
+        assert not fs.resolve_path(fs.key_for_asset_id(bad_id)).exists()
+
+
+def test_bulk_import_keeps_sidecars_of_duplicates_in_one_batch(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    src = tmp_path / "import"
+    src.mkdir()
+    for name in ("a", "b"):
+        (src / f"{name}.txt").write_bytes(b"same bytes")
+        (src / f"{name}_meta.json").write_text(f'{{"from": "{name}"}}', encoding="utf-8")
+
+    with TestClient(create_app()) as client:
+        app = cast(FastAPI, client.app)
+        token = app.state.faceforge_config.auth.install_token
+        headers = {"Authorization": f"Bearer {token}"}
+
+        r = client.post("/v1/assets/bulk-import", headers=headers, json={"path": str(src)})
+        assert r.status_code == 200
+        job_id = r.json()["data"]["job_id"]
+        job = _wait_for_job(client, headers=headers, job_id=job_id)
+        assert job["result"]["imported"] == 1
+        assert job["result"]["skipped_existing"] == 1
+
+        asset_id = _sha256_hex(b"same bytes")
+        meta = client.get(f"/v1/assets/{asset_id}", headers=headers).json()["data"]["meta"]
+        assert [x["Data"] for x in meta["metadata"]] == [{"from": "a"}, {"from": "b"}]
+
+        log = client.get(f"/v1/jobs/{job_id}/log", headers=headers).json()["data"]["items"]
+        skipped = [x for x in log if x["message"] == "Skipped (already imported)"]
+        assert [x["data"]["file"] for x in skipped] == [str(src / "b.txt")]
+
+
 def test_jobs_cancel_is_cooperative_and_predictable(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
 
@@ -119,3 +190,169 @@ def test_jobs_cancel_is_cooperative_and_predictable(tmp_path: Path, monkeypatch)
         logs = client.get(f"/v1/jobs/{job_id}/log", headers=headers)
         assert logs.status_code == 200
         assert any(x.get("message") == "Cancel requested" for x in logs.json()["data"]["items"])
+
+
+def test_bulk_import_hashes_in_order(tmp_path: Path) -> None:
+    from faceforge_core.jobs.bulk_import import _iter_content_hashes
+
+    files = []
+    for i in range(7):
+        p = tmp_path / f"f{i}.bin"
+        p.write_bytes(f"payload-{i}".encode())
+        files.append(p)
+
+    got = [(p, fut.result()) for p, fut in _iter_content_hashes(files, workers=2)]
+    assert [p for p, _h in got] == files
+    assert [h for _p, h in got] == [_sha256_hex(p.read_bytes()) for p in files]
+
+
+def test_job_runner_bounds_concurrency(monkeypatch) -> None:
+    import threading
+
+    from faceforge_core.jobs import dispatcher
+
+    active = 0
+    peak = 0
+    done: list[str] = []
+    lock = threading.Lock()
+    all_done = threading.Event()
+
+    def _fake_run_job(*, ctx, job_id: str) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+            done.append(job_id)
+            if len(done) == 6:
+                all_done.set()
+
+    monkeypatch.setattr(dispatcher, "_run_job", _fake_run_job)
+    runner = dispatcher.JobRunner(workers=2)
+    try:
+        for i in range(6):
+            runner.submit(ctx=cast(dispatcher.JobContext, None), job_id=f"job-{i}")
+        assert all_done.wait(5.0)
+    finally:
+        runner.stop()
+
+    assert sorted(done) == [f"job-{i}" for i in range(6)]
+    assert peak <= 2
+
+
+def test_job_runner_stop_fails_jobs_still_queued(tmp_path: Path, monkeypatch) -> None:
+    import threading
+
+    from faceforge_core.db.jobs import create_job, get_job
+    from faceforge_core.db.migrate import apply_migrations
+    from faceforge_core.jobs import dispatcher
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+    for job_id in ("job_1", "job_2", "job_3"):
+        create_job(db_path, job_id=job_id, job_type="t", status="queued", input={})
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def _blocking_run_job(*, ctx, job_id: str) -> None:
+        started.set()
+        release.wait(5.0)
+
+    monkeypatch.setattr(dispatcher, "_run_job", _blocking_run_job)
+    runner = dispatcher.JobRunner(workers=1)
+    ctx = dispatcher.JobContext(db_path=db_path, storage_mgr=cast(Any, None))
+    runner.submit(ctx=ctx, job_id="job_1")
+    runner.submit(ctx=ctx, job_id="job_2")
+    assert started.wait(5.0)
+    try:
+        runner.stop()
+    finally:
+        release.set()
+
+    # A stopped runner does not spin up a new pool; late submissions fail too.
+    runner.submit(ctx=ctx, job_id="job_3")
+    assert runner._threads == []
+
+    for job_id in ("job_2", "job_3"):
+        job = get_job(db_path, job_id=job_id)
+        assert job is not None and job.status == "failed"
+        assert job.error == {"code": "shutdown", "message": "Core stopped before the job started"}
+
+
+def test_create_and_cancel_job_write_logs_in_one_call(tmp_path: Path) -> None:
+    from faceforge_core.config import load_core_config, resolve_configured_paths
+    from faceforge_core.db import resolve_db_path
+    from faceforge_core.db.jobs import cancel_job, create_job, list_job_logs, mark_job_canceled
+    from faceforge_core.db.migrate import apply_migrations
+    from faceforge_core.home import ensure_faceforge_layout
+
+    paths = ensure_faceforge_layout(tmp_path)
+    paths = resolve_configured_paths(paths, load_core_config(paths))
+    db_path = resolve_db_path(paths)
+    apply_migrations(db_path)
+
+    row = create_job(
+        db_path, job_id="job_1", job_type="t", status="queued", input={}, log_message="Job queued"
+    )
+    assert row.job_id == "job_1" and row.status == "queued"
+
+    requested, job = cancel_job(db_path, job_id="job_1")
+    assert requested is True
+    assert job is not None and job.cancel_requested_at is not None
+
+    mark_job_canceled(db_path, job_id="job_1", result=None)
+    requested, job = cancel_job(db_path, job_id="job_1")
+    assert requested is False and job is not None and job.status == "canceled"
+
+    assert cancel_job(db_path, job_id="missing") == (False, None)
+    messages = [r.message for r in list_job_logs(db_path, job_id="job_1", after_id=0, limit=10)]
+    assert messages == ["Job queued", "Cancel requested"]
+
+
+def test_tail_job_logs_distinguishes_missing_job_from_no_new_rows(tmp_path: Path) -> None:
+    from faceforge_core.db.jobs import create_job, tail_job_logs
+    from faceforge_core.db.migrate import apply_migrations
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+    create_job(db_path, job_id="job_1", job_type="t", status="queued", input={}, log_message="a")
+
+    first = tail_job_logs(db_path, job_id="job_1", after_id=0)
+    assert first is not None and [r.message for r in first] == ["a"]
+    assert tail_job_logs(db_path, job_id="job_1", after_id=first[-1].job_log_id) == []
+    assert tail_job_logs(db_path, job_id="missing", after_id=0) is None
+    assert tail_job_logs(db_path, job_id="missing", after_id=5) is None
+
+
+def test_create_assets_bulk_flags_existing_and_in_batch_duplicates(tmp_path: Path) -> None:
+    from faceforge_core.db.assets import NewAsset, create_assets_bulk, get_asset
+    from faceforge_core.db.migrate import apply_migrations
+
+    db_path = tmp_path / "core.sqlite3"
+    apply_migrations(db_path)
+
+    def item(n: int) -> NewAsset:
+        return NewAsset(
+            asset_id=f"a{n}",
+            kind="file",
+            filename=f"f{n}.bin",
+            content_hash=f"h{n}",
+            byte_size=n,
+            mime_type=None,
+            storage_provider="fs",
+            storage_key=f"k{n}",
+            meta={"metadata": []},
+        )
+
+    assert create_assets_bulk(db_path, items=[item(1)]) == [True]
+    assert create_assets_bulk(db_path, items=[item(2), item(1), item(3), item(3)]) == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    row = get_asset(db_path, asset_id="a3")
+    assert row is not None and row.meta == {"metadata": []}
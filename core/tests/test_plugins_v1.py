@@ -98,3 +98,36 @@ def test_plugins_config_put_validates_schema_and_roundtrips(tmp_path: Path, monk
         getc = client.get("/v1/plugins/demo.plugin/config", headers=headers)
         assert getc.status_code == 200
         assert getc.json()["data"]["config"]["foo"] == "bar"
+
+
+def test_discover_plugins_cached_reparses_only_on_change(tmp_path: Path) -> None:
+    from faceforge_core.plugins.discovery import discover_plugins_cached
+
+    plugins_dir = tmp_path / "plugins"
+    _write_demo_plugin(plugins_dir)
+
+    first = discover_plugins_cached(plugins_dir=plugins_dir)
+    assert list(first.by_id) == ["demo.plugin"]
+    assert discover_plugins_cached(plugins_dir=plugins_dir) is first
+
+    # Editing a manifest in place (different size) invalidates the cache.
+    _write_demo_plugin(plugins_dir, name="Demo Plugin Renamed")
+    edited = discover_plugins_cached(plugins_dir=plugins_dir)
+    assert edited is not first
+    assert edited.by_id["demo.plugin"].manifest.name == "Demo Plugin Renamed"
+
+
+def test_config_schema_validator_is_shared_per_schema() -> None:
+    from faceforge_core.plugins.discovery import config_schema_validator
+
+    schema = {"type": "object", "properties": {"n": {"type": "integer"}}}
+    v = config_schema_validator(schema)
+    assert config_schema_validator(json.loads(json.dumps(schema))) is v
+    assert config_schema_validator({"type": "object"}) is not v
+    assert [e.message for e in v.iter_errors({"n": "x"})] == ["'x' is not of type 'integer'"]
+
+    big = {"type": "integer", "maximum": 2**70}
+    big_v = config_schema_validator(big)
+    assert config_schema_validator(dict(big)) is big_v
+    assert list(big_v.iter_errors(2**70)) == []
+    assert len(list(big_v.iter_errors(2**70 + 1))) == 1
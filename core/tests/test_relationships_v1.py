@@ -92,3 +92,35 @@ def test_relation_types_seed_list_is_available(tmp_path: Path, monkeypatch) -> N
         assert r.status_code == 200
         items = [x.lower() for x in r.json()["data"]["items"]]
         assert "parent" in items
+
+
+def test_relation_types_rank_prefix_first_and_dedupe_case(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))
+
+    with TestClient(create_app()) as client:
+        headers = _auth_headers(client)
+        ids = [
+            client.post("/v1/entities", headers=headers, json={"display_name": n}).json()["data"][
+                "entity_id"
+            ]
+            for n in ("A", "B")
+        ]
+        for rel_type in ("Best Friend", "FRIEND", "friendly rival"):
+            r = client.post(
+                "/v1/relationships",
+                headers=headers,
+                json={
+                    "src_entity_id": ids[0],
+                    "dst_entity_id": ids[1],
+                    "relationship_type": rel_type,
+                },
+            )
+            assert r.status_code == 200
+
+        r = client.get("/v1/relation-types?query=FRI", headers=headers)
+        assert r.status_code == 200
+        # Seed spelling wins over "FRIEND"; prefix matches rank ahead of substring ones.
+        assert r.json()["data"]["items"] == ["friend", "friendly rival", "Best Friend"]
+
+        r = client.get("/v1/relation-types?limit=3", headers=headers)
+        assert r.json()["data"]["items"] == ["Best Friend", "child", "coworker"]
@@ -18,6 +18,12 @@ def test_ui_login_is_public_and_ui_requires_token(tmp_path: Path, monkeypatch) -
         r2 = client.get("/ui/entities")
         assert r2.status_code == 401
 
+        assert client.get("/", follow_redirects=False).status_code == 401
+        token = client.app.state.faceforge_config.auth.install_token
+        root = client.get("/", headers={"X-FaceForge-Token": token}, follow_redirects=False)
+        assert root.status_code == 302
+        assert root.headers["location"] == "/ui/entities"
+
 
 def test_ui_cookie_auth_allows_ui_and_asset_download(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setenv("FACEFORGE_HOME", str(tmp_path))